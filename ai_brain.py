@@ -1,13 +1,66 @@
 # ai_brain.py - IA Adaptativa con aprendizaje de patrones
 
+import copy
 import json
 import os
+import threading
+import time
+import traceback
+from collections import deque
+import numpy as np
 from settings import *
+from core.heatmap import OccupancyGrid
+from core.kalman import MotionTracker
+from core.ngram import NGramModel, STILL_SYMBOL, symbol_direction
+from core.persistence import WriteBehindBytes, WriteBehindFile
+
+# Clasificación del movimiento entre dos muestras (índices de los contadores)
+MOVEMENTS = ("horizontal", "vertical", "diagonal")
+HORIZONTAL, VERTICAL, DIAGONAL = range(3)
+STILL = -1  # sin movimiento: no cuenta para los patrones
+
+# Mensajes del frame al hilo de la IA (primer elemento de cada tupla)
+SAMPLE, PLAYER, MOVEMENT = range(3)
 
 class AIBrain:
-    def __init__(self):
-        self.behavior_file = "data/behavior.json"
-        self.player_data = {
+    """Aprende cómo esquiva el jugador y lo usa para apuntar y elegir el estado del boss.
+
+    Muestrea la posición en cada tick (O(1)) y el boss lee la captura del
+    modelo de hace AI_SNAPSHOT_LAG. Con `worker` el muestreo y el análisis
+    corren en un hilo; el resultado es el mismo que sin él.
+    """
+    def __init__(self, behavior_file=BEHAVIOR_FILE, history_size=None, tick_rate=SIM_TICK_RATE,
+                 worker=False):
+        # Sin archivo (None) la IA aprende solo en memoria, sin leer ni escribir disco
+        self.behavior_file = behavior_file
+        self.writer = WriteBehindFile(behavior_file) if behavior_file else None
+        self.tick_rate = tick_rate
+        self.ngram = NGramModel(AI_NGRAM_CONTEXT, AI_NGRAM_MAX_COUNT, AI_NGRAM_MIN_COUNT)
+        self.heatmap = OccupancyGrid(ARENA_X, ARENA_Y, ARENA_WIDTH, ARENA_HEIGHT, AI_HEATMAP_COLS,
+                                     AI_HEATMAP_ROWS, AI_HEATMAP_HALF_LIFE, 1 / tick_rate)
+        # Las tablas binarias van al lado de behavior.json (data/behavior.ngram,
+        # data/behavior.heat); cada una se guarda solo si cambió su `revision`
+        self.tables = {".ngram": self.ngram, ".heat": self.heatmap}
+        base = os.path.splitext(behavior_file)[0] if behavior_file else None
+        self.table_writers = {ext: WriteBehindBytes(base + ext) for ext in self.tables} if base else {}
+        self.tables_saved = {}
+        self.tracker = MotionTracker(
+            1 / tick_rate, AI_TRACKER_PROCESS_NOISE, AI_TRACKER_MEASUREMENT_NOISE, PLAYER_SPEED,
+            (ARENA_X, ARENA_Y, ARENA_X + ARENA_WIDTH - PLAYER_SIZE, ARENA_Y + ARENA_HEIGHT - PLAYER_SIZE),
+            model=AI_TRACKER_MODEL)
+        # Copia del filtro donde el frame carga las capturas publicadas para apuntar
+        self.view = copy.copy(self.tracker)
+        self.lag = int(round(AI_SNAPSHOT_LAG * tick_rate))
+        self.hot_every = max(1, int(round(AI_HOT_SPOTS_INTERVAL * tick_rate)))
+        self.inbox = deque()
+        self.posted = 0   # mensajes encolados por el frame
+        self.handled = 0  # mensajes atendidos por el hilo
+        # El hilo avisa por acá cada mensaje atendido, solo si el frame está esperando
+        self.progress = threading.Condition()
+        self.waiting = False  # el frame espera al hilo
+        self.idle = False     # el hilo espera mensajes
+        self.thread = None
+        self.set_player_data({
             "dodges": {"left": 0, "right": 0, "up": 0, "down": 0},
             "hits_taken": 0,
             "survival_time": 0,
@@ -15,131 +68,399 @@ class AIBrain:
             "movement_history": [],
             "dodge_patterns": {},
             "reaction_time": 0.5
-        }
+        })
         self.load_behavior()
         
-        # Variables para análisis en tiempo real
-        self.last_positions = []
-        self.max_history = 20
+        # Ventana de muestras por tick: posición y tipo de movimiento
+        self.history_size = history_size or int(AI_HISTORY_SECONDS * tick_rate)
+        self.xs = np.zeros(self.history_size)
+        self.ys = np.zeros(self.history_size)
+        self.kinds = np.full(self.history_size, STILL, dtype=np.int8)
+        # Vistas de los mismos buffers: leer y escribir un elemento desde
+        # Python por acá cuesta como en una lista, no como un escalar de NumPy
+        self._xs = memoryview(self.xs)
+        self._ys = memoryview(self.ys)
+        self._kinds = memoryview(self.kinds)
+        self.kind_counts = [0, 0, 0]
+        self.reset_session()
+        if worker:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name="ai-brain", daemon=True)
+            self.thread.start()
+    
+    def _run(self):
+        inbox = self.inbox
+        while True:
+            if not inbox:
+                # Sin combate (menú, diálogos, game over) el hilo queda dormido acá
+                with self.progress:
+                    self.idle = True
+                    self.progress.wait_for(lambda: inbox or not self.running)
+                    self.idle = False
+                if not self.running:
+                    return
+                continue
+            item = inbox.popleft()
+            try:
+                self._handle(item)
+            except Exception:
+                print("Error en el hilo de la IA:")
+                traceback.print_exc()
+            self.handled += 1
+            if self.waiting:
+                with self.progress:
+                    self.progress.notify_all()
+            # Soltar el GIL entre tandas: el frame no espera a que el hilo se ponga al día
+            if item[0] != SAMPLE or not self.handled & 31:
+                time.sleep(0)
+    
+    def _handle(self, item):
+        kind = item[0]
+        if kind == SAMPLE:
+            self._ingest(item[1], item[2])
+        elif kind == PLAYER:
+            self._record_player(*item[1:])
+        else:
+            self._record_movement()
+    
+    def _post(self, item):
+        if self.thread is None:
+            self._handle(item)
+        else:
+            self.inbox.append(item)
+            self.posted += 1
+            self._wake()
+    
+    def _wake(self):
+        if self.idle:
+            with self.progress:
+                self.progress.notify_all()
+    
+    def _wait_until(self, done):
+        """Bloquea el frame hasta que `done()`; el hilo lo despierta al atender cada mensaje"""
+        with self.progress:
+            self.waiting = True
+            self.progress.wait_for(done)
+            self.waiting = False
+    
+    def drain(self):
+        """Espera a que el hilo atienda todo lo encolado: después el frame puede tocar el estado"""
+        if self.handled < self.posted:
+            self._wait_until(lambda: self.handled >= self.posted)
         
+    def set_player_data(self, data):
+        """Reemplaza lo aprendido (archivo, repetición) y recalcula los totales"""
+        self.drain()
+        self.player_data = data
+        self.dodge_total = sum(data["dodges"].values())
+        self.hits_taken = data["hits_taken"]
+        self.set_hold_time(data.get("hold_time", AI_TRACKER_PERSISTENCE))
+    
+    def set_hold_time(self, seconds):
+        """Cuánto se supone que el jugador mantiene la tecla actual"""
+        seconds = min(max(seconds, AI_HOLD_TIME_MIN), AI_HOLD_TIME_MAX)
+        self.hold_ticks = seconds * self.tick_rate
+        self.tracker.persistence = seconds
+    
     def load_behavior(self):
-        if os.path.exists(self.behavior_file):
+        if self.behavior_file and os.path.exists(self.behavior_file):
             try:
                 with open(self.behavior_file, 'r') as f:
                     data = json.load(f)
                     if data:
-                        self.player_data = data
+                        self.set_player_data(data)
             except:
                 pass
+        for ext, writer in self.table_writers.items():
+            if os.path.exists(writer.path):
+                try:
+                    with open(writer.path, 'rb') as f:
+                        if not self.tables[ext].load_bytes(f.read()):
+                            print(f"{writer.path} no es compatible; se empieza de cero")
+                except OSError:
+                    pass
     
     def save_behavior(self):
-        os.makedirs("data", exist_ok=True)
-        with open(self.behavior_file, 'w') as f:
-            json.dump(self.player_data, f, indent=2)
+        # Solo marca los datos como sucios; el hilo de escritura los guarda después
+        if self.writer:
+            self.writer.submit(self.player_data)
+        for ext, writer in self.table_writers.items():
+            table = self.tables[ext]
+            if self.tables_saved.get(ext) != table.revision:
+                self.tables_saved[ext] = table.revision
+                if self.thread is not None:
+                    time.sleep(0)  # entre tabla y tabla el frame puede tomar el GIL
+                writer.submit(table.to_bytes())
+
+    def replay_state(self):
+        """Lo aprendido al empezar el combate, para la cabecera de una repetición"""
+        self.drain()
+        return {
+            "ai": copy.deepcopy(self.player_data),
+            "ngram": self.ngram.to_bytes(),
+            "heatmap": self.heatmap.to_bytes(),
+        }
+
+    def load_replay_state(self, player_data=None, ngram=None, heatmap=None):
+        if player_data:
+            self.set_player_data(player_data)
+        self.drain()
+        if ngram:
+            self.ngram.load_bytes(ngram)
+        if heatmap:
+            self.heatmap.load_bytes(heatmap)
+        self.after_v = self.next_velocity()
+
+    def flush(self):
+        """Guarda ya lo pendiente (fin de fase, fin de combate, salida)"""
+        self.drain()
+        if self.writer:
+            self.writer.flush()
+        for writer in self.table_writers.values():
+            writer.flush()
+
+    def close(self):
+        if self.thread is not None:
+            self.drain()
+            self.running = False
+            with self.progress:
+                self.progress.notify_all()
+            self.thread.join()
+            self.thread = None
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+        for writer in self.table_writers.values():
+            writer.close()
+        self.table_writers = {}
+    
+    def reset_session(self):
+        """Nuevo combate: se olvida lo reciente pero no lo aprendido"""
+        self.drain()
+        self.head = 0
+        self.filled = 0
+        self.kinds[:] = STILL
+        self.kind_counts = [0, 0, 0]
+        self.last_x = None
+        self.last_y = None
+        self.direction = STILL_SYMBOL
+        self.run_ticks = 0
+        self.ngram.reset_context()
+        # La próxima tecla solo cambia cuando cambia la dirección: no se consulta en cada tick
+        self.after_v = self.next_velocity()
+        # La media de mantener tecla arranca desde lo guardado, así el combate
+        # solo depende de player_data (repeticiones)
+        self.set_hold_time(self.player_data.get("hold_time", AI_TRACKER_PERSISTENCE))
+        self.tracker.reset()
+        # Ticks encolados (frame) y procesados (hilo); la captura del tick t va a board[t % len]
+        self.ticks = 0
+        self.sampled = 0
+        self.board = [None] * (self.lag + 1)
+        self.hot = []
+    
+    def snapshot(self):
+        self.drain()
+        return (self.ticks, list(self.board), self.hot, self.hits_taken, copy.deepcopy(self.player_data), self.xs.copy(), self.ys.copy(), self.kinds.copy(),
+                list(self.kind_counts), self.head, self.filled, self.last_x, self.last_y,
+                self.direction, self.run_ticks, self.hold_ticks, self.tracker.persistence,
+                self.tracker.get_state(), self.ngram.get_state(), self.heatmap.get_state())
+    
+    def restore(self, state):
+        self.drain()
+        (self.ticks, board, self.hot, hits_taken, player_data, xs, ys, kinds, kind_counts, self.head, self.filled, self.last_x, self.last_y,
+         self.direction, self.run_ticks, hold_ticks, persistence, tracker_state, ngram_state,
+         heatmap_state) = state
+        self.set_player_data(copy.deepcopy(player_data))
+        self.sampled = self.ticks
+        self.board = list(board)
+        self.hits_taken = hits_taken
+        self.hold_ticks = hold_ticks
+        self.tracker.persistence = persistence
+        self.tracker.set_state(tracker_state)
+        self.ngram.set_state(ngram_state)
+        self.heatmap.set_state(heatmap_state)
+        self.after_v = self.next_velocity()
+        self.xs[:] = xs
+        self.ys[:] = ys
+        self.kinds[:] = kinds
+        self.kind_counts = list(kind_counts)
+    
+    def sample(self, x, y):
+        """Registra la posición del jugador en este tick; O(1)"""
+        self.ticks += 1
+        if self.thread is None:
+            self._ingest(x, y)
+        else:
+            self.inbox.append((SAMPLE, x, y))
+            self.posted += 1
+            self._wake()
+    
+    def _ingest(self, x, y):
+        kind = STILL
+        if self.last_x is not None:
+            dx = x - self.last_x
+            dy = y - self.last_y
+            # Cada cambio de dirección (incluido quedarse quieto) cierra un
+            # tramo; su largo entra en la media de cuánto mantiene la tecla
+            # y, si no fue un roce de teclas, su símbolo entra en los n-gramas
+            direction = ((dx > 0) - (dx < 0)) * 3 + (dy > 0) - (dy < 0) + STILL_SYMBOL
+            if direction == self.direction:
+                self.run_ticks += 1
+            else:
+                if self.run_ticks:
+                    self.hold_ticks += (self.run_ticks - self.hold_ticks) * AI_HOLD_TIME_SMOOTHING
+                if self.run_ticks >= AI_NGRAM_MIN_RUN:
+                    self.ngram.observe(self.direction)
+                self.direction = direction
+                self.run_ticks = 1
+                self.after_v = self.next_velocity()
+            dx = abs(dx)
+            dy = abs(dy)
+            if dx > dy:
+                kind = HORIZONTAL
+            elif dy > dx:
+                kind = VERTICAL
+            elif dx:
+                kind = DIAGONAL
+        self.last_x = x
+        self.last_y = y
+        
+        head = self.head
+        # La muestra más vieja sale de la ventana y de los contadores
+        old = self._kinds[head]
+        if old != STILL:
+            self.kind_counts[old] -= 1
+        if kind != STILL:
+            self.kind_counts[kind] += 1
+        self._kinds[head] = kind
+        self._xs[head] = x
+        self._ys[head] = y
+        head += 1
+        self.head = 0 if head == self.history_size else head
+        if self.filled < self.history_size:
+            self.filled += 1
+        self.tracker.update(x, y)
+        self.heatmap.add(x + PLAYER_SIZE / 2, y + PLAYER_SIZE / 2)
+        self._publish()
+    
+    def _publish(self):
+        """Captura de este tick para el boss: filtro, próxima tecla y celdas calientes"""
+        sampled = self.sampled + 1
+        if (sampled - 1) % self.hot_every == 0:
+            self.hot = self.heatmap.hot_cells(AI_HEATMAP_TOP_K)
+        self.board[sampled % len(self.board)] = (sampled, self.tracker.get_state(), self.tracker.persistence,
+                                                 *self.after_v, self.hot)
+        # Recién ahora el frame puede leerla
+        self.sampled = sampled
+    
+    def published(self):
+        """La captura de hace `lag` ticks, o None al empezar el combate"""
+        tick = self.ticks - self.lag
+        if tick < 1:
+            return None
+        if self.sampled < tick:
+            self._wait_until(lambda: self.sampled >= tick)
+        return self.board[tick % len(self.board)]
+    
+    def recent_movements(self, count):
+        """Los últimos `count` movimientos (sin los ticks quieto), del más viejo al más nuevo"""
+        order = (np.arange(self.head - self.filled, self.head)) % self.history_size
+        kinds = self.kinds[order]
+        kinds = kinds[kinds != STILL][-count:]
+        return [MOVEMENTS[kind] for kind in kinds.tolist()]
     
     def analyze_player(self, player, survival_time):
-        self.player_data["dodges"] = player.dodges.copy()
-        self.player_data["hits_taken"] = player.hits_taken
+        # Lo que decide el estado del boss se copia ya; el resto lo guarda el hilo
+        self.dodge_total = player.total_dodges
+        self.hits_taken = player.hits_taken
+        self._post((PLAYER, player.dodges.copy(), player.hits_taken, survival_time))
+    
+    def _record_player(self, dodges, hits_taken, survival_time):
+        self.player_data["dodges"] = dodges
+        self.player_data["hits_taken"] = hits_taken
         self.player_data["survival_time"] = survival_time
         
-        dodges = player.dodges
         max_dodges = max(dodges.values()) if dodges.values() else 0
         if max_dodges > 0:
             self.player_data["preferred_direction"] = max(dodges, key=dodges.get)
         
-        # Guardar posición actual para análisis
-        self.last_positions.append((player.x, player.y))
-        if len(self.last_positions) > self.max_history:
-            self.last_positions.pop(0)
-        
         self.save_behavior()
     
     def analyze_movement_pattern(self, player, current_time):
-        """Analiza patrones de movimiento en tiempo real"""
-        if len(self.last_positions) < 3:
+        """Vota el patrón de movimiento dominante de la ventana actual"""
+        self._post((MOVEMENT,))
+    
+    def _record_movement(self):
+        counts = self.kind_counts
+        if counts[HORIZONTAL] + counts[VERTICAL] + counts[DIAGONAL] < 3:
             return
         
         # Asegurar que dodge_patterns existe
         if "dodge_patterns" not in self.player_data:
             self.player_data["dodge_patterns"] = {}
         
-        # Detectar patrones de movimiento (zigzag, circular, lateral, etc.)
-        movements = []
-        for i in range(1, len(self.last_positions)):
-            prev_x, prev_y = self.last_positions[i-1]
-            curr_x, curr_y = self.last_positions[i]
-            
-            dx = curr_x - prev_x
-            dy = curr_y - prev_y
-            
-            if abs(dx) > abs(dy):
-                movements.append("horizontal")
-            elif abs(dy) > abs(dx):
-                movements.append("vertical")
-            else:
-                movements.append("diagonal")
+        # Patrón más común según los contadores de la ventana (en empate, el primero)
+        most_common = MOVEMENTS[counts.index(max(counts))]
+        self.player_data["movement_history"] = self.recent_movements(10)
+        hold_time = self.hold_ticks / self.tick_rate
+        self.player_data["hold_time"] = round(hold_time, 3)
+        self.set_hold_time(hold_time)
         
-        # Detectar patrón más común
-        if movements:
-            from collections import Counter
-            pattern_count = Counter(movements)
-            most_common = pattern_count.most_common(1)[0][0]
-            self.player_data["movement_history"] = movements[-10:]
-            
-            # Actualizar patrones detectados
-            if most_common not in self.player_data["dodge_patterns"]:
-                self.player_data["dodge_patterns"][most_common] = 0
-            self.player_data["dodge_patterns"][most_common] += 1
+        # Actualizar patrones detectados
+        if most_common not in self.player_data["dodge_patterns"]:
+            self.player_data["dodge_patterns"][most_common] = 0
+        self.player_data["dodge_patterns"][most_common] += 1
         
         self.save_behavior()
     
-    def get_predicted_position(self, player_x, player_y):
-        """Predice posición futura basado en patrones aprendidos"""
-        direction = self.player_data["preferred_direction"]
-        
-        # Ajustar offset según patrones de movimiento detectados
-        base_offset = 50
-        
-        # Si detectamos patrones, aumentar la predicción
-        patterns = self.player_data.get("dodge_patterns", {})
-        if patterns:
-            most_common_pattern = max(patterns, key=patterns.get)
-            
-            if most_common_pattern == "horizontal":
-                base_offset = 70
-            elif most_common_pattern == "vertical":
-                base_offset = 70
-            elif most_common_pattern == "diagonal":
-                base_offset = 60
-        
-        # Usar historial reciente si existe
-        history = self.player_data.get("movement_history", [])
-        if len(history) >= 3:
-            recent = history[-3:]
-            if recent.count("horizontal") >= 2:
-                base_offset *= 1.3
-            elif recent.count("vertical") >= 2:
-                base_offset *= 1.3
-        
-        offset = base_offset
-        
-        if direction == "left":
-            return player_x - offset, player_y
-        elif direction == "right":
-            return player_x + offset, player_y
-        elif direction == "up":
-            return player_x, player_y - offset
-        elif direction == "down":
-            return player_x, player_y + offset
-        else:
-            # Sin dirección preferida, predecir basado en patrones
-            if patterns:
-                most_common = max(patterns, key=patterns.get)
-                if most_common == "horizontal":
-                    return player_x + offset, player_y
-                elif most_common == "vertical":
-                    return player_x, player_y - offset
+    def get_predicted_position(self, player_x, player_y, origin_x=None, origin_y=None, speed=None):
+        """Dónde apuntar una bala de `speed` px/s disparada desde (origin_x, origin_y).
+
+        Sin origen o sin muestras todavía, apunta a la posición actual.
+        """
+        if origin_x is None:
             return player_x, player_y
+        view = self._load_view(player_x, player_y)
+        if view is None:
+            return player_x, player_y
+        return self.view.intercept(origin_x, origin_y, speed, view[3], view[4])
+    
+    def _load_view(self, player_x, player_y):
+        """Carga en `view` el filtro publicado, partiendo de la posición de ahora"""
+        view = self.published()
+        if view is None or not view[1][0]:
+            return None
+        self.view.set_state(view[1])
+        self.view.persistence = view[2]
+        self.view.x = player_x
+        self.view.y = player_y
+        return view
+    
+    def hot_spots(self):
+        """Centros de las AI_HEATMAP_TOP_K celdas donde más se quedó el jugador últimamente"""
+        view = self.published()
+        return view[5] if view is not None else []
+    
+    def next_direction(self):
+        """(dx, dy, probabilidad) de la próxima tecla según los n-gramas, o None; O(1).
+
+        Solo responde con un contexto que ya mostró un hábito claro
+        (AI_NGRAM_CONFIDENCE): con un jugador sin hábitos la tecla más vista
+        gana por poco y por azar.
+        """
+        guess = self.ngram.predict(self.direction, AI_NGRAM_CONFIDENCE)
+        if guess is None:
+            return None
+        sx, sy = symbol_direction(guess[0])
+        return sx, sy, guess[1]
+    
+    def next_velocity(self):
+        """Velocidad esperada cuando suelte la tecla actual (px/s)"""
+        guess = self.next_direction()
+        if guess is None:
+            return 0.0, 0.0
+        sx, sy, probability = guess
+        return sx * PLAYER_SPEED * probability, sy * PLAYER_SPEED * probability
     
     def decide_boss_state(self, player_hp, boss_hp, survival_time):
         player_hp_percent = player_hp / PLAYER_HP
@@ -151,8 +472,7 @@ class AIBrain:
         if boss_hp_percent < 0.3:
             return "enajenado"
         
-        total_dodges = sum(self.player_data["dodges"].values())
-        if total_dodges > 100 and self.player_data["hits_taken"] < 3:
+        if self.dodge_total > 100 and self.hits_taken < 3:
             return "furioso"
         
         return "tranquilo"
\ No newline at end of file
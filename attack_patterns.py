@@ -3,8 +3,9 @@
 import pygame
 import math
 import random
-import os
+import numpy as np
 from settings import *
+from core.asset_manager import assets
 
 def point_in_rect(px, py, rx, ry, rw, rh):
     return rx <= px <= rx + rw and ry <= py <= ry + rh
@@ -35,6 +36,10 @@ class Warning:
             
             pygame.draw.rect(screen, (255, 0, 0), (int(self.x), int(self.y), 
                                           int(self.width), int(self.height)), 3)
+    
+    def mark_dirty(self, renderer):
+        if self.active:
+            renderer.mark_rect(self.x, self.y, self.width + 1, self.height + 1)
 
 class LaserBeam:
     """Láser devastador de Yacumama - MÓVIL Y MEJORADO"""
@@ -116,6 +121,18 @@ class LaserBeam:
         
         return dist < self.width / 2 + player_rect.width / 2
     
+    def mark_dirty(self, renderer):
+        """Marca los tiles que cubre el láser (carga o disparo)"""
+        if self.firing:
+            width = self.width * 1.8
+        elif self.timer < self.charge_time:
+            width = self.width + 4
+        else:
+            return
+        end_x = self.x + math.cos(self.angle) * self.length
+        end_y = self.y + math.sin(self.angle) * self.length
+        renderer.mark_segment(self.x, self.y, end_x, end_y, width)
+    
     def draw(self, screen):
         if not self.firing and self.timer < self.charge_time:
             # Advertencia durante la carga
@@ -160,84 +177,300 @@ class LaserBeam:
                            (int(end_x), int(end_y)), 
                            int(self.width * 0.4))
 
-class Bullet:
-    _sprite_cache = {}
+# Tipos de bala (columna "type" del BulletStore)
+BULLET_TYPES = {"normal": 0, "wave": 1, "spiral": 2, "large": 3}
+BULLET_NORMAL = BULLET_TYPES["normal"]
+BULLET_WAVE = BULLET_TYPES["wave"]
+BULLET_SPIRAL = BULLET_TYPES["spiral"]
+BULLET_LARGE = BULLET_TYPES["large"]
+
+# Tamaño al que se escala cada sprite según el tipo de bala
+BULLET_SPRITE_SIZES = {"large": 40, "wave": 35}
+DEFAULT_BULLET_SPRITE_SIZE = 30
+
+# Límites fuera de los cuales se descarta una bala
+CULL_LEFT = ARENA_X - 100
+CULL_TOP = ARENA_Y - 100
+CULL_RIGHT = ARENA_X + ARENA_WIDTH + 100
+CULL_BOTTOM = ARENA_Y + ARENA_HEIGHT + 100
+
+class RotationAtlas:
+    """Cada sprite de ataque pre-rotado en `buckets` ángulos.
     
-    def __init__(self, x, y, angle, speed, color=(255,255,255), bullet_type="normal", sprite_name=None):
-        self.x = x
-        self.y = y
-        self.angle = angle
-        self.speed = speed
-        self.size = BULLET_SIZE
-        self.color = color
-        self.bullet_type = bullet_type
-        self.lifetime = 0
-        self.sprite_name = sprite_name
-        self.sprite = None
-        self.original_sprite = None
-        self.active = True
+    Las balas guardan el índice de su cuadro en vez de una superficie; así
+    una espiral no crea superficies nuevas en cada frame.
+    """
+    def __init__(self, buckets=64):
+        self.buckets = buckets
+        self.frames = []   # sprite id -> lista de superficies rotadas
+        self.half_w = np.zeros((0, buckets))
+        self.half_h = np.zeros((0, buckets))
+    
+    def add_sprite(self, image):
+        """Pre-renderiza todas las rotaciones de `image`; devuelve su id"""
+        frames = [pygame.transform.rotate(image, k * 360 / self.buckets)
+                  for k in range(self.buckets)]
+        self.frames.append(frames)
+        self.half_w = np.vstack([self.half_w, [f.get_width() / 2 for f in frames]])
+        self.half_h = np.vstack([self.half_h, [f.get_height() / 2 for f in frames]])
+        return len(self.frames) - 1
+    
+    def frame_index(self, angles):
+        """Cuadro más cercano para cada ángulo de movimiento (radianes)"""
+        degrees = np.degrees(-np.asarray(angles)) % 360
+        return (np.rint(degrees * self.buckets / 360).astype(np.int16)) % self.buckets
+    
+    def memory_bytes(self):
+        return sum(f.get_width() * f.get_height() * f.get_bytesize()
+                   for frames in self.frames for f in frames)
+
+class BulletStore:
+    """Balas enemigas guardadas como arreglos NumPy (struct-of-arrays).
+    
+    Las balas vivas ocupan siempre las primeras `count` posiciones; al
+    eliminar, el hueco se rellena con una bala del final (swap-compact).
+    """
+    _sprite_ids = {}   # (sprite_name, bullet_type) -> sprite id
+    _sprites = []      # sprite id -> (ruta, tamaño) en el AssetManager
+    atlas = RotationAtlas(ROTATION_QUALITY[GAME_CONFIG["rotation_quality"]])
+    
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.capacity = 0
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.prev_x = np.zeros(0)   # posición del tick anterior, para interpolar el dibujo
+        self.prev_y = np.zeros(0)
+        self.angle = np.zeros(0)
+        self.speed = np.zeros(0)
+        self.lifetime = np.zeros(0)
+        self.type = np.zeros(0, dtype=np.int8)
+        self.sprite = np.zeros(0, dtype=np.int16)
+        self.frame = np.zeros(0, dtype=np.int16)
+        self.active = np.zeros(0, dtype=bool)
+        self.half_w = np.zeros(0)
+        self.half_h = np.zeros(0)
+        self.color = np.zeros((0, 3), dtype=np.uint8)
+        self._grow(capacity)
+    
+    def __len__(self):
+        return self.count
+    
+    def _columns(self):
+        return ("x", "y", "prev_x", "prev_y", "angle", "speed", "lifetime", "type", "sprite", "frame",
+                "active", "half_w", "half_h", "color")
+    
+    def _grow(self, needed):
+        new_capacity = max(needed, self.capacity * 2, 16)
+        for name in self._columns():
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = new_capacity
+    
+    @classmethod
+    def load_sprite(cls, sprite_name, bullet_type="normal"):
+        """Devuelve el id del sprite (escalado según el tipo), o -1"""
+        key = (sprite_name, bullet_type)
+        if key in cls._sprite_ids:
+            return cls._sprite_ids[key]
         
-        if sprite_name:
-            self.load_sprite(sprite_name)
+        sprite_id = -1
+        if sprite_name in ATTACK_SPRITES:
+            sprite_path = ATTACK_SPRITES[sprite_name]
+            size = BULLET_SPRITE_SIZES.get(bullet_type, DEFAULT_BULLET_SPRITE_SIZE)
+            if (sprite_path, (size, size)) in cls._sprites:
+                # Otro tipo de bala ya usa este sprite al mismo tamaño
+                sprite_id = cls._sprites.index((sprite_path, (size, size)))
+            else:
+                image = assets.get(sprite_path, (size, size))
+                if image is not None:
+                    sprite_id = cls.atlas.add_sprite(image)
+                    cls._sprites.append((sprite_path, (size, size)))
+        cls._sprite_ids[key] = sprite_id
+        return sprite_id
     
-    def load_sprite(self, sprite_name):
-        if sprite_name in Bullet._sprite_cache:
-            self.original_sprite = Bullet._sprite_cache[sprite_name]
-        else:
-            if sprite_name in ATTACK_SPRITES:
-                sprite_path = ATTACK_SPRITES[sprite_name]
-                if os.path.exists(sprite_path):
-                    try:
-                        img = pygame.image.load(sprite_path).convert_alpha()
-                        if self.bullet_type == "large":
-                            img = pygame.transform.scale(img, (40, 40))
-                        elif self.bullet_type == "wave":
-                            img = pygame.transform.scale(img, (35, 35))
-                        else:
-                            img = pygame.transform.scale(img, (30, 30))
-                        Bullet._sprite_cache[sprite_name] = img
-                        self.original_sprite = img
-                    except:
-                        pass
+    @classmethod
+    def prepare_sprites(cls):
+        """Pre-renderiza el atlas de todos los sprites de ATTACK_SPRITES"""
+        for sprite_name in ATTACK_SPRITES:
+            cls.load_sprite(sprite_name)
+    
+    @classmethod
+    def set_rotation_quality(cls, quality):
+        """Cambia la cantidad de ángulos del atlas según ROTATION_QUALITY"""
+        buckets = ROTATION_QUALITY[quality]
+        if buckets == cls.atlas.buckets:
+            return
+        cls.atlas = RotationAtlas(buckets)
+        for sprite_path, size in cls._sprites:
+            cls.atlas.add_sprite(assets.get(sprite_path, size))
+    
+    def snapshot(self):
+        """Copia de las balas vivas, columna por columna"""
+        n = self.count
+        return n, [getattr(self, name)[:n].copy() for name in self._columns()]
+    
+    def restore(self, state):
+        n, columns = state
+        if n > self.capacity:
+            self._grow(n)
+        for name, values in zip(self._columns(), columns):
+            getattr(self, name)[:n] = values
+        self.count = n
+    
+    def add(self, x, y, angle, speed, color=(255,255,255), bullet_type="normal", sprite_name=None):
+        """Agrega una bala"""
+        self.add_many(x, y, angle, speed, color, bullet_type, sprite_name)
+    
+    def add_many(self, xs, ys, angles, speeds, color=(255,255,255), bullet_type="normal", sprite_name=None):
+        """Agrega un grupo de balas; los argumentos se difunden como en NumPy"""
+        xs, ys, angles, speeds = np.broadcast_arrays(
+            np.asarray(xs, dtype=float), np.asarray(ys, dtype=float),
+            np.asarray(angles, dtype=float), np.asarray(speeds, dtype=float))
+        added = xs.size
+        if added == 0:
+            return
+        if self.count + added > self.capacity:
+            self._grow(self.count + added)
         
-        if self.original_sprite:
-            angle_degrees = math.degrees(-self.angle)
-            self.sprite = pygame.transform.rotate(self.original_sprite, angle_degrees)
-            self.size = max(self.sprite.get_width(), self.sprite.get_height()) // 2
+        sprite_id = self.load_sprite(sprite_name, bullet_type) if sprite_name else -1
         
+        start = self.count
+        end = start + added
+        self.x[start:end] = xs.ravel()
+        self.y[start:end] = ys.ravel()
+        self.prev_x[start:end] = self.x[start:end]
+        self.prev_y[start:end] = self.y[start:end]
+        self.angle[start:end] = angles.ravel()
+        self.speed[start:end] = speeds.ravel()
+        self.lifetime[start:end] = 0
+        self.type[start:end] = BULLET_TYPES.get(bullet_type, BULLET_NORMAL)
+        self.sprite[start:end] = sprite_id
+        self.active[start:end] = True
+        self.color[start:end] = color[:3]
+        self.count = end
+        
+        if sprite_id >= 0:
+            self._set_frames(slice(start, end), sprite_id)
+        else:
+            self.frame[start:end] = 0
+            self.half_w[start:end] = BULLET_SIZE
+            self.half_h[start:end] = BULLET_SIZE
+    
+    def _set_frames(self, where, sprite_ids):
+        """Elige el cuadro del atlas según el ángulo y ajusta la caja de colisión"""
+        frames = self.atlas.frame_index(self.angle[where])
+        self.frame[where] = frames
+        self.half_w[where] = self.atlas.half_w[sprite_ids, frames]
+        self.half_h[where] = self.atlas.half_h[sprite_ids, frames]
+    
+    def positions(self, alpha=1.0):
+        """Posiciones interpoladas entre el tick anterior y el actual"""
+        n = self.count
+        if alpha >= 1.0:
+            return self.x[:n], self.y[:n]
+        prev_x = self.prev_x[:n]
+        prev_y = self.prev_y[:n]
+        return prev_x + (self.x[:n] - prev_x) * alpha, prev_y + (self.y[:n] - prev_y) * alpha
+    
     def update(self, dt, speed_multiplier=1.0):
-        self.lifetime += dt
-        actual_speed = self.speed * speed_multiplier
+        """Mueve todas las balas en una sola pasada vectorizada (velocidad en px/s)"""
+        n = self.count
+        if n == 0:
+            return
         
-        self.x += math.cos(self.angle) * actual_speed
-        self.y += math.sin(self.angle) * actual_speed
+        lifetime = self.lifetime[:n]
+        angle = self.angle[:n]
+        x = self.x[:n]
+        y = self.y[:n]
+        bullet_type = self.type[:n]
         
-        if self.bullet_type == "wave":
-            self.y += math.sin(self.lifetime * 5) * 10
-        elif self.bullet_type == "spiral":
-            self.angle += dt * 2
-            if self.original_sprite:
-                angle_degrees = math.degrees(-self.angle)
-                self.sprite = pygame.transform.rotate(self.original_sprite, angle_degrees)
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        lifetime += dt
+        step = self.speed[:n] * (speed_multiplier * dt)
+        x += np.cos(angle) * step
+        y += np.sin(angle) * step
         
-        if not point_in_rect(self.x, self.y, ARENA_X - 100, ARENA_Y - 100, 
-                            ARENA_WIDTH + 200, ARENA_HEIGHT + 200):
-            self.active = False
+        wave = bullet_type == BULLET_WAVE
+        if wave.any():
+            y[wave] += np.sin(lifetime[wave] * 5) * (600 * dt)
+        
+        spiral = bullet_type == BULLET_SPIRAL
+        if spiral.any():
+            angle[spiral] += dt * 2
+            rotating = np.flatnonzero(spiral & (self.sprite[:n] >= 0))
+            if len(rotating):
+                self._set_frames(rotating, self.sprite[rotating])
+        
+        self.active[:n] = ((x >= CULL_LEFT) & (x <= CULL_RIGHT) &
+                           (y >= CULL_TOP) & (y <= CULL_BOTTOM))
+        self.compact()
     
-    def draw(self, screen):
-        if self.sprite:
-            sprite_rect = self.sprite.get_rect(center=(int(self.x), int(self.y)))
-            screen.blit(self.sprite, sprite_rect)
-        else:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
+    def remove(self, indices):
+        """Marca las balas indicadas como inactivas y compacta"""
+        self.active[indices] = False
+        self.compact()
     
-    def get_rect(self):
-        if self.sprite:
-            return self.sprite.get_rect(center=(int(self.x), int(self.y)))
-        return pygame.Rect(self.x - self.size, self.y - self.size, 
-                          self.size * 2, self.size * 2)
+    def compact(self):
+        """Rellena los huecos de balas inactivas con las del final"""
+        n = self.count
+        dead = np.flatnonzero(~self.active[:n])
+        if len(dead) == 0:
+            return
+        
+        new_count = n - len(dead)
+        holes = dead[dead < new_count]
+        movers = new_count + np.flatnonzero(self.active[new_count:n])
+        if len(holes):
+            for name in self._columns():
+                column = getattr(self, name)
+                column[holes] = column[movers]
+        self.count = new_count
+    
+    def clear(self):
+        """Descarta todas las balas conservando los arreglos ya reservados"""
+        self.count = 0
+        return self
+    
+    def mark_dirty(self, renderer, alpha=1.0):
+        n = self.count
+        if n == 0:
+            return
+        half_w = np.maximum(self.half_w[:n], BULLET_SIZE) + 1
+        half_h = np.maximum(self.half_h[:n], BULLET_SIZE) + 1
+        x, y = self.positions(alpha)
+        renderer.mark_rects(x - half_w, y - half_h, x + half_w, y + half_h)
+    
+    def draw(self, screen, alpha=1.0):
+        n = self.count
+        if n == 0:
+            return
+        xs, ys = self.positions(alpha)
+        sprites = self.sprite[:n].tolist()
+        frames = self.frame[:n].tolist()
+        lefts = (xs - self.half_w[:n]).astype(int).tolist()
+        tops = (ys - self.half_h[:n]).astype(int).tolist()
+        atlas_frames = self.atlas.frames
+        
+        blits = []
+        for i in range(n):
+            sprite_id = sprites[i]
+            if sprite_id >= 0:
+                blits.append((atlas_frames[sprite_id][frames[i]], (lefts[i], tops[i])))
+            else:
+                pygame.draw.circle(screen, self.color[i].tolist(),
+                                   (int(xs[i]), int(ys[i])), BULLET_SIZE)
+        if blits:
+            screen.blits(blits, doreturn=False)
 
 class AttackPattern:
+    """Patrones de ataque: cada uno agrega sus balas directamente al BulletStore.
+
+    Los patrones con azar lo sacan de `rng` (el flujo "patrones" del combate).
+    """
     @staticmethod
     def create_laser_warning(x, y, angle, length=1000, width=30):
         end_x = x + math.cos(angle) * length
@@ -251,99 +484,79 @@ class AttackPattern:
         return Warning(min_x, min_y, max_x - min_x, max_y - min_y, duration=1.5)
     
     @staticmethod
-    def circle_burst(x, y, count, speed, color=(255,255,255)):
-        bullets = []
-        angle_step = (2 * math.pi) / count
-        for i in range(count):
-            angle = angle_step * i
-            bullets.append(Bullet(x, y, angle, speed, color, "normal", "flechas"))
-        return bullets
+    def circle_burst(store, x, y, count, speed, color=(255,255,255)):
+        angles = np.arange(count) * ((2 * math.pi) / count)
+        store.add_many(x, y, angles, speed, color, "normal", "flechas")
     
     @staticmethod
-    def aimed_shot(x, y, target_x, target_y, speed, color=(255,255,255)):
+    def aimed_shot(store, x, y, target_x, target_y, speed, color=(255,255,255)):
         angle = math.atan2(target_y - y, target_x - x)
-        return [Bullet(x, y, angle, speed, color, "normal", "flechas")]
+        store.add(x, y, angle, speed, color, "normal", "flechas")
     
     @staticmethod
-    def triple_aimed_shot(x, y, target_x, target_y, speed, color=(255,255,255)):
+    def triple_aimed_shot(store, x, y, target_x, target_y, speed, color=(255,255,255)):
         angle = math.atan2(target_y - y, target_x - x)
         spread = 0.3
-        bullets = []
-        bullets.append(Bullet(x, y, angle - spread, speed, color, "normal", "serpiente"))
-        bullets.append(Bullet(x, y, angle, speed * 1.2, color, "normal", "serpiente"))
-        bullets.append(Bullet(x, y, angle + spread, speed, color, "normal", "serpiente"))
-        return bullets
+        angles = [angle - spread, angle, angle + spread]
+        speeds = [speed, speed * 1.2, speed]
+        store.add_many(x, y, angles, speeds, color, "normal", "serpiente")
     
     @staticmethod
-    def spiral(x, y, count, speed, rotation, color=(255,255,255)):
-        bullets = []
-        angle_step = (2 * math.pi) / count
-        for i in range(count):
-            angle = angle_step * i + rotation
-            bullets.append(Bullet(x, y, angle, speed, color, "spiral", "serpiente"))
-        return bullets
+    def spiral(store, x, y, count, speed, rotation, color=(255,255,255)):
+        angles = np.arange(count) * ((2 * math.pi) / count) + rotation
+        store.add_many(x, y, angles, speed, color, "spiral", "serpiente")
     
     @staticmethod
-    def water_stream(x, y, target_x, target_y, speed, color=(255,255,255)):
+    def water_stream(store, x, y, target_x, target_y, speed, color=(255,255,255), rng=random):
         angle = math.atan2(target_y - y, target_x - x)
-        bullets = []
-        for i in range(5):
-            offset_angle = angle + random.uniform(-0.2, 0.2)
-            bullets.append(Bullet(x, y, offset_angle, speed * random.uniform(0.9, 1.1), 
-                                color, "normal", "chorro_agua"))
-        return bullets
+        angles = [angle + rng.uniform(-0.2, 0.2) for _ in range(5)]
+        speeds = [speed * rng.uniform(0.9, 1.1) for _ in range(5)]
+        store.add_many(x, y, angles, speeds, color, "normal", "chorro_agua")
     
     @staticmethod
-    def poison_rain(start_x, start_y, speed, color=(255,255,255)):
-        bullets = []
+    def poison_rain(store, start_x, start_y, speed, color=(255,255,255), rng=random, columns=()):
+        """20 gotas; las primeras caen sobre `columns` (x), el resto al azar"""
+        xs = []
+        ys = []
+        speeds = []
         for i in range(20):
-            x = start_x + random.randint(-200, 200)
-            y = start_y - random.randint(0, 100)
-            bullets.append(Bullet(x, y, math.pi / 2, speed * random.uniform(0.8, 1.2), 
-                                 color, "normal", "veneno"))
-        return bullets
+            if i < len(columns):
+                xs.append(columns[i] + rng.randint(-8, 8))
+            else:
+                xs.append(start_x + rng.randint(-200, 200))
+            ys.append(start_y - rng.randint(0, 100))
+            speeds.append(speed * rng.uniform(0.8, 1.2))
+        store.add_many(xs, ys, math.pi / 2, speeds, color, "normal", "veneno")
     
     @staticmethod
-    def wave_attack(start_x, start_y, speed, color=(255,255,255)):
-        bullets = []
-        for i in range(12):
-            x = start_x + i * 40
-            bullets.append(Bullet(x, start_y, math.pi / 2, speed, color, "wave", "lianas"))
-        return bullets
+    def wave_attack(store, start_x, start_y, speed, color=(255,255,255)):
+        xs = start_x + np.arange(12) * 40
+        store.add_many(xs, start_y, math.pi / 2, speed, color, "wave", "lianas")
     
     @staticmethod
-    def liana_curtain(start_x, start_y, speed, color=(255,255,255)):
+    def liana_curtain(store, start_x, start_y, speed, color=(255,255,255)):
         """Cortina de lianas con ESPACIOS para esquivar"""
-        bullets = []
         spacing = 60  # Mayor espaciado para poder esquivar
         num_columns = ARENA_WIDTH // spacing
         
         # Patrón: dejar espacios cada 2 columnas
-        for i in range(num_columns):
-            if i % 3 != 1:  # Deja un espacio cada 3 columnas
-                x = ARENA_X + spacing * i + spacing / 2
-                bullets.append(Bullet(x, start_y, math.pi / 2, speed, color, "wave", "lianas"))
-        return bullets
+        columns = [i for i in range(num_columns) if i % 3 != 1]  # Deja un espacio cada 3 columnas
+        xs = ARENA_X + spacing * np.array(columns) + spacing / 2
+        store.add_many(xs, start_y, math.pi / 2, speed, color, "wave", "lianas")
     
     @staticmethod
-    def liana_alternating(start_x, start_y, speed, color=(255,255,255)):
+    def liana_alternating(store, start_x, start_y, speed, color=(255,255,255)):
         """Lianas en patrón alternado con más espacios"""
-        bullets = []
         spacing = 50
         num_columns = ARENA_WIDTH // spacing
         
         # Patrón alternado: primero las pares, luego las impares (desfasado en tiempo)
-        for i in range(num_columns):
-            if i % 2 == 0:  # Solo columnas pares
-                x = ARENA_X + spacing * i + spacing / 2
-                bullets.append(Bullet(x, start_y, math.pi / 2, speed, color, "wave", "lianas"))
-        return bullets
+        columns = np.arange(0, num_columns, 2)  # Solo columnas pares
+        xs = ARENA_X + spacing * columns + spacing / 2
+        store.add_many(xs, start_y, math.pi / 2, speed, color, "wave", "lianas")
     
     @staticmethod
-    def random_spray(x, y, count, speed, color=(255,255,255)):
-        bullets = []
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            bullet_speed = speed * random.uniform(0.7, 1.3)
-            bullets.append(Bullet(x, y, angle, bullet_speed, color, "normal", "piraña"))
-        return bullets
\ No newline at end of file
+    def random_spray(store, x, y, count, speed, color=(255,255,255), rng=random):
+        angles = [rng.uniform(0, 2 * math.pi) for _ in range(count)]
+        speeds = [speed * rng.uniform(0.7, 1.3) for _ in range(count)]
+        store.add_many(x, y, angles, speeds, color, "normal", "piraña")
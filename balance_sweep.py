@@ -0,0 +1,157 @@
+# balance_sweep.py - Barrido de balance: miles de combates headless en todos los núcleos
+#
+# Uso:
+#   python balance_sweep.py --mode normal --seeds 50 \
+#       --boss-hp-mult 0.8,1.0,1.2 --boss-damage-mult 1.0,1.5 --out data/sweep.npz
+#
+# Cada combate usa el bot de core/input_sources.py y una IA sin archivo de
+# comportamiento, así los procesos no se pisan data/behavior.json. La caché
+# de sprites en disco se llena antes de arrancar el pool, en un solo proceso.
+# Si un combate no puede empezar, el barrido se corta con el error.
+
+import argparse
+import contextlib
+import copy
+import io
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import settings
+from settings import *
+
+MODIFIER_KEYS = ("player_hp_mult", "boss_hp_mult", "boss_speed_mult", "boss_damage_mult")
+PHASE_KEYS = ("hp", "speed_base", "damage_base")
+
+_runner = None
+_base_phases = None
+
+def _warm_sprite_cache(mode, tick_rate):
+    """Un combate corto y los sprites de todas las fases, para dejar data/cache/ lista"""
+    from boss import Boss
+    from core.asset_manager import assets
+    from headless import HeadlessRunner
+    with contextlib.redirect_stdout(io.StringIO()):
+        HeadlessRunner(1 / tick_rate, 5.0).run(mode, "bot", 0)
+        for phase in BOSS_PHASES:
+            for is_spirit in (False, True):
+                for path, size, alpha in Boss.sprite_requests(phase, is_spirit).values():
+                    assets.get(path, size, alpha=alpha)
+
+def _init_worker(max_seconds, tick_rate):
+    """Cada proceso crea su propio Game headless una sola vez"""
+    global _runner, _base_phases
+    from headless import HeadlessRunner
+    with contextlib.redirect_stdout(io.StringIO()):
+        _runner = HeadlessRunner(1 / tick_rate, max_seconds, behavior_file=None)
+    _base_phases = copy.deepcopy(BOSS_PHASES)
+
+def _run_fight(task):
+    """Corre un combate del barrido (en un proceso del pool)"""
+    point_index, mode, modifiers, phase_scales, seed = task
+
+    # BOSS_PHASES es propio de este proceso: se escala y se restaura
+    for phase, config in settings.BOSS_PHASES.items():
+        for key, scale in zip(PHASE_KEYS, phase_scales):
+            config[key] = _base_phases[phase][key] * scale
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = _runner.run(mode, "bot", seed, modifiers)
+    finally:
+        for phase, config in settings.BOSS_PHASES.items():
+            config.update(_base_phases[phase])
+
+    phase_times = [result["phase_times"].get(phase, np.nan) for phase in (1, 2, 3)]
+    return (point_index, seed, result["victory"], result["phase"], result["sim_seconds"],
+            result["damage_taken"], result["peak_bullets"], *phase_times)
+
+def build_grid(args):
+    """Lista de puntos (modificadores, escalas de fase) del producto cartesiano"""
+    base = GAME_MODE_MODIFIERS[args.mode]
+    modifier_values = [getattr(args, key) or [base[key]] for key in MODIFIER_KEYS]
+    phase_values = [args.phase_hp_scale, args.phase_speed_scale, args.phase_damage_scale]
+    grid = []
+    for values in itertools.product(*modifier_values, *phase_values):
+        modifiers = dict(zip(MODIFIER_KEYS, values[:len(MODIFIER_KEYS)]))
+        grid.append((modifiers, values[len(MODIFIER_KEYS):]))
+    return grid
+
+def aggregate(grid, runs):
+    """Columnas por punto del barrido a partir de las columnas por combate"""
+    point = runs["point"]
+    columns = {key: np.array([m[key] for m, _ in grid]) for key in MODIFIER_KEYS}
+    for i, key in enumerate(PHASE_KEYS):
+        columns[f"phase_{key}_scale"] = np.array([scales[i] for _, scales in grid])
+
+    count = np.bincount(point, minlength=len(grid))
+    safe = np.maximum(count, 1)
+    columns["runs"] = count
+    columns["win_rate"] = np.bincount(point, runs["victory"], len(grid)) / safe
+    columns["mean_damage_taken"] = np.bincount(point, runs["damage_taken"], len(grid)) / safe
+    columns["max_peak_bullets"] = np.zeros(len(grid), dtype=np.int32)
+    np.maximum.at(columns["max_peak_bullets"], point, runs["peak_bullets"])
+    for phase in (1, 2, 3):
+        times = runs[f"phase{phase}_time"]
+        killed = ~np.isnan(times)
+        kills = np.bincount(point[killed], minlength=len(grid))
+        total = np.bincount(point[killed], times[killed], len(grid))
+        columns[f"mean_phase{phase}_time"] = np.where(kills > 0, total / np.maximum(kills, 1), np.nan)
+    return columns
+
+def main():
+    parser = argparse.ArgumentParser(description="Barrido de balance con combates headless")
+    floats = lambda text: [float(v) for v in text.split(",")]
+    parser.add_argument("--mode", choices=list(GAME_MODE_MODIFIERS), default="normal")
+    for key in MODIFIER_KEYS:
+        parser.add_argument("--" + key.replace("_", "-"), type=floats, default=None)
+    parser.add_argument("--phase-hp-scale", type=floats, default=[1.0])
+    parser.add_argument("--phase-speed-scale", type=floats, default=[1.0])
+    parser.add_argument("--phase-damage-scale", type=floats, default=[1.0])
+    parser.add_argument("--seeds", type=int, default=20, help="combates por punto del barrido")
+    parser.add_argument("--seconds", type=float, default=600.0, help="tiempo simulado máximo")
+    parser.add_argument("--tick-rate", type=float, default=SIM_TICK_RATE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="data/sweep.npz")
+    args = parser.parse_args()
+
+    grid = build_grid(args)
+    tasks = [(i, args.mode, modifiers, scales, seed)
+             for i, (modifiers, scales) in enumerate(grid)
+             for seed in range(args.seeds)]
+    print(f"{len(grid)} puntos x {args.seeds} semillas = {len(tasks)} combates "
+          f"en {args.workers} procesos")
+
+    # En un proceso aparte: el de este script no inicializa pygame antes del fork
+    with ProcessPoolExecutor(1) as warmup:
+        warmup.submit(_warm_sprite_cache, args.mode, args.tick_rate).result()
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker,
+                             initargs=(args.seconds, args.tick_rate)) as pool:
+        rows = list(pool.map(_run_fight, tasks, chunksize=max(1, len(tasks) // (args.workers * 8))))
+    elapsed = time.perf_counter() - start
+
+    names = ("point", "seed", "victory", "phase", "sim_seconds", "damage_taken",
+             "peak_bullets", "phase1_time", "phase2_time", "phase3_time")
+    dtypes = (np.int32, np.int32, bool, np.int8, np.float32, np.float32,
+              np.int32, np.float32, np.float32, np.float32)
+    runs = {name: np.array(column, dtype=dtype)
+            for name, dtype, column in zip(names, dtypes, zip(*rows))}
+    summary = aggregate(grid, runs)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    np.savez_compressed(args.out, **{f"run_{k}": v for k, v in runs.items()}, **summary)
+
+    simulated = runs["sim_seconds"].sum()
+    print(f"{len(tasks)} combates en {elapsed:.1f} s ({simulated / elapsed:.0f} s simulados por segundo real)")
+    print(f"Resultados en {args.out}")
+    best = np.argsort(np.abs(summary["win_rate"] - 0.5))[:5]
+    print("Puntos más cercanos a 50% de victorias:")
+    for i in best:
+        values = ", ".join(f"{key}={summary[key][i]:g}" for key in MODIFIER_KEYS)
+        print(f"  {values} -> {summary['win_rate'][i]:.0%} victorias, "
+              f"daño recibido medio {summary['mean_damage_taken'][i]:.0f}")
+
+if __name__ == "__main__":
+    main()
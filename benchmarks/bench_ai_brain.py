@@ -0,0 +1,145 @@
+# benchmarks/bench_ai_brain.py - Costo de la IA por tick: análisis cada 3 s vs. muestreo por tick
+#
+# Uso: python benchmarks/bench_ai_brain.py [--seconds 600]
+#
+# Recorre el mismo camino del jugador (cambia de teclas cada pocos ticks)
+# con las llamadas que hace el juego: decide_boss_state en cada tick (una
+# vez por boss) y el análisis cada AI_ANALYSIS_INTERVAL. "antes": la lista
+# con pop(0), la lista de movimientos y el Counter reconstruidos en cada
+# análisis y la suma de esquivos en cada tick; solo veía una posición cada
+# 3 s. "ahora": AIBrain, que además muestrea la posición en cada tick.
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import *
+from ai_brain import AIBrain
+
+BOSSES = 3  # Yacumama y sus dos espíritus consultan el estado en cada tick
+
+class LegacyBrain:
+    """Seguimiento de AIBrain como era antes (sin disco)"""
+    def __init__(self):
+        self.player_data = {"dodges": {"left": 0, "right": 0, "up": 0, "down": 0}, "hits_taken": 0,
+                            "survival_time": 0, "preferred_direction": "none",
+                            "movement_history": [], "dodge_patterns": {}}
+        self.last_positions = []
+        self.max_history = 20
+
+    def analyze_player(self, player, survival_time):
+        self.player_data["dodges"] = player.dodges.copy()
+        self.player_data["hits_taken"] = player.hits_taken
+        self.player_data["survival_time"] = survival_time
+        dodges = player.dodges
+        if max(dodges.values()) > 0:
+            self.player_data["preferred_direction"] = max(dodges, key=dodges.get)
+        self.last_positions.append((player.x, player.y))
+        if len(self.last_positions) > self.max_history:
+            self.last_positions.pop(0)
+
+    def analyze_movement_pattern(self, player, current_time):
+        if len(self.last_positions) < 3:
+            return
+        movements = []
+        for i in range(1, len(self.last_positions)):
+            prev_x, prev_y = self.last_positions[i - 1]
+            curr_x, curr_y = self.last_positions[i]
+            dx = curr_x - prev_x
+            dy = curr_y - prev_y
+            if abs(dx) > abs(dy):
+                movements.append("horizontal")
+            elif abs(dy) > abs(dx):
+                movements.append("vertical")
+            else:
+                movements.append("diagonal")
+        from collections import Counter
+        most_common = Counter(movements).most_common(1)[0][0]
+        self.player_data["movement_history"] = movements[-10:]
+        patterns = self.player_data["dodge_patterns"]
+        patterns[most_common] = patterns.get(most_common, 0) + 1
+
+    def decide_boss_state(self, player_hp, boss_hp, survival_time):
+        if player_hp / PLAYER_HP > 0.7 and boss_hp / BOSS_HP < 0.5:
+            return "furioso"
+        if boss_hp / BOSS_HP < 0.3:
+            return "enajenado"
+        total_dodges = sum(self.player_data["dodges"].values())
+        if total_dodges > 100 and self.player_data["hits_taken"] < 3:
+            return "furioso"
+        return "tranquilo"
+
+class NullBrain:
+    """Solo el recorrido del camino, para descontarlo de las mediciones"""
+    def sample(self, x, y):
+        pass
+
+    def decide_boss_state(self, player_hp, boss_hp, survival_time):
+        return "tranquilo"
+
+    def analyze_player(self, player, survival_time):
+        pass
+
+    def analyze_movement_pattern(self, player, current_time):
+        pass
+
+class FakePlayer:
+    def __init__(self):
+        self.x = ARENA_X + ARENA_WIDTH / 2
+        self.y = ARENA_Y + ARENA_HEIGHT / 2
+        self.dodges = {"left": 0, "right": 0, "up": 0, "down": 0}
+        self.total_dodges = 0
+        self.hits_taken = 0
+
+def make_path(ticks, seed=3):
+    """Direcciones (dx, dy) por tick, mantenidas entre 5 y 30 ticks"""
+    rng = random.Random(seed)
+    path = []
+    while len(path) < ticks:
+        direction = (rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)))
+        path.extend([direction] * rng.randint(5, 30))
+    return path[:ticks]
+
+def run(brain, path, sample):
+    player = FakePlayer()
+    dt = 1 / SIM_TICK_RATE
+    step = PLAYER_SPEED * dt
+    timer = 0.0
+    start = time.perf_counter_ns()
+    for tick, (dx, dy) in enumerate(path):
+        player.x += dx * step
+        player.y += dy * step
+        if dx:
+            player.dodges["left" if dx < 0 else "right"] += 1
+            player.total_dodges += 1
+        if sample:
+            brain.sample(player.x, player.y)
+        for _ in range(BOSSES):
+            brain.decide_boss_state(PLAYER_HP, 400, 0)
+        timer += dt
+        if timer >= AI_ANALYSIS_INTERVAL:
+            brain.analyze_player(player, tick * dt)
+            brain.analyze_movement_pattern(player, tick * dt)
+            timer = 0.0
+    return (time.perf_counter_ns() - start) / len(path) / 1000
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=600.0)
+    args = parser.parse_args()
+
+    path = make_path(int(args.seconds * SIM_TICK_RATE))
+    base = min(run(NullBrain(), path, sample=True) for _ in range(3))
+    legacy = min(run(LegacyBrain(), path, sample=False) for _ in range(3)) - base
+    current = min(run(AIBrain(behavior_file=None), path, sample=True) for _ in range(3)) - base
+    print(f"{len(path)} ticks ({args.seconds:.0f} s a {SIM_TICK_RATE} Hz), {BOSSES} consultas de estado por tick")
+    print(f"antes (1 muestra cada {AI_ANALYSIS_INTERVAL:.0f} s): {legacy:.2f} µs/tick")
+    print(f"ahora (1 muestra por tick):    {current:.2f} µs/tick")
+    print("(mejor de 3, sin el costo de recorrer el camino)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_ai_worker.py - Tiempo de frame con el análisis de la IA apagado, en el frame o en su hilo
+#
+# Uso: python benchmarks/bench_ai_worker.py [--seconds 30] [--fps 60]
+#
+# Un combate genocida con el bot (invulnerable) corre a ritmo real, un
+# frame cada 1/fps s, y se mide cuánto tarda `advance` (los ticks del
+# frame). Modos:
+#   sin análisis - AIBrain no muestrea ni analiza (el boss apunta al jugador)
+#   en el frame  - muestreo y análisis en el hilo del juego (lo anterior)
+#   en hilo      - AIBrain con worker: el frame solo encola
+# Los datos aprendidos van a un directorio temporal, así el análisis también
+# serializa y guarda las tablas como en el juego. Se reportan los
+# percentiles de todos los frames y, aparte, de los frames donde tocó el
+# análisis periódico (AI_ANALYSIS_INTERVAL), que son menos del 1%.
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import *
+from game import Game
+from core.input_sources import ScriptedBot
+
+MODES = ("sin análisis", "en el frame", "en hilo")
+
+def play(mode, seconds, fps, folder):
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(headless=True, behavior_file=os.path.join(folder, f"{MODES.index(mode)}.json"))
+        game.config["ai_worker"] = mode == "en hilo"
+        game.start_game("genocida", input_source=ScriptedBot(game), seed=3, record=False)
+        game.player.take_damage = lambda amount: False
+        if mode == "sin análisis":
+            for name in ("sample", "analyze_player", "analyze_movement_pattern"):
+                setattr(game.ai_brain, name, lambda *args: None)
+
+        frame_dt = 1 / fps
+        times = []
+        analysis = []
+        start = time.perf_counter()
+        for frame in range(int(seconds * fps)):
+            game.dialogue_box.active = False
+            timer = game.ai_analysis_timer
+            begin = time.perf_counter_ns()
+            game.advance(frame_dt)
+            times.append((time.perf_counter_ns() - begin) / 1e6)
+            analysis.append(game.ai_analysis_timer < timer)
+            time.sleep(max(0.0, start + (frame + 1) * frame_dt - time.perf_counter()))
+        game.ai_brain.close()
+    times = np.array(times)
+    return times, times[np.array(analysis)]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--fps", type=float, default=60.0)
+    args = parser.parse_args()
+
+    print(f"{args.seconds:.0f} s a {args.fps:.0f} fps, {SIM_TICK_RATE} ticks/s, "
+          f"análisis cada {AI_ANALYSIS_INTERVAL:.0f} s")
+    with tempfile.TemporaryDirectory() as folder:
+        for mode in MODES:
+            times, analysis = play(mode, args.seconds, args.fps, folder)
+            line = (f"{mode:13s} frame p50 {np.percentile(times, 50):.3f} ms  p99 {np.percentile(times, 99):.3f}  "
+                    f"p99.9 {np.percentile(times, 99.9):.3f}  máx. {times.max():.3f}")
+            if len(analysis):
+                line += f"  | con análisis ({len(analysis)}) p50 {np.percentile(analysis, 50):.3f}  máx. {analysis.max():.3f}"
+            print(line)
+
+if __name__ == "__main__":
+    main()
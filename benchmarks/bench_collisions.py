@@ -0,0 +1,84 @@
+# benchmarks/bench_collisions.py - Tiempo de colisiones por frame según cantidad de balas
+#
+# Uso: python benchmarks/bench_collisions.py
+#
+# "antes": un pygame.Rect nuevo por bala y por consulta, como hacía Boss.update
+# "después": CollisionWorld (spatial hash) reconstruido una vez por frame
+
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from settings import *
+from attack_patterns import BulletStore
+from core.collision import CollisionWorld
+
+FRAMES = 200
+BULLET_COUNTS = [50, 100, 200, 400, 800, 1600]
+
+class FakeShot:
+    """Bala del jugador mínima (lo que CollisionWorld necesita)"""
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.active = True
+
+    def get_rect(self):
+        return pygame.Rect(self.x - 10, self.y - 10, 20, 20)
+
+def make_scene(count, rng):
+    store = BulletStore(count)
+    xs = [rng.uniform(ARENA_X - 100, ARENA_X + ARENA_WIDTH + 100) for _ in range(count)]
+    ys = [rng.uniform(ARENA_Y - 100, ARENA_Y + ARENA_HEIGHT + 100) for _ in range(count)]
+    store.add_many(xs, ys, 0.0, 0.0)
+    shots = [FakeShot(rng.uniform(ARENA_X, ARENA_X + ARENA_WIDTH),
+                      rng.uniform(0, ARENA_Y + ARENA_HEIGHT)) for _ in range(6)]
+    player_rect = pygame.Rect(ARENA_X + ARENA_WIDTH // 2, ARENA_Y + ARENA_HEIGHT // 2,
+                              PLAYER_SIZE, PLAYER_SIZE)
+    boss_positions = [(WIDTH // 2, 100), (WIDTH // 2 - 150, 150), (WIDTH // 2 + 150, 150)]
+    return store, shots, player_rect, boss_positions
+
+def frame_before(store, shots, player_rect, boss_positions):
+    hits = 0
+    for i in range(store.count):
+        rect = pygame.Rect(store.x[i] - store.half_w[i], store.y[i] - store.half_h[i],
+                           store.half_w[i] * 2, store.half_h[i] * 2)
+        if rect.colliderect(player_rect):
+            hits += 1
+    for bx, by in boss_positions:
+        for shot in shots:
+            boss_rect = pygame.Rect(bx - 40, by - 40, 80, 80)
+            if shot.get_rect().colliderect(boss_rect):
+                hits += 1
+    return hits
+
+def frame_after(world, store, shots, player_rect, boss_positions):
+    world.rebuild(store, shots)
+    hits = len(world.enemy_bullets_in_rect(player_rect))
+    for bx, by in boss_positions:
+        hits += len(world.player_bullets_in_rect(pygame.Rect(bx - 40, by - 40, 80, 80)))
+    return hits
+
+def time_frames(fn, *args):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        fn(*args)
+    return (time.perf_counter() - start) * 1000 / FRAMES
+
+def main():
+    rng = random.Random(1234)
+    world = CollisionWorld()
+    print(f"{'balas':>6} | {'antes (ms/frame)':>16} | {'después (ms/frame)':>18} | {'mejora':>7}")
+    print("-" * 58)
+    for count in BULLET_COUNTS:
+        scene = make_scene(count, rng)
+        before = time_frames(frame_before, *scene)
+        after = time_frames(frame_after, world, *scene)
+        print(f"{count:>6} | {before:>16.3f} | {after:>18.3f} | {before / after:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
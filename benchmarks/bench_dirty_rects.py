@@ -0,0 +1,69 @@
+# benchmarks/bench_dirty_rects.py - Frame completo (fill + flip) vs. rectángulos sucios
+#
+# Uso: python benchmarks/bench_dirty_rects.py [--frames 3000] [--mode genocida]
+#
+# Corre el mismo combate (bot, misma semilla, jugador invulnerable) dos
+# veces y mide solo el render: Game.draw + presentación en pantalla. Con
+# SDL_VIDEODRIVER=dummy el costo de enviar a pantalla es casi nulo, así que
+# la diferencia medida es la del dibujo; con ventana real se suma el ahorro
+# de `display.update` frente a `flip`.
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from settings import *
+from game import Game
+from core.input_sources import ScriptedBot
+
+def run(game, mode, dirty, frames, seed):
+    game.start_game(mode, input_source=ScriptedBot(game), seed=seed)
+    game.player.take_damage = lambda amount: False
+    game.config["dirty_rects"] = dirty
+    game.renderer.partial_frames = game.renderer.full_frames = 0
+
+    times = []
+    dirty_area = []
+    for frame in range(frames):
+        game.dialogue_box.active = False
+        game.advance(1 / FPS)
+        # Avanza las fases para cubrir los tres bosses, láseres y espíritus
+        if frame % 150 == 0:
+            game.boss.take_damage(150)
+        start = time.perf_counter_ns()
+        game.draw()
+        game.present()
+        times.append(time.perf_counter_ns() - start)
+        if game.dirty_frame:
+            dirty_area.append(game.renderer.dirty_fraction)
+    return np.array(times) / 1e6, dirty_area
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--mode", choices=list(GAME_MODE_MODIFIERS), default="genocida")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    game = Game(headless=True, behavior_file=None)
+    print(f"{'modo':<10} | {'media':>7} | {'p50':>7} | {'p95':>7} | {'p99':>7} | {'parciales':>9} | {'área sucia':>10}")
+    print("-" * 76)
+    for label, dirty in (("completo", False), ("sucio", True)):
+        times, area = run(game, args.mode, dirty, args.frames, args.seed)
+        p50, p95, p99 = np.percentile(times, (50, 95, 99))
+        renderer = game.renderer
+        total = renderer.partial_frames + renderer.full_frames
+        partial = f"{renderer.partial_frames}/{total}" if dirty else "-"
+        mean_area = f"{np.mean(area):.0%}" if area else "-"
+        print(f"{label:<10} | {times.mean():>7.3f} | {p50:>7.3f} | {p95:>7.3f} | {p99:>7.3f} | "
+              f"{partial:>9} | {mean_area:>10}")
+    print("(ms por frame de render)")
+
+if __name__ == "__main__":
+    main()
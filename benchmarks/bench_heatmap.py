@@ -0,0 +1,122 @@
+# benchmarks/bench_heatmap.py - Mapa de ocupación: costo por tick, consulta y cobertura de la lluvia
+#
+# Uso: python benchmarks/bench_heatmap.py [--seconds 300]
+#
+# Un jugador simulado pasa el 70% del tiempo cerca de un rincón favorito y
+# el resto recorre la arena. Se mide:
+#   - el costo por tick de sumar la muestra con olvido exponencial: "en
+#     cada tick" multiplica toda la grilla por el factor de olvido, "peso
+#     creciente" es OccupancyGrid (O(1) por muestra)
+#   - la consulta de las celdas calientes (una por ataque)
+#   - cuántas gotas de poison_rain caen a menos de PLAYER_SIZE del jugador
+#     en x, sin columnas (antes) y con las celdas calientes (ahora)
+#   - el tamaño del archivo guardado
+
+import argparse
+import os
+import random
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import *
+from core.heatmap import OccupancyGrid
+from attack_patterns import AttackPattern
+
+class DropCounter:
+    """Almacén falso: solo guarda las x de las gotas"""
+    def __init__(self):
+        self.xs = []
+
+    def add_many(self, xs, ys, angles, speeds, color, bullet_type, sprite_name):
+        self.xs = list(xs)
+
+def make_track(ticks, seed=11):
+    """Centros del jugador tick a tick"""
+    rng = random.Random(seed)
+    home = (ARENA_X + ARENA_WIDTH * 0.2, ARENA_Y + ARENA_HEIGHT * 0.75)
+    x, y = home
+    target = home
+    step = PLAYER_SPEED / SIM_TICK_RATE
+    track = []
+    while len(track) < ticks:
+        if rng.random() < 0.7:
+            target = (home[0] + rng.uniform(-40, 40), home[1] + rng.uniform(-30, 30))
+        else:
+            target = (rng.uniform(ARENA_X, ARENA_X + ARENA_WIDTH), rng.uniform(ARENA_Y, ARENA_Y + ARENA_HEIGHT))
+        for _ in range(rng.randint(30, 150)):
+            dx, dy = target[0] - x, target[1] - y
+            distance = max((dx * dx + dy * dy) ** 0.5, 1e-9)
+            move = min(step, distance)
+            x += dx / distance * move
+            y += dy / distance * move
+            track.append((x, y))
+    return track[:ticks]
+
+def new_grid():
+    return OccupancyGrid(ARENA_X, ARENA_Y, ARENA_WIDTH, ARENA_HEIGHT, AI_HEATMAP_COLS, AI_HEATMAP_ROWS,
+                         AI_HEATMAP_HALF_LIFE, 1 / SIM_TICK_RATE)
+
+def eager(track):
+    """Olvido multiplicando la grilla entera en cada tick"""
+    cells = np.zeros((AI_HEATMAP_ROWS, AI_HEATMAP_COLS))
+    decay = 0.5 ** (1 / SIM_TICK_RATE / AI_HEATMAP_HALF_LIFE)
+    cell_w = ARENA_WIDTH / AI_HEATMAP_COLS
+    cell_h = ARENA_HEIGHT / AI_HEATMAP_ROWS
+    start = time.perf_counter_ns()
+    for x, y in track:
+        cells *= decay
+        col = min(max(int((x - ARENA_X) / cell_w), 0), AI_HEATMAP_COLS - 1)
+        row = min(max(int((y - ARENA_Y) / cell_h), 0), AI_HEATMAP_ROWS - 1)
+        cells[row, col] += 1.0
+    return (time.perf_counter_ns() - start) / len(track) / 1000, cells
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=300.0)
+    args = parser.parse_args()
+
+    track = make_track(int(args.seconds * SIM_TICK_RATE))
+    eager_us, eager_cells = eager(track)
+    grid = new_grid()
+    start = time.perf_counter_ns()
+    for x, y in track:
+        grid.add(x, y)
+    lazy_us = (time.perf_counter_ns() - start) / len(track) / 1000
+    drift = np.abs(grid.values() - eager_cells).max() / eager_cells.max()
+
+    queries = 2000
+    start = time.perf_counter_ns()
+    for _ in range(queries):
+        grid.hot_cells(AI_HEATMAP_TOP_K)
+    query_us = (time.perf_counter_ns() - start) / queries / 1000
+
+    # Cobertura de la lluvia: un ataque por segundo, con el mapa aprendido hasta ese tick
+    rng = random.Random(5)
+    grid = new_grid()
+    store = DropCounter()
+    close = {"antes": 0, "ahora": 0}
+    drops = {"antes": 0, "ahora": 0}
+    for tick, (x, y) in enumerate(track):
+        grid.add(x, y)
+        if tick % SIM_TICK_RATE or tick < SIM_TICK_RATE * 10:
+            continue
+        columns = [spot[0] for spot in grid.hot_cells(AI_HEATMAP_TOP_K)]
+        for name, used in (("antes", ()), ("ahora", columns)):
+            AttackPattern.poison_rain(store, WIDTH // 2, ARENA_Y - 50, BULLET_BASE_SPEED, rng=rng, columns=used)
+            close[name] += sum(1 for drop_x in store.xs if abs(drop_x - x) <= PLAYER_SIZE)
+            drops[name] += len(store.xs)
+
+    print(f"{len(track)} ticks ({args.seconds:.0f} s a {SIM_TICK_RATE} Hz), "
+          f"grilla {AI_HEATMAP_COLS}x{AI_HEATMAP_ROWS}, vida media {AI_HEATMAP_HALF_LIFE:.0f} s")
+    print(f"muestra por tick: {eager_us:.2f} µs olvidando en cada tick, {lazy_us:.2f} µs con peso creciente "
+          f"(diferencia máx. {drift:.1e})")
+    print(f"celdas calientes (top {AI_HEATMAP_TOP_K}): {query_us:.1f} µs por consulta")
+    for name in ("antes", "ahora"):
+        print(f"lluvia {name}: {close[name] / drops[name] * 100:.1f}% de las gotas a menos de {PLAYER_SIZE} px del jugador")
+    print(f"archivo: {len(grid.to_bytes())} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_idle.py - CPU consumida por el loop en escenas quietas
+#
+# Uso: python benchmarks/bench_idle.py [--seconds 5]
+#
+# Corre Game.run de verdad (con el reloj y los eventos de pygame) en el menú
+# principal y con el diálogo de inicio de combate abierto, sin tocar nada,
+# y compara el tiempo de CPU del proceso con el tiempo real transcurrido.
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from game import Game
+
+def measure(scene, seconds):
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(behavior_file=None)
+        if scene == "menú":
+            game.current_state = "MENU"
+        else:
+            game.start_game("normal")  # abre el diálogo de presentación del boss
+        # Que la decodificación de sonidos en segundo plano no entre en la medición
+        game.sound_manager.wait_until_loaded()
+
+        # El propio loop se cierra al recibir QUIT después de `seconds`
+        pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), 1)
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            game.run()
+        except SystemExit:
+            pass
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    return cpu, wall
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'escena':<10} | {'CPU (s)':>8} | {'real (s)':>8} | {'uso CPU':>8}")
+    print("-" * 44)
+    for scene in ("menú", "diálogo"):
+        cpu, wall = measure(scene, args.seconds)
+        print(f"{scene:<10} | {cpu:>8.2f} | {wall:>8.2f} | {cpu / wall:>8.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# benchmarks/bench_predictor.py - Puntería predictiva: error al llegar la bala y costo por llamada
+#
+# Uso: python benchmarks/bench_predictor.py [--seconds 300] [--noise 2e7] [--persistence 0.4]
+#
+# Un jugador simulado cambia de dirección al azar dentro de la arena, con
+# teclas cortas (nervioso) o largas (esquivas sostenidas), o repite una
+# secuencia de teclas el 80% de las veces (hábitos). Cada medio
+# segundo tres emisores (Yacumama y dos espíritus) apuntan con cada método
+# y se mide a cuántos px del jugador pasa la bala cuando recorre la
+# distancia hasta el punto apuntado:
+#   actual    - la posición de ahora
+#   anterior  - el desplazamiento fijo según la dirección preferida (50-91 px)
+#   kalman cv - velocidad constante, al tiempo de vuelo (--persistence fijo)
+#   kalman ca - aceleración constante, ídem
+#   AIBrain   - lo que usa el juego: cv con el tiempo de tecla aprendido
+#               y la próxima tecla según los n-gramas ("sin n-gramas": sin eso)
+# Después mide cuánto cuestan el update por tick y la predicción para los
+# tres emisores.
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import *
+from core.kalman import MotionTracker
+from ai_brain import AIBrain
+
+BOUNDS = (ARENA_X, ARENA_Y, ARENA_X + ARENA_WIDTH - PLAYER_SIZE, ARENA_Y + ARENA_HEIGHT - PLAYER_SIZE)
+EMITTERS = [(WIDTH // 2, 100), (ARENA_X - 60, ARENA_Y + ARENA_HEIGHT // 2),
+            (ARENA_X + ARENA_WIDTH + 60, ARENA_Y + ARENA_HEIGHT // 2)]
+SPEEDS = [BULLET_BASE_SPEED, BULLET_BASE_SPEED * 1.5, BULLET_BASE_SPEED * 2.0]
+ATTACK_INTERVAL = 0.5
+
+# Secuencia del jugador con hábitos; "quieto" aparece dos veces, así que
+# para saber qué sigue hace falta más de una tecla de contexto
+HABIT = [(-1, 0), (0, 0), (-1, 0), (0, -1), (1, 0), (0, 0), (1, 1), (0, 1)]
+
+def make_track(ticks, dt, hold, habits=False, seed=7):
+    """Posiciones del jugador tick a tick; cada dirección dura entre hold[0] y hold[1] s"""
+    rng = random.Random(seed)
+    x, y = ARENA_X + ARENA_WIDTH / 2, ARENA_Y + ARENA_HEIGHT / 2
+    step = PLAYER_SPEED * dt
+    track = []
+    position = 0
+    while len(track) < ticks:
+        if habits and rng.random() < 0.8:
+            position = (position + 1) % len(HABIT)
+            dx, dy = HABIT[position]
+        else:
+            dx, dy = rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1))
+        for _ in range(int(rng.uniform(*hold) / dt)):
+            x = min(max(x + dx * step, BOUNDS[0]), BOUNDS[2])
+            y = min(max(y + dy * step, BOUNDS[1]), BOUNDS[3])
+            track.append((x, y, dx, dy))
+    return track[:ticks]
+
+def legacy_aim(x, y, dodges):
+    """get_predicted_position anterior, con la dirección más esquivada y el mínimo desplazamiento"""
+    direction = max(dodges, key=dodges.get) if max(dodges.values()) > 0 else "none"
+    offset = 70
+    return {"left": (x - offset, y), "right": (x + offset, y),
+            "up": (x, y - offset), "down": (x, y + offset)}.get(direction, (x, y))
+
+def miss(track, tick, dt, origin, speed, aim):
+    """Distancia entre la bala y el jugador cuando la bala llega al punto apuntado"""
+    flight = math.hypot(aim[0] - origin[0], aim[1] - origin[1]) / speed
+    later = min(tick + int(round(flight / dt)), len(track) - 1)
+    return math.hypot(track[later][0] - aim[0], track[later][1] - aim[1])
+
+def accuracy(track, dt, noise, persistence):
+    trackers = {model: MotionTracker(dt, noise, AI_TRACKER_MEASUREMENT_NOISE, PLAYER_SPEED, BOUNDS,
+                                     model=model, persistence=persistence)
+                for model in ("cv", "ca")}
+    brain = AIBrain(behavior_file=None)
+    plain = AIBrain(behavior_file=None)
+    plain.next_velocity = lambda: (0.0, 0.0)
+    errors = {"actual": [], "anterior": [], "kalman cv": [], "kalman ca": [],
+              "sin n-gramas": [], "AIBrain": []}
+    dodges = {"left": 0, "right": 0, "up": 0, "down": 0}
+    every = int(ATTACK_INTERVAL / dt)
+    for tick, (x, y, dx, dy) in enumerate(track):
+        if dx:
+            dodges["left" if dx < 0 else "right"] += 1
+        if dy:
+            dodges["up" if dy < 0 else "down"] += 1
+        for tracker in trackers.values():
+            tracker.update(x, y)
+        for ai in (brain, plain):
+            ai.sample(x, y)
+            if tick % int(AI_ANALYSIS_INTERVAL / dt) == 0:
+                ai.analyze_movement_pattern(None, tick * dt)
+        if tick % every or tick < every:
+            continue
+        for origin, speed in zip(EMITTERS, SPEEDS):
+            errors["actual"].append(miss(track, tick, dt, origin, speed, (x, y)))
+            errors["anterior"].append(miss(track, tick, dt, origin, speed, legacy_aim(x, y, dodges)))
+            for model, tracker in trackers.items():
+                aim = tracker.intercept(origin[0], origin[1], speed)
+                errors[f"kalman {model}"].append(miss(track, tick, dt, origin, speed, aim))
+            for name, ai in (("sin n-gramas", plain), ("AIBrain", brain)):
+                aim = ai.get_predicted_position(x, y, origin[0], origin[1], speed)
+                errors[name].append(miss(track, tick, dt, origin, speed, aim))
+    return errors, brain.hold_ticks * dt
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+def timing(track, dt, noise, persistence):
+    tracker = MotionTracker(dt, noise, AI_TRACKER_MEASUREMENT_NOISE, PLAYER_SPEED, BOUNDS,
+                            model=AI_TRACKER_MODEL, persistence=persistence)
+    start = time.perf_counter_ns()
+    for x, y, _, _ in track:
+        tracker.update(x, y)
+    update_us = (time.perf_counter_ns() - start) / len(track) / 1000
+
+    calls = 2000
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        for origin, speed in zip(EMITTERS, SPEEDS):
+            tracker.intercept(origin[0], origin[1], speed)
+    predict_us = (time.perf_counter_ns() - start) / calls / 1000
+    return update_us, predict_us
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=300.0)
+    parser.add_argument("--noise", type=float, default=AI_TRACKER_PROCESS_NOISE)
+    parser.add_argument("--persistence", type=float, default=AI_TRACKER_PERSISTENCE)
+    args = parser.parse_args()
+
+    dt = 1 / SIM_TICK_RATE
+    ticks = int(args.seconds * SIM_TICK_RATE)
+    scenarios = (("teclas cortas (0.05-0.25 s)", (0.05, 0.25), False),
+                 ("teclas largas (0.3-1.5 s)", (0.3, 1.5), False),
+                 ("hábitos (0.3-1.0 s)", (0.3, 1.0), True))
+    for label, hold, habits in scenarios:
+        track = make_track(ticks, dt, hold, habits)
+        errors, hold_time = accuracy(track, dt, args.noise, args.persistence)
+        print(f"{label}: {args.seconds:.0f} s a {SIM_TICK_RATE} Hz, {len(errors['actual'])} disparos, "
+              f"tecla aprendida {hold_time:.2f} s")
+        for name, values in errors.items():
+            hits = sum(1 for value in values if value <= PLAYER_SIZE) / len(values) * 100
+            print(f"  {name:12s} error medio {sum(values) / len(values):6.1f} px  "
+                  f"p50 {percentile(values, 50):6.1f}  p90 {percentile(values, 90):6.1f}  "
+                  f"a menos de {PLAYER_SIZE} px {hits:4.1f}%")
+
+    update_us, predict_us = timing(track, dt, args.noise, args.persistence)
+    print(f"update por tick: {update_us:.2f} µs")
+    print(f"predicción para {len(EMITTERS)} emisores: {predict_us:.1f} µs")
+
+if __name__ == "__main__":
+    main()
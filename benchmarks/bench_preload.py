@@ -0,0 +1,92 @@
+# benchmarks/bench_preload.py - Costo de crear el boss siguiente con y sin precarga
+#
+# Uso: python benchmarks/bench_preload.py [repeticiones]
+#
+# Cada medición corre en un proceso nuevo y sin caché de sprites en disco
+# (el peor caso: la primera partida). Se gana la fase 1, se deja correr la
+# transición de 3 s y se mide lo que tarda `advance_to_next_phase` (crear a
+# Chullachaqui) y `start_revival_sequence` (los espíritus de Yacumama).
+# Antes de cada uno se juega un segundo a ritmo real con el boss por debajo
+# de PRELOAD_HP_FRACTION, que es cuando arranca la precarga.
+
+import os
+import shutil
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import os, sys, time, contextlib, io
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+sys.path.insert(0, os.getcwd())
+from game import Game
+
+preload = sys.argv[1] == "1"
+with contextlib.redirect_stdout(io.StringIO()):
+    game = Game(behavior_file=None)
+    if not preload:
+        game.preloader.request = lambda *args, **kwargs: None
+    game.start_game("normal", record=False)
+    game.dialogue_box.active = False
+    game.player.take_damage = lambda amount: False
+
+    def play_until(done):
+        while not done():
+            game.dialogue_box.active = False
+            game.step_simulation(game.tick_dt)
+
+    def play_for(seconds):
+        # A ritmo real, como en la ventana
+        start = time.perf_counter()
+        for tick in range(int(seconds / game.tick_dt)):
+            game.dialogue_box.active = False
+            game.step_simulation(game.tick_dt)
+            time.sleep(max(0.0, start + (tick + 1) * game.tick_dt - time.perf_counter()))
+
+    # Fase 1: un segundo de combate por debajo del umbral de precarga
+    game.boss.hp = game.boss.max_hp * 0.45
+    play_for(1.0)
+    game.boss.hp = 0
+    play_until(lambda: game.phase_transition)
+    game.transition_timer = game.transition_duration - game.tick_dt * 2
+    start = time.perf_counter()
+    play_until(lambda: game.current_phase == 2)
+    phase_ms = (time.perf_counter() - start) * 1000
+
+    # Yacumama: por debajo del umbral, luego la resurrección al 25%
+    game.current_phase = 2
+    game.boss.hp = 0
+    play_until(lambda: game.phase_transition)
+    game.transition_timer = game.transition_duration
+    play_until(lambda: game.current_phase == 3)
+    game.boss.hp = game.boss.max_hp * 0.45
+    play_for(1.0)
+    game.boss.hp = game.boss.max_hp * 0.2
+    start = time.perf_counter()
+    game.boss.start_revival_sequence()
+    spirits_ms = (time.perf_counter() - start) * 1000
+# Con marca y en una sola escritura: el hilo de precarga también imprime
+sys.stdout.write(f"TIMINGS {phase_ms:.2f} {spirits_ms:.2f}\\n")
+"""
+
+def measure(preload):
+    shutil.rmtree(os.path.join(ROOT, "data", "cache"), ignore_errors=True)
+    out = subprocess.run([sys.executable, "-c", CHILD, "1" if preload else "0"], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    line = next(line for line in out.splitlines() if "TIMINGS " in line)
+    return [float(v) for v in line.split("TIMINGS ", 1)[1].split()]
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"Mediana de {runs} procesos, sin caché en disco (ms en el hilo principal)")
+    print(f"{'':<12} | {'cambio a fase 2':>15} | {'espíritus':>9}")
+    print("-" * 44)
+    for label, preload in (("sin precarga", False), ("con precarga", True)):
+        samples = [measure(preload) for _ in range(runs)]
+        phase_ms, spirits_ms = [sorted(col)[len(col) // 2] for col in zip(*samples)]
+        print(f"{label:<12} | {phase_ms:>15.1f} | {spirits_ms:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_restart.py - Reinicio tras perder: Game.__init__ vs. reset_fight
+#
+# Uso: python benchmarks/bench_restart.py [--runs 20]
+#
+# Mide, en el mismo proceso, el tiempo desde que se pide el reinicio hasta
+# el primer frame jugable dibujado y enviado a pantalla. El camino viejo
+# (volver a llamar a Game.__init__) además obligaba a pasar por la intro y
+# el menú, que no se cuentan acá.
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Game
+
+def lose(game):
+    game.start_game("normal", record=False)
+    game.dialogue_box.active = False
+    for _ in range(60):
+        game.step_simulation(game.tick_dt)
+    game.player.hp = 0
+    game.step_simulation(game.tick_dt)
+    game.draw()
+
+def restart_reinit(game):
+    game.__init__(behavior_file=None)
+    game.start_game("normal", record=False)
+    game.dialogue_box.active = False
+
+def restart_reset(game):
+    game.reset_fight()
+
+def measure(restart, runs):
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(behavior_file=None)
+        game.config["record_replays"] = False
+        game.sound_manager.wait_until_loaded()
+        for _ in range(runs):
+            lose(game)
+            start = time.perf_counter()
+            restart(game)
+            game.draw()
+            game.present()
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'camino':<14} | {'mediana':>8} | {'máx.':>8}")
+    print("-" * 36)
+    for label, restart in (("Game.__init__", restart_reinit), ("reset_fight", restart_reset)):
+        samples = measure(restart, args.runs)
+        print(f"{label:<14} | {statistics.median(samples):>8.2f} | {max(samples):>8.2f}")
+    print("(ms hasta el primer frame jugable)")
+
+if __name__ == "__main__":
+    main()
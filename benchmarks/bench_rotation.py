@@ -0,0 +1,104 @@
+# benchmarks/bench_rotation.py - Oleadas de espirales: rotar cada frame vs. atlas
+#
+# Uso: python benchmarks/bench_rotation.py
+#
+# Simula las espirales de Chullachaqui (15 balas) y Yacumama (18 + 15) cada
+# 0.5 s durante 10 s, actualizando y dibujando en una superficie de 800x600.
+# "antes": cada bala espiral rota su sprite con pygame.transform.rotate en
+# cada frame, como hacía Bullet.update. "atlas": BulletStore con cada calidad.
+
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from settings import *
+
+FRAMES = 600
+DT = 1 / FPS
+WAVE_EVERY = 30
+EMITTERS = [(WIDTH // 2, 100, 15), (WIDTH // 2, 120, 18), (WIDTH // 2 - 150, 150, 15)]
+
+class LegacySpiral:
+    """Bala espiral con el comportamiento anterior (rotación por frame)"""
+    def __init__(self, x, y, angle, speed, original):
+        self.x = x
+        self.y = y
+        self.angle = angle
+        self.speed = speed
+        self.original = original
+        self.sprite = pygame.transform.rotate(original, math.degrees(-angle))
+        self.active = True
+
+    def update(self, dt):
+        self.x += math.cos(self.angle) * self.speed * dt
+        self.y += math.sin(self.angle) * self.speed * dt
+        self.angle += dt * 2
+        self.sprite = pygame.transform.rotate(self.original, math.degrees(-self.angle))
+        if not (ARENA_X - 100 <= self.x <= ARENA_X + ARENA_WIDTH + 100 and
+                ARENA_Y - 100 <= self.y <= ARENA_Y + ARENA_HEIGHT + 100):
+            self.active = False
+
+    def draw(self, screen):
+        screen.blit(self.sprite, self.sprite.get_rect(center=(int(self.x), int(self.y))))
+
+def run_legacy(screen, original):
+    bullets = []
+    peak = 0
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        if frame % WAVE_EVERY == 0:
+            for x, y, count in EMITTERS:
+                for i in range(count):
+                    angle = (2 * math.pi / count) * i + frame * DT * 2
+                    bullets.append(LegacySpiral(x, y, angle, BULLET_BASE_SPEED, original))
+        for bullet in bullets[:]:
+            bullet.update(DT)
+            if not bullet.active:
+                bullets.remove(bullet)
+        screen.fill(BLACK)
+        for bullet in bullets:
+            bullet.draw(screen)
+        peak = max(peak, len(bullets))
+    return (time.perf_counter() - start) * 1000 / FRAMES, peak
+
+def run_atlas(screen, quality):
+    from attack_patterns import AttackPattern, BulletStore
+    BulletStore.set_rotation_quality(quality)
+    BulletStore.prepare_sprites()
+    store = BulletStore()
+    peak = 0
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        if frame % WAVE_EVERY == 0:
+            for x, y, count in EMITTERS:
+                AttackPattern.spiral(store, x, y, count, BULLET_BASE_SPEED, frame * DT * 2)
+        store.update(DT)
+        screen.fill(BLACK)
+        store.draw(screen)
+        peak = max(peak, len(store))
+    elapsed = (time.perf_counter() - start) * 1000 / FRAMES
+    return elapsed, peak, BulletStore.atlas.memory_bytes()
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    original = pygame.transform.scale(
+        pygame.image.load(ATTACK_SPRITES["serpiente"]).convert_alpha(), (30, 30))
+
+    print(f"{'modo':<12} | {'ms/frame':>8} | {'balas máx.':>10} | {'memoria atlas':>13}")
+    print("-" * 53)
+    legacy_ms, peak = run_legacy(screen, original)
+    print(f"{'antes':<12} | {legacy_ms:>8.3f} | {peak:>10} | {'-':>13}")
+    for quality, buckets in ROTATION_QUALITY.items():
+        atlas_ms, peak, memory = run_atlas(screen, quality)
+        label = f"{quality} ({buckets})"
+        print(f"{label:<12} | {atlas_ms:>8.3f} | {peak:>10} | {memory / 1024:>10.0f} KB")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
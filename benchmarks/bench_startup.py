@@ -0,0 +1,73 @@
+# benchmarks/bench_startup.py - Arranque en frío vs. con caché de sprites en disco
+#
+# Uso: python benchmarks/bench_startup.py [repeticiones]
+#
+# Cada medición corre en un proceso nuevo (ventana y audio "dummy") y mide
+# el tiempo hasta el primer frame del menú y la carga del primer combate.
+# "sin caché" borra data/cache antes de cada proceso; "con caché" la reutiliza.
+
+import os
+import shutil
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import os, sys, time
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+sys.path.insert(0, os.getcwd())
+import pygame
+from game import Game
+from boss import Boss
+
+game = Game()
+game.main_menu.draw()
+pygame.display.flip()
+menu_ms = (time.perf_counter() - game.boot_start) * 1000
+
+start = time.perf_counter()
+game.start_game("normal")
+game.draw()
+pygame.display.flip()
+fight_ms = (time.perf_counter() - start) * 1000
+
+start = time.perf_counter()
+for phase in (2, 3):
+    Boss(400, 100, game.ai_brain, phase=phase)
+phases_ms = (time.perf_counter() - start) * 1000
+# Con marca y en una sola escritura: el hilo de precarga también imprime
+sys.stdout.write(f"TIMINGS {menu_ms:.2f} {fight_ms:.2f} {phases_ms:.2f}\\n")
+"""
+
+def measure(clear_cache):
+    if clear_cache:
+        shutil.rmtree(os.path.join(ROOT, "data", "cache"), ignore_errors=True)
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    line = next(line for line in out.splitlines() if "TIMINGS " in line)
+    return [float(v) for v in line.split("TIMINGS ", 1)[1].split()]
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    behavior = os.path.join(ROOT, "data", "behavior.json")
+    backup = open(behavior, 'rb').read() if os.path.exists(behavior) else None
+    try:
+        results = {}
+        for label, clear in (("sin caché", True), ("con caché", False)):
+            samples = [measure(clear) for _ in range(runs)]
+            results[label] = [sorted(col)[len(col) // 2] for col in zip(*samples)]
+    finally:
+        if backup is not None:
+            with open(behavior, 'wb') as f:
+                f.write(backup)
+
+    print(f"Mediana de {runs} procesos (ms)")
+    print(f"{'':<10} | {'primer menú':>11} | {'carga fase 1':>12} | {'fases 2 y 3':>11}")
+    print("-" * 54)
+    for label, (menu_ms, fight_ms, phases_ms) in results.items():
+        print(f"{label:<10} | {menu_ms:>11.1f} | {fight_ms:>12.1f} | {phases_ms:>11.1f}")
+
+if __name__ == "__main__":
+    main()
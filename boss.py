@@ -1,16 +1,24 @@
 # boss.py - Sistema de bosses actualizado con sprites correctos
 
 import pygame
-import random
-import os
 import math
 from settings import *
-from attack_patterns import AttackPattern, LaserBeam, Warning
+from attack_patterns import AttackPattern, BulletStore, LaserBeam
+from core.collision import CollisionWorld
+from core.asset_manager import assets
+from core.profiler import profiler
+from core.rng import FightRNG
+from core.snapshot import save_objects, load_objects
+from core.text_cache import texts
+from utils import lerp
 
 class Boss:
-    def __init__(self, x, y, ai_brain, phase=1, difficulty_mod=None, is_spirit=False): 
+    def __init__(self, x, y, ai_brain, phase=1, difficulty_mod=None, is_spirit=False, bullet_store=None,
+                 collisions=None, rng=None): 
         self.x = x
         self.y = y
+        self.prev_x = x   # posición del tick anterior, para interpolar el dibujo
+        self.prev_y = y
         self.phase = phase
         self.phase_config = BOSS_PHASES[phase]
         self.is_spirit = is_spirit  # Indica si es un boss revivido
@@ -36,13 +44,18 @@ class Boss:
         self.current_dialogue = ""
         
         self.difficulty_mod = mod 
+        # Azar del combate; los espíritus comparten los flujos de quien los invoca
+        self.rng = rng if rng is not None else FightRNG()
         
         # Sprites
         self.sprites = {}
         self.load_sprites()
         
-        # Combate
-        self.bullets = []
+        # Combate: los espíritus disparan al almacén de balas de quien los invoca;
+        # el boss principal puede recibir uno reutilizado (el Game guarda uno por sesión)
+        self.owns_bullets = not is_spirit
+        self.bullets = bullet_store if bullet_store is not None else BulletStore()
+        self.collisions = collisions if collisions is not None else CollisionWorld()
         self.attack_timer = 0
         self.attack_cooldown = 2.0 / self.speed_multiplier
         self.rotation = 0
@@ -86,70 +99,63 @@ class Boss:
                 "enajenado": ["¡WESTIORA RONO! 💀", "¡KOPI WESTIORA! 🔥", "¡JATON JAWE!"]
             }
     
-    def load_sprites(self):
-        """Carga sprites según el estado y si es espíritu"""
-        if self.is_spirit:
+    @staticmethod
+    def sprite_requests(phase, is_spirit=False):
+        """Sprites que usa un boss: estado -> (ruta, tamaño, alpha).
+
+        También la usa la precarga para decodificarlos antes de crear el boss.
+        """
+        if is_spirit:
             # Sprites especiales para espíritus
-            if self.phase == 1:
+            if phase == 1:
                 sprite_path = "assets/boss/yacuruna-espiritu.png"
-            elif self.phase == 2:
+            elif phase == 2:
                 sprite_path = "assets/boss/espiritu-chullachaqui.png"
             else:
-                sprite_path = self.phase_config.get("sprite_normal", "")
+                sprite_path = BOSS_PHASES[phase].get("sprite_normal", "")
             
-            # Un solo sprite para espíritus
-            if os.path.exists(sprite_path):
-                try:
-                    img = pygame.image.load(sprite_path).convert_alpha()
-                    size = 70  # Más pequeños que los originales
-                    img = pygame.transform.scale(img, (size, size))
-                    # Semi-transparentes
-                    img.set_alpha(200)
-                    self.sprites["tranquilo"] = img
-                    self.sprites["furioso"] = img
-                    self.sprites["enajenado"] = img
-                except Exception as e:
-                    print(f"Error cargando sprite espíritu: {e}")
-        else:
-            # Sprites normales según el estado
-            # Mapeo correcto de estados a sprites
-            if self.phase == 1:  # Yacuruna
-                sprite_map = {
-                    "tranquilo": "assets/boss/boos_tranki.png",
-                    "furioso": "assets/boss/boos_furioso.png",
-                    "enajenado": "assets/boss/boos_enojado.png"
-                }
-            elif self.phase == 2:  # Chullachaqui
-                sprite_map = {
-                    "tranquilo": "assets/boss/CHULLACHAQUI.png",
-                    "furioso": "assets/boss/Chullachaqui_furioso.png",
-                    "enajenado": "assets/boss/CHULLACHAQUI-ENOJADO.png"
-                }
-            else:  # Yacumama
-                sprite_map = {
-                    "tranquilo": "assets/boss/yacumama.png",
-                    "furioso": "assets/boss/yacumama_furioso.png",
-                    "enajenado": "assets/boss/yacumama-enojado.png"
-                }
-            
-            for state, sprite_path in sprite_map.items():
-                if os.path.exists(sprite_path):
-                    try:
-                        img = pygame.image.load(sprite_path).convert_alpha()
-                        size = 80 + (self.phase - 1) * 15
-                        img = pygame.transform.scale(img, (size, size))
-                        self.sprites[state] = img
-                    except Exception as e:
-                        print(f"Error cargando {sprite_path}: {e}")
-                        self.sprites[state] = None
-                else:
-                    self.sprites[state] = None
+            # Un solo sprite para espíritus, más pequeño y semi-transparente
+            size = 70
+            request = (sprite_path, (size, size), 200)
+            return {"tranquilo": request, "furioso": request, "enajenado": request}
+        
+        # Sprites normales según el estado
+        # Mapeo correcto de estados a sprites
+        if phase == 1:  # Yacuruna
+            sprite_map = {
+                "tranquilo": "assets/boss/boos_tranki.png",
+                "furioso": "assets/boss/boos_furioso.png",
+                "enajenado": "assets/boss/boos_enojado.png"
+            }
+        elif phase == 2:  # Chullachaqui
+            sprite_map = {
+                "tranquilo": "assets/boss/CHULLACHAQUI.png",
+                "furioso": "assets/boss/Chullachaqui_furioso.png",
+                "enajenado": "assets/boss/CHULLACHAQUI-ENOJADO.png"
+            }
+        else:  # Yacumama
+            sprite_map = {
+                "tranquilo": "assets/boss/yacumama.png",
+                "furioso": "assets/boss/yacumama_furioso.png",
+                "enajenado": "assets/boss/yacumama-enojado.png"
+            }
+        
+        size = 80 + (phase - 1) * 15
+        return {state: (sprite_path, (size, size), None) for state, sprite_path in sprite_map.items()}
+    
+    def load_sprites(self):
+        """Carga sprites según el estado y si es espíritu (ya en caché si hubo precarga)"""
+        for state, (sprite_path, size, alpha) in self.sprite_requests(self.phase, self.is_spirit).items():
+            img = assets.get(sprite_path, size, alpha=alpha)
+            if img:
+                self.sprites[state] = img
     
     def take_damage(self, amount):
         adjusted_damage = amount / self.damage_multiplier
         self.hp -= adjusted_damage
         self.hit_flash = 0.2
-        self.shake_offset = [random.randint(-5, 5), random.randint(-5, 5)]
+        shake = self.rng.efectos
+        self.shake_offset = [shake.randint(-5, 5), shake.randint(-5, 5)]
         
         self.update_state_by_hp()
         
@@ -182,17 +188,21 @@ class Boss:
         mod = self.difficulty_mod
         
         # Revivir Yacuruna como espíritu
-        boss1 = Boss(self.x - 150, self.y + 50, self.ai, phase=1, difficulty_mod=mod, is_spirit=True) 
+        boss1 = Boss(self.x - 150, self.y + 50, self.ai, phase=1, difficulty_mod=mod, is_spirit=True,
+                     bullet_store=self.bullets, collisions=self.collisions, rng=self.rng)
         revived.append(boss1)
         
         # Revivir Chullachaqui como espíritu
-        boss2 = Boss(self.x + 150, self.y + 50, self.ai, phase=2, difficulty_mod=mod, is_spirit=True) 
+        boss2 = Boss(self.x + 150, self.y + 50, self.ai, phase=2, difficulty_mod=mod, is_spirit=True,
+                     bullet_store=self.bullets, collisions=self.collisions, rng=self.rng)
         revived.append(boss2)
         
         print("¡Yacumama invoca a los espíritus de los caídos!")
         return revived
 
     def update(self, dt, player):
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.dialogue_timer += dt
         self.rotation += dt * 2
         
@@ -214,8 +224,10 @@ class Boss:
         if self.hit_flash > 0:
             self.hit_flash -= dt
         if self.shake_offset != [0, 0]:
-            self.shake_offset[0] *= 0.9
-            self.shake_offset[1] *= 0.9
+            # Se amortigua un 10% cada 1/60 s, sea cual sea la frecuencia de ticks
+            decay = 0.9 ** (dt * 60)
+            self.shake_offset[0] *= decay
+            self.shake_offset[1] *= decay
             if abs(self.shake_offset[0]) < 0.5 and abs(self.shake_offset[1]) < 0.5:
                 self.shake_offset = [0, 0]
         
@@ -235,23 +247,26 @@ class Boss:
                 if player.take_damage(damage):
                     pass
         
-        # Actualizar balas
-        for bullet in self.bullets[:]:
-            bullet.update(dt, self.speed_multiplier)
-            if not bullet.active:
-                self.bullets.remove(bullet)
-            elif bullet.get_rect().colliderect(player.get_rect()):
-                damage = 10 * self.damage_multiplier
-                if player.take_damage(damage):
-                    pass
-                self.bullets.remove(bullet)
+        # Actualizar balas (solo el dueño del almacén; la velocidad ya viene escalada)
+        # y reindexa el mundo de colisiones que comparten los espíritus
+        if self.owns_bullets:
+            with profiler.span("bullets"):
+                self.bullets.update(dt)
+            with profiler.span("collisions"):
+                self.collisions.rebuild(self.bullets, player.bullets)
+                
+                hits = self.collisions.enemy_bullets_in_rect(player.get_rect())
+                if len(hits):
+                    damage = 10 * self.damage_multiplier
+                    if player.take_damage(damage):
+                        pass
+                    self.bullets.remove(hits)
         
         # Colisiones con balas del jugador
-        for bullet in player.bullets[:]:
-            boss_rect = pygame.Rect(self.x - 40, self.y - 40, 80, 80)
-            if bullet.get_rect().colliderect(boss_rect):
-                self.take_damage(bullet.damage)
-                bullet.active = False 
+        boss_rect = pygame.Rect(self.x - 40, self.y - 40, 80, 80)
+        for bullet in self.collisions.player_bullets_in_rect(boss_rect):
+            self.take_damage(bullet.damage)
+            bullet.active = False 
         
         # Colisiones con ataques especiales
         for special in player.special_attacks[:]:
@@ -290,11 +305,17 @@ class Boss:
             (ARENA_X + ARENA_WIDTH // 2, ARENA_Y - 60),  # Arriba
         ]
         
-        new_pos = random.choice(positions)
+        new_pos = self.rng.laser.choice(positions)
         self.x, self.y = new_pos
+        self.prev_x, self.prev_y = new_pos  # teletransporte: sin interpolar
         
-        # Ángulo hacia el jugador
-        angle = math.atan2(player.y - self.y, player.x - self.x)
+        # Ángulo hacia la celda caliente más cercana al jugador: adonde suele
+        # volver mientras el láser carga (sin datos, hacia el jugador)
+        target_x, target_y = player.x, player.y
+        hot = self.ai.hot_spots()
+        if hot:
+            target_x, target_y = min(hot, key=lambda spot: (spot[0] - player.x) ** 2 + (spot[1] - player.y) ** 2)
+        angle = math.atan2(target_y - self.y, target_x - self.x)
         
         # Crear advertencia
         warning = AttackPattern.create_laser_warning(self.x, self.y, angle)
@@ -311,93 +332,147 @@ class Boss:
         speed = BULLET_BASE_SPEED * state_config["speed_mult"] * self.speed_multiplier
         color = self.phase_config["color"]
         
-        pred_x, pred_y = self.ai.get_predicted_position(player.x, player.y)
+        # Apunta adonde estará el jugador cuando llegue la bala (velocidad final)
+        pred_x, pred_y = self.ai.get_predicted_position(player.x, player.y, self.x, self.y,
+                                                        speed * self.speed_multiplier)
         
+        first_new = self.bullets.count
         if self.phase == 1:
-            pattern = self.get_yacuruna_attack(player, pred_x, pred_y, speed, color)
+            self.get_yacuruna_attack(player, pred_x, pred_y, speed, color)
         elif self.phase == 2:
-            pattern = self.get_chullachaqui_attack(player, pred_x, pred_y, speed, color)
+            self.get_chullachaqui_attack(player, pred_x, pred_y, speed, color)
         else:
-            pattern = self.get_yacumama_attack(player, pred_x, pred_y, speed, color)
+            self.get_yacumama_attack(player, pred_x, pred_y, speed, color)
         
-        self.bullets.extend(pattern)
+        # Las balas guardan la velocidad final de quien las disparó
+        self.bullets.speed[first_new:self.bullets.count] *= self.speed_multiplier
     
     def get_yacuruna_attack(self, player, pred_x, pred_y, speed, color):
+        store = self.bullets
+        rng = self.rng.patrones
         if self.state == "tranquilo":
             patterns = [
-                AttackPattern.circle_burst(self.x, self.y, 8, speed, BLUE),
-                AttackPattern.water_stream(self.x, self.y, player.x, player.y, speed, CYAN),
+                lambda: AttackPattern.circle_burst(store, self.x, self.y, 8, speed, BLUE),
+                lambda: AttackPattern.water_stream(store, self.x, self.y, player.x, player.y, speed, CYAN, rng=rng),
             ]
         elif self.state == "furioso":
             patterns = [
-                AttackPattern.spiral(self.x, self.y, 12, speed, self.rotation, CYAN),
-                AttackPattern.water_stream(self.x, self.y, pred_x, pred_y, speed * 1.2, BLUE),
+                lambda: AttackPattern.spiral(store, self.x, self.y, 12, speed, self.rotation, CYAN),
+                lambda: AttackPattern.water_stream(store, self.x, self.y, pred_x, pred_y, speed * 1.2, BLUE, rng=rng),
             ]
         else:
             patterns = [
-                [*AttackPattern.circle_burst(self.x, self.y, 16, speed, BLUE),
-                 *AttackPattern.water_stream(self.x, self.y, player.x, player.y, speed, CYAN)],
+                lambda: (AttackPattern.circle_burst(store, self.x, self.y, 16, speed, BLUE),
+                         AttackPattern.water_stream(store, self.x, self.y, player.x, player.y, speed, CYAN, rng=rng)),
             ]
         
-        pattern = random.choice(patterns)
-        if isinstance(pattern, list) and pattern and isinstance(pattern[0], list):
-            pattern = [bullet for sublist in pattern for bullet in sublist]
-        return pattern
+        self.rng.ataques.choice(patterns)()
     
     def get_chullachaqui_attack(self, player, pred_x, pred_y, speed, color):
+        store = self.bullets
+        rng = self.rng.patrones
+        # Las primeras gotas de la lluvia caen sobre las celdas donde más se queda el jugador
+        hot = [x for x, _ in self.ai.hot_spots()]
         if self.state == "tranquilo":
             patterns = [
-                AttackPattern.poison_rain(WIDTH // 2, ARENA_Y - 50, speed, GREEN),
-                AttackPattern.triple_aimed_shot(self.x, self.y, pred_x, pred_y, speed, GREEN),
+                lambda: AttackPattern.poison_rain(store, WIDTH // 2, ARENA_Y - 50, speed, GREEN, rng=rng, columns=hot),
+                lambda: AttackPattern.triple_aimed_shot(store, self.x, self.y, pred_x, pred_y, speed, GREEN),
             ]
         elif self.state == "furioso":
             patterns = [
-                AttackPattern.spiral(self.x, self.y, 15, speed, self.rotation, GREEN),
-                [*AttackPattern.poison_rain(WIDTH // 2, ARENA_Y - 50, speed, GREEN),
-                 *AttackPattern.circle_burst(self.x, self.y, 12, speed, GREEN)],
+                lambda: AttackPattern.spiral(store, self.x, self.y, 15, speed, self.rotation, GREEN),
+                lambda: (AttackPattern.poison_rain(store, WIDTH // 2, ARENA_Y - 50, speed, GREEN, rng=rng, columns=hot),
+                         AttackPattern.circle_burst(store, self.x, self.y, 12, speed, GREEN)),
             ]
         else:
             patterns = [
-                [*AttackPattern.poison_rain(WIDTH // 2, ARENA_Y - 50, speed * 1.2, GREEN),
-                 *AttackPattern.poison_rain(WIDTH // 2, ARENA_Y - 50, speed * 1.2, GREEN)],
+                lambda: (AttackPattern.poison_rain(store, WIDTH // 2, ARENA_Y - 50, speed * 1.2, GREEN, rng=rng, columns=hot),
+                         AttackPattern.poison_rain(store, WIDTH // 2, ARENA_Y - 50, speed * 1.2, GREEN, rng=rng, columns=hot)),
             ]
         
-        pattern = random.choice(patterns)
-        if isinstance(pattern, list) and pattern and isinstance(pattern[0], list):
-            pattern = [bullet for sublist in pattern for bullet in sublist]
-        return pattern
+        self.rng.ataques.choice(patterns)()
     
     def get_yacumama_attack(self, player, pred_x, pred_y, speed, color):
+        store = self.bullets
+        rng = self.rng.patrones
+        hot = [x for x, _ in self.ai.hot_spots()]
         if self.state == "tranquilo":
             patterns = [
-                AttackPattern.spiral(self.x, self.y, 18, speed, self.rotation, PURPLE),
-                AttackPattern.wave_attack(ARENA_X, ARENA_Y - 50, speed, PURPLE),
+                lambda: AttackPattern.spiral(store, self.x, self.y, 18, speed, self.rotation, PURPLE),
+                lambda: AttackPattern.wave_attack(store, ARENA_X, ARENA_Y - 50, speed, PURPLE),
             ]
         elif self.state == "furioso":
             patterns = [
-                [*AttackPattern.poison_rain(WIDTH // 2, ARENA_Y - 50, speed, PURPLE),
-                 *AttackPattern.water_stream(self.x, self.y, pred_x, pred_y, speed, CYAN)],
-                [*AttackPattern.circle_burst(self.x, self.y, 20, speed, PURPLE),
-                 *AttackPattern.spiral(self.x, self.y, 15, speed, self.rotation, CYAN)],
+                lambda: (AttackPattern.poison_rain(store, WIDTH // 2, ARENA_Y - 50, speed, PURPLE, rng=rng, columns=hot),
+                         AttackPattern.water_stream(store, self.x, self.y, pred_x, pred_y, speed, CYAN, rng=rng)),
+                lambda: (AttackPattern.circle_burst(store, self.x, self.y, 20, speed, PURPLE),
+                         AttackPattern.spiral(store, self.x, self.y, 15, speed, self.rotation, CYAN)),
             ]
         else:
             patterns = [
-                [*AttackPattern.poison_rain(WIDTH // 2, ARENA_Y - 50, speed, PURPLE),
-                 *AttackPattern.circle_burst(self.x, self.y, 24, speed, PURPLE)],
+                lambda: (AttackPattern.poison_rain(store, WIDTH // 2, ARENA_Y - 50, speed, PURPLE, rng=rng, columns=hot),
+                         AttackPattern.circle_burst(store, self.x, self.y, 24, speed, PURPLE)),
             ]
         
-        pattern = random.choice(patterns)
-        if isinstance(pattern, list) and pattern and isinstance(pattern[0], list):
-            pattern = [bullet for sublist in pattern for bullet in sublist]
-        return pattern
+        self.rng.ataques.choice(patterns)()
+    
+    def snapshot(self):
+        """Estado del boss (y de las balas, si el almacén es suyo)"""
+        state = self.__dict__.copy()
+        state["shake_offset"] = list(self.shake_offset)
+        state["lasers"] = save_objects(self.lasers)
+        state["warnings"] = save_objects(self.warnings)
+        state["bullets"] = (self.bullets, self.bullets.snapshot() if self.owns_bullets else None)
+        return state
+    
+    def restore(self, state):
+        self.__dict__.update(state)
+        self.bullets, bullet_state = state["bullets"]
+        if bullet_state is not None:
+            self.bullets.restore(bullet_state)
+        self.shake_offset = list(state["shake_offset"])
+        self.lasers = load_objects(state["lasers"])
+        self.warnings = load_objects(state["warnings"])
     
     def show_dialogue(self):
-        self.current_dialogue = random.choice(self.dialogues[self.state])
+        self.current_dialogue = self.rng.dialogos.choice(self.dialogues[self.state])
         self.dialogue_timer = 2.0
     
-    def draw(self, screen):
-        draw_x = int(self.x + self.shake_offset[0])
-        draw_y = int(self.y + self.shake_offset[1])
+    def mark_dirty(self, renderer, alpha=1.0):
+        """Marca para el render sucio todo lo que dibuja `draw` (menos la barra de HP)"""
+        x = lerp(self.prev_x, self.x, alpha)
+        y = lerp(self.prev_y, self.y, alpha)
+        draw_x = int(x + self.shake_offset[0])
+        draw_y = int(y + self.shake_offset[1])
+        
+        for warning in self.warnings:
+            warning.mark_dirty(renderer)
+        for laser in self.lasers:
+            laser.mark_dirty(renderer)
+        
+        sprite = self.sprites.get(self.state)
+        if sprite:
+            renderer.mark_rect(draw_x - sprite.get_width() // 2, draw_y - sprite.get_height() // 2,
+                               sprite.get_width() + 1, sprite.get_height() + 1)
+        else:
+            renderer.mark_circle(draw_x, draw_y, 40 + (self.phase - 1) * 5 + 2)
+        if self.regenerating:
+            renderer.mark_circle(draw_x, draw_y, 62)
+        
+        if self.owns_bullets:
+            self.bullets.mark_dirty(renderer, alpha)
+        
+        if self.dialogue_timer > 0 and self.current_dialogue:
+            text = texts.render(self.current_dialogue, 24, WHITE)
+            bg_rect = text.get_rect(center=(x, y - 80)).inflate(22, 12)
+            renderer.mark_rect(*bg_rect)
+    
+    def draw(self, screen, hp_bar=True, alpha=1.0):
+        # Posición interpolada entre los dos últimos ticks de la simulación
+        x = lerp(self.prev_x, self.x, alpha)
+        y = lerp(self.prev_y, self.y, alpha)
+        draw_x = int(x + self.shake_offset[0])
+        draw_y = int(y + self.shake_offset[1])
         
         # Advertencias
         for warning in self.warnings:
@@ -436,15 +511,14 @@ class Boss:
             pygame.draw.circle(screen, color, (draw_x, draw_y), size)
             pygame.draw.circle(screen, BLACK, (draw_x, draw_y), size, 3)
         
-        # Balas
-        for bullet in self.bullets:
-            bullet.draw(screen)
+        # Balas (las de los espíritus las dibuja el dueño del almacén)
+        if self.owns_bullets:
+            self.bullets.draw(screen, alpha)
         
         # Diálogo
         if self.dialogue_timer > 0 and self.current_dialogue:
-            font = pygame.font.Font(None, 24)
-            text = font.render(self.current_dialogue, True, WHITE)
-            text_rect = text.get_rect(center=(self.x, self.y - 80))
+            text = texts.render(self.current_dialogue, 24, WHITE)
+            text_rect = text.get_rect(center=(x, y - 80))
             
             bg_rect = text_rect.inflate(20, 10)
             pygame.draw.rect(screen, BLACK, bg_rect)
@@ -452,8 +526,9 @@ class Boss:
             
             screen.blit(text, text_rect)
         
-        # Barra HP
-        self.draw_hp_bar(screen)
+        # Barra HP (en el render sucio va en la capa del HUD)
+        if hp_bar:
+            self.draw_hp_bar(screen)
     
     def draw_hp_bar(self, screen):
         bar_width = 200 if not self.is_spirit else 150
@@ -472,14 +547,12 @@ class Boss:
         hp_color = GREEN if hp_percent > 0.66 else (YELLOW if hp_percent > 0.33 else RED)
         pygame.draw.rect(screen, hp_color, (bar_x, bar_y, hp_bar_width, bar_height))
         
-        font = pygame.font.Font(None, 16 if self.is_spirit else 18)
         phase_text = f"{'ESPÍRITU' if self.is_spirit else 'FASE ' + str(self.phase)} | {int(self.hp)}/{self.max_hp}"
-        text_surf = font.render(phase_text, True, WHITE)
+        text_surf = texts.render(phase_text, 16 if self.is_spirit else 18, WHITE)
         text_rect = text_surf.get_rect(center=(WIDTH // 2, bar_y + bar_height // 2))
         screen.blit(text_surf, text_rect)
         
         if not self.is_spirit:
-            name_font = pygame.font.Font(None, 24)
-            name_surf = name_font.render(self.name, True, BOSS_STATES[self.state]["color"])
+            name_surf = texts.render(self.name, 24, BOSS_STATES[self.state]["color"])
             name_rect = name_surf.get_rect(center=(WIDTH // 2, bar_y - 15))
             screen.blit(name_surf, name_rect)
\ No newline at end of file
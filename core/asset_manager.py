@@ -0,0 +1,151 @@
+# core/asset_manager.py - Carga única de imágenes y caché de variantes
+
+import os
+import threading
+import time
+import pygame
+from settings import SPRITE_CACHE_DIR
+from core.sprite_cache import SpriteDiskCache
+
+class AssetStats:
+    """Contadores de carga de un asset"""
+    def __init__(self):
+        self.decode_ns = 0      # Tiempo decodificando el archivo
+        self.decodes = 0
+        self.variant_ns = 0     # Tiempo escalando/rotando variantes
+        self.variants = 0
+        self.disk_ns = 0        # Tiempo leyendo la caché en disco
+        self.disk_hits = 0
+        self.hits = 0           # Pedidos servidos desde la caché
+
+class AssetManager:
+    """Decodifica cada imagen una sola vez y guarda sus variantes.
+
+    Las variantes se indexan por (ruta, tamaño, cubeta de ángulo, alpha),
+    así que una bala rotada 45° o un sprite semitransparente se generan una
+    vez y luego se reutilizan. Con `cache_dir`, los sprites escalados se
+    leen de la caché en disco y el PNG original solo se decodifica si falta.
+    
+    Se puede usar desde el hilo de precarga: los aciertos de caché no toman
+    el lock, y una variante que se está construyendo en otro hilo se espera
+    en vez de construirse dos veces.
+    """
+    def __init__(self, angle_buckets=360, cache_dir=None):
+        self.angle_buckets = angle_buckets
+        self.disk_cache = SpriteDiskCache(cache_dir) if cache_dir else None
+        self.originals = {}   # ruta -> Surface decodificada (o None si falló)
+        self.variants = {}    # (ruta, tamaño, cubeta, alpha) -> Surface
+        self.stats = {}       # ruta -> AssetStats
+        self.lock = threading.RLock()
+
+    def _stats_for(self, path):
+        if path not in self.stats:
+            self.stats[path] = AssetStats()
+        return self.stats[path]
+
+    def angle_bucket(self, angle_degrees):
+        """Cubeta discreta para un ángulo en grados"""
+        return round((angle_degrees % 360) * self.angle_buckets / 360) % self.angle_buckets
+
+    def load(self, path):
+        """Devuelve la imagen original, decodificándola solo la primera vez"""
+        if path in self.originals:
+            return self.originals[path]
+
+        stats = self._stats_for(path)
+        start = time.perf_counter_ns()
+        image = None
+        if os.path.exists(path):
+            try:
+                image = pygame.image.load(path)
+                if pygame.display.get_surface() is not None:
+                    image = image.convert_alpha()
+            except Exception as e:
+                print(f"Error cargando {path}: {e}")
+                image = None
+        stats.decode_ns += time.perf_counter_ns() - start
+        stats.decodes += 1
+        self.originals[path] = image
+        return image
+
+    def get(self, path, size=None, angle=0, alpha=None):
+        """Variante escalada a `size`, rotada `angle` grados y con `alpha`"""
+        bucket = self.angle_bucket(angle) if angle else 0
+        key = (path, size, bucket, alpha)
+        image = self.variants.get(key)
+        if image is not None:
+            self._stats_for(path).hits += 1
+            return image
+        with self.lock:
+            if key in self.variants:
+                self._stats_for(path).hits += 1
+                return self.variants[key]
+            return self._build(path, size, bucket, alpha, key)
+
+    def _build(self, path, size, bucket, alpha, key):
+        if bucket or alpha is not None:
+            # Se construye sobre la variante solo escalada para no acumular pérdidas
+            base = self.get(path, size)
+        elif size is not None:
+            image = self._load_cached(path, size)
+            if image is not None:
+                self.variants[key] = image
+                return image
+            base = self.load(path)
+        else:
+            return self.load(path)
+        if base is None:
+            return None
+
+        stats = self._stats_for(path)
+        start = time.perf_counter_ns()
+        if bucket:
+            image = pygame.transform.rotate(base, bucket * 360 / self.angle_buckets)
+        elif alpha is not None:
+            image = base.copy()
+        else:
+            image = pygame.transform.scale(base, size)
+        if alpha is not None:
+            image.set_alpha(alpha)
+        stats.variant_ns += time.perf_counter_ns() - start
+        stats.variants += 1
+
+        if self.disk_cache and not bucket and alpha is None:
+            self.disk_cache.store(path, size, image)
+        self.variants[key] = image
+        return image
+
+    def _load_cached(self, path, size):
+        """Sprite escalado desde la caché en disco, sin decodificar el PNG"""
+        if not self.disk_cache:
+            return None
+        stats = self._stats_for(path)
+        start = time.perf_counter_ns()
+        image = self.disk_cache.load(path, size)
+        stats.disk_ns += time.perf_counter_ns() - start
+        if image is not None:
+            stats.disk_hits += 1
+        return image
+
+    def report(self):
+        """Tabla de tiempos de carga por asset, del más costoso al más barato"""
+        lines = [f"{'asset':<50} {'decod.':>6} {'ms decod.':>10} {'variantes':>9} {'ms var.':>8} "
+                 f"{'disco':>6} {'ms disco':>9} {'aciertos':>9}"]
+        ordered = sorted(self.stats.items(), key=lambda item: item[1].decode_ns, reverse=True)
+        for path, stats in ordered:
+            lines.append(f"{path:<50} {stats.decodes:>6} {stats.decode_ns / 1e6:>10.2f} "
+                         f"{stats.variants:>9} {stats.variant_ns / 1e6:>8.2f} "
+                         f"{stats.disk_hits:>6} {stats.disk_ns / 1e6:>9.2f} {stats.hits:>9}")
+        return "\n".join(lines)
+
+    def summary(self):
+        decode_ms = sum(s.decode_ns for s in self.stats.values()) / 1e6
+        disk_ms = sum(s.disk_ns for s in self.stats.values()) / 1e6
+        disk_hits = sum(s.disk_hits for s in self.stats.values())
+        hits = sum(s.hits for s in self.stats.values())
+        return (f"Assets: {len(self.originals)} decodificados en {decode_ms:.1f} ms, "
+                f"{disk_hits} leídos de disco en {disk_ms:.1f} ms, "
+                f"{len(self.variants)} variantes, {hits} aciertos de caché")
+
+# Instancia compartida por todo el juego
+assets = AssetManager(cache_dir=SPRITE_CACHE_DIR)
@@ -0,0 +1,141 @@
+# core/collision.py - Broadphase de colisiones con spatial hash uniforme
+
+import math
+import numpy as np
+from settings import *
+
+class SpatialHash:
+    """Rejilla uniforme sobre la arena, reconstruida en bloque cada tick.
+
+    Cada entrada se guarda en la celda de su centro (las que quedan fuera
+    de la arena van a la celda del borde) y las consultas se amplían con
+    la mayor media-extensión, así no hace falta insertar en varias celdas.
+    """
+    def __init__(self, x, y, width, height, cell_size=40):
+        self.origin_x = x
+        self.origin_y = y
+        self.cell_size = cell_size
+        self.cols = math.ceil(width / cell_size)
+        self.rows = math.ceil(height / cell_size)
+        self.count = 0
+        self.xs = np.zeros(0)
+        self.ys = np.zeros(0)
+        self.half_w = np.zeros(0)
+        self.half_h = np.zeros(0)
+        self.max_half_w = 0.0
+        self.max_half_h = 0.0
+        self.order = np.zeros(0, dtype=np.intp)
+        self.cell_start = np.zeros(self.cols * self.rows + 1, dtype=np.intp)
+
+    def _cell_coords(self, xs, ys):
+        cols = np.clip(((xs - self.origin_x) // self.cell_size).astype(np.intp), 0, self.cols - 1)
+        rows = np.clip(((ys - self.origin_y) // self.cell_size).astype(np.intp), 0, self.rows - 1)
+        return cols, rows
+
+    def rebuild(self, xs, ys, half_w, half_h):
+        """Indexa las entradas dadas (arreglos del mismo largo)"""
+        self.count = len(xs)
+        self.xs = xs
+        self.ys = ys
+        self.half_w = half_w
+        self.half_h = half_h
+        if self.count == 0:
+            self.max_half_w = self.max_half_h = 0.0
+            self.order = np.zeros(0, dtype=np.intp)
+            self.cell_start[:] = 0
+            return
+
+        self.max_half_w = float(half_w.max())
+        self.max_half_h = float(half_h.max())
+        cols, rows = self._cell_coords(xs, ys)
+        cells = rows * self.cols + cols
+        self.order = np.argsort(cells, kind="stable")
+        self.cell_start = np.searchsorted(cells[self.order],
+                                          np.arange(self.cols * self.rows + 1))
+
+    def _cell_of(self, x, y):
+        """Celda (col, fila) de un punto suelto, con el mismo recorte que rebuild"""
+        col = min(max(int((x - self.origin_x) // self.cell_size), 0), self.cols - 1)
+        row = min(max(int((y - self.origin_y) // self.cell_size), 0), self.rows - 1)
+        return col, row
+
+    def _candidates(self, left, top, right, bottom):
+        if self.count == 0:
+            return self.order
+        c0, r0 = self._cell_of(left - self.max_half_w, top - self.max_half_h)
+        c1, r1 = self._cell_of(right + self.max_half_w, bottom + self.max_half_h)
+
+        # Las celdas de una fila son contiguas en `order`: un slice por fila
+        slices = []
+        for row in range(r0, r1 + 1):
+            first = self.cell_start[row * self.cols + c0]
+            last = self.cell_start[row * self.cols + c1 + 1]
+            if last > first:
+                slices.append(self.order[first:last])
+        if not slices:
+            return self.order[:0]
+        return slices[0] if len(slices) == 1 else np.concatenate(slices)
+
+    def query_rect(self, left, top, width, height):
+        """Índices de las entradas cuyo rectángulo toca el dado"""
+        right = left + width
+        bottom = top + height
+        candidates = self._candidates(left, top, right, bottom)
+        if len(candidates) == 0:
+            return candidates
+        xs = self.xs[candidates]
+        ys = self.ys[candidates]
+        hw = self.half_w[candidates]
+        hh = self.half_h[candidates]
+        hits = (xs - hw < right) & (xs + hw > left) & (ys - hh < bottom) & (ys + hh > top)
+        return candidates[hits]
+
+    def query_circle(self, cx, cy, radius):
+        """Índices de las entradas cuyo rectángulo toca el círculo"""
+        candidates = self._candidates(cx - radius, cy - radius, cx + radius, cy + radius)
+        if len(candidates) == 0:
+            return candidates
+        xs = self.xs[candidates]
+        ys = self.ys[candidates]
+        # Distancia del centro del círculo al punto más cercano de cada rectángulo
+        dx = np.maximum(np.abs(cx - xs) - self.half_w[candidates], 0)
+        dy = np.maximum(np.abs(cy - ys) - self.half_h[candidates], 0)
+        return candidates[dx * dx + dy * dy <= radius * radius]
+
+class CollisionWorld:
+    """Colisiones compartidas por el boss principal y sus espíritus"""
+    def __init__(self, cell_size=40):
+        self.enemy_bullets = SpatialHash(ARENA_X, ARENA_Y, ARENA_WIDTH, ARENA_HEIGHT, cell_size)
+        self.player_bullets = SpatialHash(ARENA_X, ARENA_Y, ARENA_WIDTH, ARENA_HEIGHT, cell_size)
+        self.player_bullet_list = []
+
+    def rebuild(self, bullet_store, player_bullets):
+        """Reindexa las balas enemigas (BulletStore) y las del jugador"""
+        n = bullet_store.count
+        self.enemy_bullets.rebuild(bullet_store.x[:n], bullet_store.y[:n],
+                                   bullet_store.half_w[:n], bullet_store.half_h[:n])
+
+        self.player_bullet_list = list(player_bullets)
+        count = len(self.player_bullet_list)
+        xs = np.fromiter((b.x for b in self.player_bullet_list), float, count)
+        ys = np.fromiter((b.y for b in self.player_bullet_list), float, count)
+        hw = np.fromiter((b.get_rect().width / 2 for b in self.player_bullet_list), float, count)
+        hh = np.fromiter((b.get_rect().height / 2 for b in self.player_bullet_list), float, count)
+        self.player_bullets.rebuild(xs, ys, hw, hh)
+
+    def enemy_bullets_in_rect(self, rect):
+        return self.enemy_bullets.query_rect(*rect)
+
+    def enemy_bullets_in_circle(self, cx, cy, radius):
+        return self.enemy_bullets.query_circle(cx, cy, radius)
+
+    def player_bullets_in_rect(self, rect):
+        """Balas del jugador activas que tocan `rect`"""
+        hits = self.player_bullets.query_rect(*rect)
+        bullets = [self.player_bullet_list[i] for i in hits]
+        return [bullet for bullet in bullets if bullet.active]
+
+    def player_bullets_in_circle(self, cx, cy, radius):
+        hits = self.player_bullets.query_circle(cx, cy, radius)
+        bullets = [self.player_bullet_list[i] for i in hits]
+        return [bullet for bullet in bullets if bullet.active]
@@ -0,0 +1,137 @@
+# core/dirty_rects.py - Render por rectángulos sucios sobre una grilla de tiles
+
+import numpy as np
+import pygame
+
+class DirtyRectRenderer:
+    """Redibuja y envía a pantalla solo las zonas que cambiaron.
+
+    La pantalla se divide en tiles de `tile` px. Cada frame los objetos
+    marcan los tiles que ocupan; se borran (con el fondo estático) y se
+    envían con `display.update` los tiles ocupados en este frame o en el
+    anterior, agrupados en tramos horizontales. Si la zona sucia pasa de
+    `threshold` (fracción de la pantalla) se hace un `flip` completo.
+    """
+    def __init__(self, screen, background, tile=40, threshold=0.5):
+        self.screen = screen
+        self.background = background
+        self.tile = tile
+        self.threshold = threshold
+        self.width, self.height = screen.get_size()
+        self.cols = -(-self.width // tile)
+        self.rows = -(-self.height // tile)
+        self.current = np.zeros((self.rows, self.cols), dtype=bool)
+        self.previous = np.ones((self.rows, self.cols), dtype=bool)
+        self.rects = []
+        self.full = True
+        self.partial_frames = 0
+        self.full_frames = 0
+        self.dirty_fraction = 1.0
+
+    def invalidate(self):
+        """El próximo frame se redibuja entero (tras un menú, diálogo, etc.)"""
+        self.previous[:] = True
+
+    def mark_rect(self, x, y, w, h):
+        if x + w < 0 or y + h < 0 or x >= self.width or y >= self.height:
+            return
+        t = self.tile
+        x0 = max(int(x) // t, 0)
+        y0 = max(int(y) // t, 0)
+        x1 = min(int(x + w) // t, self.cols - 1)
+        y1 = min(int(y + h) // t, self.rows - 1)
+        self.current[y0:y1 + 1, x0:x1 + 1] = True
+
+    def mark_circle(self, cx, cy, radius):
+        self.mark_rect(cx - radius, cy - radius, radius * 2, radius * 2)
+
+    def mark_rects(self, lefts, tops, rights, bottoms):
+        """Marca muchos rectángulos a la vez (arrays de NumPy)"""
+        visible = (rights >= 0) & (bottoms >= 0) & (lefts < self.width) & (tops < self.height)
+        if not visible.any():
+            return
+        t = self.tile
+        x0 = np.clip(lefts[visible] // t, 0, self.cols - 1).astype(np.intp)
+        y0 = np.clip(tops[visible] // t, 0, self.rows - 1).astype(np.intp)
+        x1 = np.clip(rights[visible] // t, 0, self.cols - 1).astype(np.intp)
+        y1 = np.clip(bottoms[visible] // t, 0, self.rows - 1).astype(np.intp)
+        # Los objetos suelen ocupar 1-2 tiles por lado: se recorren los desplazamientos
+        for dy in range(int((y1 - y0).max()) + 1):
+            ys = np.minimum(y0 + dy, y1)
+            for dx in range(int((x1 - x0).max()) + 1):
+                self.current[ys, np.minimum(x0 + dx, x1)] = True
+
+    def mark_segment(self, x0, y0, x1, y1, width):
+        """Marca los tiles que toca una línea gruesa (láseres)"""
+        length = max(abs(x1 - x0), abs(y1 - y0))
+        steps = max(int(length / (self.tile / 2)), 1)
+        t = np.linspace(0.0, 1.0, steps + 1)
+        xs = x0 + (x1 - x0) * t
+        ys = y0 + (y1 - y0) * t
+        pad = width / 2 + 2
+        self.mark_rects(xs - pad, ys - pad, xs + pad, ys + pad)
+
+    def mark_mask(self, mask):
+        self.current |= mask
+
+    def tile_mask(self, surface):
+        """Tiles con algún píxel visible de una capa con alpha"""
+        t = self.tile
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        if self.width % t or self.height % t:
+            padded = np.zeros((self.cols * t, self.rows * t), dtype=np.uint8)
+            padded[:self.width, :self.height] = alpha
+            alpha = padded
+        # max por ejes es bastante más rápido que any() sobre el bloque 4D
+        tiles = alpha.reshape(self.cols, t, self.rows, t).max(axis=3).max(axis=1)
+        del alpha  # libera el bloqueo de la superficie
+        return (tiles > 0).T
+
+    def _runs(self, dirty):
+        """Tramos horizontales de tiles sucios, como pygame.Rect"""
+        t = self.tile
+        padded = np.zeros((self.rows, self.cols + 2), dtype=np.int8)
+        padded[:, 1:-1] = dirty
+        edges = np.diff(padded, axis=1)
+        # Inicios y fines salen en el mismo orden (fila por fila, de izquierda a derecha)
+        rows, starts = np.nonzero(edges == 1)
+        ends = np.nonzero(edges == -1)[1]
+        bounds = pygame.Rect(0, 0, self.width, self.height)
+        return [pygame.Rect(start * t, row * t, (end - start) * t, t).clip(bounds)
+                for row, start, end in zip(rows.tolist(), starts.tolist(), ends.tolist())]
+
+    def erase(self):
+        """Borra con el fondo la zona sucia; luego se dibujan los objetos"""
+        dirty = self.current | self.previous
+        self.dirty_fraction = dirty.mean()
+        self.full = self.dirty_fraction > self.threshold
+        if self.full:
+            self.rects = []
+            self.screen.blit(self.background, (0, 0))
+        else:
+            self.rects = self._runs(dirty)
+            for rect in self.rects:
+                self.screen.blit(self.background, rect, rect)
+
+    def overlay(self, layer):
+        """Dibuja una capa fija (HUD) encima, solo en la zona sucia"""
+        if self.full:
+            self.screen.blit(layer, (0, 0))
+        else:
+            for rect in self.rects:
+                self.screen.blit(layer, rect, rect)
+
+    def present(self):
+        if self.full:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(self.rects)
+            self.partial_frames += 1
+        self.previous, self.current = self.current, self.previous
+        self.current[:] = False
+
+    def summary(self):
+        total = self.partial_frames + self.full_frames
+        return (f"Render sucio: {self.partial_frames}/{total} frames parciales, "
+                f"{self.full_frames} completos")
@@ -0,0 +1,52 @@
+# core/frame_scheduler.py - Ritmo de frames según la escena
+
+import pygame
+from core.profiler import profiler
+
+class FrameScheduler:
+    """Corre el combate a `fps` y deja dormir a las escenas quietas.
+
+    En una escena quieta (menús, diálogo congelado, game over) el loop se
+    bloquea en `pygame.event.wait` hasta que llega input o vence
+    `idle_timeout_ms`, y solo se redibuja si pasó algo. Las decisiones
+    quedan en el profiler: el tiempo dormido en el span "idle" y los
+    contadores "ritmo" y "omitidos".
+    """
+    def __init__(self, clock, fps, idle_timeout_ms=250):
+        self.clock = clock
+        self.fps = fps
+        self.idle_timeout_ms = idle_timeout_ms
+        self.idle = False
+        self.scene = None
+        self.redraw = True
+        self.skipped = 0
+
+    def next_frame(self, scene, static):
+        """Espera el próximo frame; devuelve (dt, eventos) y fija `redraw`"""
+        changed = scene != self.scene
+        self.scene = scene
+
+        with profiler.span("idle"):
+            if static and not changed:
+                event = pygame.event.wait(self.idle_timeout_ms)
+                events = [] if event.type == pygame.NOEVENT else [event]
+                events.extend(pygame.event.get())
+                self.clock.tick()
+                dt = 1 / self.fps
+                # Sin input no hay nada nuevo que dibujar; la espera vence igual
+                # para la lógica periódica de la escena (p. ej. la música)
+                self.redraw = bool(events)
+                self.idle = True
+            else:
+                raw_dt = self.clock.tick(self.fps) / 1000.0
+                # Al salir del reposo, el tiempo dormido no cuenta como frame de juego
+                dt = 1 / self.fps if self.idle else raw_dt
+                events = pygame.event.get()
+                self.redraw = True
+                self.idle = False
+
+        if not self.redraw:
+            self.skipped += 1
+        profiler.count("ritmo", "reposo" if self.idle else "completo")
+        profiler.count("omitidos", self.skipped)
+        return dt, events
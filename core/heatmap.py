@@ -0,0 +1,95 @@
+# core/heatmap.py - Mapa de ocupación de la arena con olvido exponencial
+#
+# Formato del archivo (little endian):
+#   "UTHM" | versión (u8) | columnas (u16) | filas (u16) | celdas f32 comprimidas con zlib
+
+import struct
+import zlib
+import numpy as np
+
+MAGIC = b"UTHM"
+VERSION = 1
+_PREFIX = struct.Struct("<4sBHH")
+_RESCALE_LIMIT = 1e12
+
+class OccupancyGrid:
+    """Cuánto tiempo reciente pasó el jugador en cada celda de la arena.
+
+    El olvido no recorre la grilla: en vez de multiplicar todas las celdas
+    por `decay` en cada tick, cada muestra nueva pesa 1/decay veces más que
+    la anterior, y cuando ese peso crece demasiado se reescala todo de una
+    vez. `add` es O(1); los valores reales son `cells / weight`.
+    """
+    def __init__(self, x, y, width, height, cols, rows, half_life, dt):
+        self.x = x
+        self.y = y
+        self.cols = cols
+        self.rows = rows
+        self.cell_w = width / cols
+        self.cell_h = height / rows
+        self.inv_w = cols / width
+        self.inv_h = rows / height
+        self.grow = 0.5 ** (-dt / half_life)
+        self.cells = np.zeros(cols * rows)
+        self._cells = memoryview(self.cells)
+        self.weight = 1.0
+        self.revision = 0  # cambia con cada muestra: para no guardar de más
+
+    def add(self, x, y):
+        """Suma una muestra (un tick) en la celda de (x, y)"""
+        cols = self.cols
+        col = int((x - self.x) * self.inv_w)
+        row = int((y - self.y) * self.inv_h)
+        if not (0 <= col < cols and 0 <= row < self.rows):
+            col = min(max(col, 0), cols - 1)
+            row = min(max(row, 0), self.rows - 1)
+        weight = self.weight * self.grow
+        self._cells[row * cols + col] += weight
+        self.weight = weight
+        self.revision += 1
+        if weight > _RESCALE_LIMIT:
+            self.cells /= weight
+            self.weight = 1.0
+
+    def values(self):
+        """Ocupación por celda en ticks (ponderados por el olvido), forma (filas, columnas)"""
+        return (self.cells / self.weight).reshape(self.rows, self.cols)
+
+    def hot_cells(self, k):
+        """Centros (x, y) de las `k` celdas más ocupadas, de la más a la menos"""
+        cells = self.cells
+        k = min(k, int(np.count_nonzero(cells)))
+        if k <= 0:
+            return []
+        top = np.argpartition(cells, -k)[-k:]
+        top = top[np.argsort(cells[top])[::-1]]
+        rows, cols = np.divmod(top, self.cols)
+        xs = self.x + (cols + 0.5) * self.cell_w
+        ys = self.y + (rows + 0.5) * self.cell_h
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def get_state(self):
+        return self.cells.copy(), self.weight, self.revision
+
+    def set_state(self, state):
+        cells, self.weight, self.revision = state
+        self.cells[:] = cells
+
+    def to_bytes(self):
+        cells = (self.cells / self.weight).astype("<f4")
+        return _PREFIX.pack(MAGIC, VERSION, self.cols, self.rows) + zlib.compress(cells.tobytes())
+
+    def load_bytes(self, blob):
+        """Carga una grilla guardada con `to_bytes`; devuelve False si no sirve"""
+        try:
+            magic, version, cols, rows = _PREFIX.unpack_from(blob)
+            if magic != MAGIC or version != VERSION or (cols, rows) != (self.cols, self.rows):
+                return False
+            cells = np.frombuffer(zlib.decompress(blob[_PREFIX.size:]), dtype="<f4")
+        except (struct.error, zlib.error):
+            return False
+        if len(cells) != len(self.cells):
+            return False
+        self.cells[:] = cells
+        self.weight = 1.0
+        return True
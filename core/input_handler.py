@@ -2,12 +2,27 @@
 
 import pygame
 
+class KeyState:
+    """Teclas presionadas con la misma interfaz que pygame.key.get_pressed()"""
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
 class InputHandler:
-    def __init__(self):
-        self.keys = pygame.key.get_pressed()
-        
+    """Lee el teclado, o una fuente de input conectable (bot, replay, aleatorio)"""
+    def __init__(self, source=None):
+        self.source = source
+        self.keys = self.read()
+
+    def read(self):
+        if self.source is not None:
+            return self.source.poll()
+        return pygame.key.get_pressed()
+
     def update(self):
-        self.keys = pygame.key.get_pressed()
-        
+        self.keys = self.read()
+
     def get_keys(self):
         return self.keys
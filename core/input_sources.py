@@ -0,0 +1,99 @@
+# core/input_sources.py - Fuentes de input sin teclado para simulaciones
+
+import math
+import random
+import numpy as np
+import pygame
+from settings import *
+from core.input_handler import KeyState
+
+# Teclas que lee Player.update
+GAME_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+             pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s,
+             pygame.K_z, pygame.K_SPACE, pygame.K_x)
+
+class RandomInput:
+    """Mantiene una combinación aleatoria de flechas durante unos ticks"""
+    def __init__(self, seed=None, hold_ticks=(5, 30), fire_chance=0.5):
+        self.rng = random.Random(seed)
+        self.hold_ticks = hold_ticks
+        self.fire_chance = fire_chance
+        self.current = KeyState()
+        self.remaining = 0
+
+    def poll(self):
+        if self.remaining <= 0:
+            pressed = set()
+            if self.rng.random() < 0.7:
+                pressed.add(self.rng.choice((pygame.K_LEFT, pygame.K_RIGHT)))
+            if self.rng.random() < 0.7:
+                pressed.add(self.rng.choice((pygame.K_UP, pygame.K_DOWN)))
+            if self.rng.random() < self.fire_chance:
+                pressed.add(pygame.K_z)
+            if self.rng.random() < 0.05:
+                pressed.add(pygame.K_x)
+            self.current = KeyState(pressed)
+            self.remaining = self.rng.randint(*self.hold_ticks)
+        self.remaining -= 1
+        return self.current
+
+class ScriptedBot:
+    """Jugador automático: se aleja de las balas cercanas y ataca cuando puede.
+
+    No busca jugar perfecto, sino producir combates creíbles y repetibles
+    para pruebas de carga y balance.
+    """
+    def __init__(self, game, danger_radius=90, dead_zone=0.15):
+        self.game = game
+        self.danger_radius = danger_radius
+        self.dead_zone = dead_zone
+
+    def poll(self):
+        player = self.game.player
+        boss = self.game.boss
+        if player is None or boss is None:
+            return KeyState()
+
+        px = player.x + player.size / 2
+        py = player.y + player.size / 2
+
+        # Repulsión de las balas dentro del radio de peligro
+        store = boss.bullets
+        n = store.count
+        dx = px - store.x[:n]
+        dy = py - store.y[:n]
+        dist_sq = dx * dx + dy * dy
+        near = dist_sq < self.danger_radius * self.danger_radius
+        force_x = 0.0
+        force_y = 0.0
+        if near.any():
+            weight = 1.0 / np.maximum(dist_sq[near], 1.0)
+            force_x = float((dx[near] * weight).sum()) * 40
+            force_y = float((dy[near] * weight).sum()) * 40
+
+        # Volver al centro de la arena y alinearse con el boss para disparar
+        center_x = ARENA_X + ARENA_WIDTH / 2
+        center_y = ARENA_Y + ARENA_HEIGHT * 0.6
+        target_x = boss.x if player.attack_mode else center_x
+        force_x += (target_x - px) / ARENA_WIDTH
+        force_y += (center_y - py) / ARENA_HEIGHT
+
+        pressed = set()
+        if force_x < -self.dead_zone:
+            pressed.add(pygame.K_LEFT)
+        elif force_x > self.dead_zone:
+            pressed.add(pygame.K_RIGHT)
+        if force_y < -self.dead_zone:
+            pressed.add(pygame.K_UP)
+        elif force_y > self.dead_zone:
+            pressed.add(pygame.K_DOWN)
+
+        # Cambiar de dirección también suma esquivos para el modo ataque
+        if not pressed:
+            pressed.add(pygame.K_LEFT if (self.game.game_time * 2) % 2 < 1 else pygame.K_RIGHT)
+
+        if player.attack_mode:
+            pressed.add(pygame.K_z)
+            if player.can_use_special and math.hypot(boss.x - px, boss.y - py) < 220:
+                pressed.add(pygame.K_x)
+        return KeyState(pressed)
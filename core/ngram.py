@@ -0,0 +1,132 @@
+# core/ngram.py - Modelo de n-gramas (orden 2 a 4) de las direcciones del jugador
+#
+# Las direcciones se discretizan en 9 símbolos (8 direcciones + quieto).
+# Con un alfabeto tan chico las tablas completas ya tienen tamaño fijo:
+# 9 + 81 + 729 contextos de 1 a 3 símbolos, 9 contadores u16 por contexto
+# (unos 15 KB en total), así que no hace falta count-min ni podar: cuando
+# un contador llega a `max_count` se divide la fila entera por 2, lo que
+# además hace pesar más lo reciente.
+#
+# Formato del archivo (little endian):
+#   "UTNG" | versión (u8) | largo máximo de contexto (u8) | tablas u16 comprimidas con zlib
+
+import struct
+import zlib
+import numpy as np
+
+SYMBOLS = 9
+STILL_SYMBOL = 4
+
+MAGIC = b"UTNG"
+VERSION = 1
+_PREFIX = struct.Struct("<4sBB")
+
+def direction_symbol(sx, sy):
+    """Símbolo de una dirección (-1, 0, 1 por eje)"""
+    return (sx + 1) * 3 + sy + 1
+
+def symbol_direction(symbol):
+    return symbol // 3 - 1, symbol % 3 - 1
+
+class NGramModel:
+    """Qué dirección sigue a las últimas 1..`max_context` direcciones.
+
+    `observe` actualiza una fila por largo de contexto y `predict` mira a lo
+    sumo `max_context` filas: ambos son O(1). Cada fila lleva su total y su
+    símbolo más frecuente, así la consulta no recorre los contadores.
+    """
+    def __init__(self, max_context=3, max_count=1024, min_count=4):
+        self.max_context = max_context
+        self.max_count = max_count
+        self.min_count = min_count
+        self.moduli = [SYMBOLS ** k for k in range(max_context + 1)]
+        self.counts = [np.zeros(self.moduli[k] * SYMBOLS, dtype=np.uint16) for k in range(1, max_context + 1)]
+        self.totals = [np.zeros(self.moduli[k], dtype=np.uint32) for k in range(1, max_context + 1)]
+        self.best = [np.zeros(self.moduli[k], dtype=np.uint8) for k in range(1, max_context + 1)]
+        # Vistas para leer y escribir elementos sueltos sin escalares de NumPy
+        self._counts = [memoryview(table) for table in self.counts]
+        self._totals = [memoryview(table) for table in self.totals]
+        self._best = [memoryview(table) for table in self.best]
+        self.revision = 0  # cambia con cada observación: para no guardar de más
+        self.reset_context()
+
+    def reset_context(self):
+        """Nuevo combate: lo aprendido queda, la secuencia reciente no"""
+        self.context = 0  # últimos símbolos en base 9, el más nuevo en la cifra más baja
+        self.length = 0
+
+    def observe(self, symbol):
+        context = self.context
+        for order in range(min(self.length, self.max_context)):
+            counts, totals, best = self._counts[order], self._totals[order], self._best[order]
+            row = context % self.moduli[order + 1]
+            value = counts[row * SYMBOLS + symbol] + 1
+            counts[row * SYMBOLS + symbol] = value
+            totals[row] += 1
+            if value > counts[row * SYMBOLS + best[row]]:
+                best[row] = symbol
+            if value >= self.max_count:
+                self._age(order, row)
+        self.context = (context * SYMBOLS + symbol) % self.moduli[-1]
+        self.length += 1
+        self.revision += 1
+
+    def _age(self, order, row):
+        start = row * SYMBOLS
+        counts = self.counts[order][start:start + SYMBOLS]
+        counts >>= 1
+        self.totals[order][row] = counts.sum()
+
+    def predict(self, current=None, min_probability=0.0):
+        """(símbolo, probabilidad) más probable a continuación, o None sin datos.
+
+        `current` agrega al contexto la dirección en curso, si todavía no se
+        observó. Usa el contexto más largo con al menos `min_count` casos
+        cuyo símbolo más frecuente llegue a `min_probability`.
+        """
+        context, length = self.context, self.length
+        if current is not None:
+            context = (context * SYMBOLS + current) % self.moduli[-1]
+            length += 1
+        for order in range(min(length, self.max_context) - 1, -1, -1):
+            row = context % self.moduli[order + 1]
+            total = self._totals[order][row]
+            if total >= self.min_count:
+                symbol = self._best[order][row]
+                probability = self._counts[order][row * SYMBOLS + symbol] / total
+                if probability >= min_probability:
+                    return symbol, probability
+        return None
+
+    def get_state(self):
+        return ([table.copy() for table in self.counts], [table.copy() for table in self.totals],
+                [table.copy() for table in self.best], self.context, self.length, self.revision)
+
+    def set_state(self, state):
+        counts, totals, best, self.context, self.length, self.revision = state
+        for own, saved in zip(self.counts + self.totals + self.best, counts + totals + best):
+            own[:] = saved
+
+    def to_bytes(self):
+        tables = b"".join(table.astype("<u2").tobytes() for table in self.counts)
+        return _PREFIX.pack(MAGIC, VERSION, self.max_context) + zlib.compress(tables)
+
+    def load_bytes(self, blob):
+        """Carga tablas guardadas con `to_bytes`; devuelve False si no sirven"""
+        try:
+            magic, version, max_context = _PREFIX.unpack_from(blob)
+            if magic != MAGIC or version != VERSION or max_context != self.max_context:
+                return False
+            tables = np.frombuffer(zlib.decompress(blob[_PREFIX.size:]), dtype="<u2")
+        except (struct.error, zlib.error):
+            return False
+        if len(tables) != sum(len(table) for table in self.counts):
+            return False
+        start = 0
+        for counts, totals, best in zip(self.counts, self.totals, self.best):
+            counts[:] = tables[start:start + len(counts)]
+            start += len(counts)
+            rows = counts.reshape(-1, SYMBOLS)
+            totals[:] = rows.sum(axis=1)
+            best[:] = rows.argmax(axis=1)
+        return True
@@ -0,0 +1,43 @@
+# core/overlay.py - Pantallas superpuestas compuestas una sola vez
+
+import pygame
+from settings import BLACK
+
+_veils = {}  # (tamaño, alpha) -> velo negro reutilizable
+
+def _veil(size, alpha):
+    key = (size, alpha)
+    veil = _veils.get(key)
+    if veil is None:
+        veil = _veils[key] = pygame.Surface(size)
+        veil.set_alpha(alpha)
+        veil.fill(BLACK)
+    return veil
+
+class CachedOverlay:
+    """Fondo congelado + velo semitransparente + textos fijos, en una capa.
+
+    `compose` se llama una vez al abrir la pantalla (diálogo, transición,
+    game over); luego cada frame solo se copia la capa y se dibujan encima
+    las partes que cambian, como la cuenta regresiva.
+    """
+    def __init__(self):
+        self.surface = None
+        self.key = None
+
+    def ready(self, key=None):
+        return self.surface is not None and self.key == key
+
+    def compose(self, background, alpha, key=None):
+        """Copia `background`, le aplica el velo y devuelve la capa para dibujar los textos"""
+        self.surface = background.copy()
+        self.surface.blit(_veil(background.get_size(), alpha), (0, 0))
+        self.key = key
+        return self.surface
+
+    def invalidate(self):
+        self.surface = None
+        self.key = None
+
+    def draw(self, screen):
+        screen.blit(self.surface, (0, 0))
@@ -0,0 +1,111 @@
+# core/persistence.py - Escritura diferida (write-behind) de archivos JSON y binarios
+
+import copy
+import json
+import os
+import threading
+import time
+
+class WriteBehindFile:
+    """Guarda un JSON desde un hilo aparte para que el frame nunca espere al disco.
+
+    `submit` solo copia los datos y marca el archivo como sucio; el hilo
+    espera `debounce` segundos para juntar cambios seguidos y luego escribe
+    a un temporal que reemplaza al original de forma atómica.
+    """
+    mode = 'w'
+
+    def __init__(self, path, debounce=1.0):
+        self.path = path
+        self.debounce = debounce
+        self.pending = None
+        self.dirty_since = None
+        self.writes = 0
+        self.writing = False
+        self.closed = False
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name=f"write-behind:{path}", daemon=True)
+        self.thread.start()
+
+    def submit(self, data):
+        """Programa la escritura de una copia de `data`"""
+        snapshot = copy.deepcopy(data)
+        with self.condition:
+            self.pending = snapshot
+            if self.dirty_since is None:
+                self.dirty_since = time.monotonic()
+            self.condition.notify()
+
+    def _take_pending(self):
+        """Saca lo pendiente para escribirlo (con `condition` tomada)"""
+        data = self.pending
+        self.pending = None
+        self.dirty_since = None
+        self.writing = True
+        return data
+
+    def _finish_write(self):
+        with self.condition:
+            self.writing = False
+            self.condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while (self.pending is None or self.writing) and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                # Debounce: esperar a que pase el intervalo desde el primer cambio
+                remaining = self.dirty_since + self.debounce - time.monotonic()
+                if remaining > 0:
+                    self.condition.wait(remaining)
+                    continue
+                data = self._take_pending()
+            try:
+                self._write(data)
+            finally:
+                self._finish_write()
+
+    def _write(self, data):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, self.mode) as f:
+                self._dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            self.writes += 1
+        except OSError as e:
+            print(f"No se pudo guardar {self.path}: {e}")
+
+    def _dump(self, data, f):
+        json.dump(data, f, separators=(",", ":"))
+
+    def flush(self):
+        """Escribe ya lo pendiente y espera a que el disco termine"""
+        with self.condition:
+            while self.writing:
+                self.condition.wait()
+            if self.pending is None:
+                return
+            data = self._take_pending()
+        try:
+            self._write(data)
+        finally:
+            self._finish_write()
+
+    def close(self):
+        self.flush()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+
+class WriteBehindBytes(WriteBehindFile):
+    """Lo mismo para un archivo binario: `submit` recibe los bytes ya armados"""
+    mode = 'wb'
+
+    def _dump(self, data, f):
+        f.write(data)
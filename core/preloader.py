@@ -0,0 +1,64 @@
+# core/preloader.py - Precarga en segundo plano de lo que el combate pedirá pronto
+
+import queue
+import threading
+import time
+from core.asset_manager import assets
+
+class AssetPreloader:
+    """Decodifica sprites y sonidos en un hilo antes de que se necesiten.
+
+    Cada pedido lleva una clave de texto ("fase 2", "espíritus") y se
+    atiende una sola vez. Las imágenes quedan en la caché del AssetManager
+    y los sonidos en el banco del SoundManager, así que quien las pida
+    después (el nuevo Boss, los espíritus) las recibe ya listas.
+    """
+    def __init__(self, sound_manager=None):
+        self.sound_manager = sound_manager
+        self.requests = queue.Queue()
+        self.requested = set()
+        self.ready = {}   # clave -> ms que tardó en el hilo
+        self.thread = None
+
+    def request(self, key, images=(), sounds=()):
+        """Encola la precarga de `images` [(ruta, tamaño, alpha)] y `sounds` [nombres]"""
+        if key in self.requested:
+            return
+        self.requested.add(key)
+        self.requests.put((key, list(images), list(sounds)))
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="preloader", daemon=True)
+            self.thread.start()
+
+    def is_ready(self, key):
+        return key in self.ready
+
+    def _run(self):
+        while True:
+            key, images, sounds = self.requests.get()
+            start = time.perf_counter()
+            try:
+                for path, size, alpha in images:
+                    assets.get(path, size, alpha=alpha)
+                if self.sound_manager is not None:
+                    for name in sounds:
+                        self.sound_manager.get(name)
+                self.ready[key] = (time.perf_counter() - start) * 1000
+            except Exception as e:
+                # Lo que falte se cargará al pedirlo; el hilo sigue atendiendo
+                print(f"Error precargando {key}: {e}")
+            finally:
+                self.requests.task_done()
+
+    def wait(self, timeout=None):
+        """Espera a que se atiendan todos los pedidos (benchmarks)"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while self.requests.unfinished_tasks:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def summary(self):
+        done = ", ".join(f"{key}: {ms:.1f} ms" for key, ms in self.ready.items())
+        return f"Precarga: {len(self.ready)}/{len(self.requested)} listas ({done or 'ninguna'})"
@@ -0,0 +1,142 @@
+# core/profiler.py - Tiempos por fase del frame, overlay de depuración y trazas
+
+import json
+import os
+import time
+import numpy as np
+import pygame
+
+class _Span:
+    """Bloque `with` que mide una fase y se la reporta al profiler"""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.start, time.perf_counter_ns())
+        return False
+
+class FrameProfiler:
+    """Mide cuánto tarda cada fase del frame con `perf_counter_ns`.
+
+    Los spans de una misma fase se suman dentro del frame; `end_frame`
+    guarda el total en un buffer circular de `window` frames, del que salen
+    los percentiles del overlay. Si `recording` está activo, cada span se
+    guarda además como evento para exportarlo en formato Chrome trace.
+    """
+    def __init__(self, window=240, max_events=500000):
+        self.window = window
+        self.max_events = max_events
+        self.spans = {}        # nombre -> _Span reutilizable
+        self.samples = {}      # nombre -> buffer circular de ms por frame
+        self.filled = {}       # nombre -> frames en que corrió la fase
+        self.frame_ns = {}     # nombre -> ns acumulados en el frame actual
+        self.frames = 0
+        self.counters = {}     # contadores en vivo (balas, láseres, ...)
+        self.recording = False
+        self.events = []       # (nombre, inicio_ns, duración_ns)
+        self.origin_ns = time.perf_counter_ns()
+        self.font = None
+        self.overlay_lines = []
+        self.overlay_frame = -1
+
+    def span(self, name):
+        span = self.spans.get(name)
+        if span is None:
+            span = self.spans[name] = _Span(self, name)
+            self.samples[name] = np.zeros(self.window, dtype=np.float32)
+            self.filled[name] = 0
+        return span
+
+    def add(self, name, start_ns, end_ns):
+        duration = end_ns - start_ns
+        self.frame_ns[name] = self.frame_ns.get(name, 0) + duration
+        if self.recording and len(self.events) < self.max_events:
+            self.events.append((name, start_ns, duration))
+
+    def count(self, name, value):
+        self.counters[name] = value
+
+    def end_frame(self):
+        """Pasa los totales del frame a los buffers circulares"""
+        # Cada fase escribe en su propio buffer: las que no corrieron no suman ceros
+        for name, total in self.frame_ns.items():
+            count = self.filled[name]
+            self.samples[name][count % self.window] = total / 1e6
+            self.filled[name] = count + 1
+        self.frame_ns.clear()
+        self.frames += 1
+
+    def percentiles(self, name):
+        """(p50, p95, p99) en ms de los últimos frames de una fase"""
+        filled = self.filled.get(name, 0)
+        if filled == 0:
+            return (0.0, 0.0, 0.0)
+        values = self.samples[name][:min(filled, self.window)]
+        return tuple(float(v) for v in np.percentile(values, (50, 95, 99)))
+
+    def start_recording(self):
+        self.events.clear()
+        self.recording = True
+
+    def export_trace(self, path):
+        """Escribe los spans grabados en formato Chrome trace-event (chrome://tracing)"""
+        events = [{"name": name, "ph": "X", "pid": 1, "tid": 1,
+                   "ts": (start - self.origin_ns) / 1000, "dur": duration / 1000}
+                  for name, start, duration in self.events]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, separators=(",", ":"))
+        print(f"Traza de {len(events)} spans guardada en {path}")
+        return len(events)
+
+    def stop_recording(self, path):
+        self.recording = False
+        count = self.export_trace(path)
+        self.events.clear()
+        return count
+
+    def report(self):
+        """Tabla de percentiles por fase, de la más costosa a la más barata"""
+        lines = [f"{'fase':<12} {'p50':>7} {'p95':>7} {'p99':>7}  (ms, últimos {self.window} frames)"]
+        rows = [(name, self.percentiles(name)) for name in self.samples]
+        for name, (p50, p95, p99) in sorted(rows, key=lambda row: row[1][2], reverse=True):
+            lines.append(f"{name:<12} {p50:>7.2f} {p95:>7.2f} {p99:>7.2f}")
+        return "\n".join(lines)
+
+    def draw(self, screen, refresh_frames=15):
+        """Overlay de depuración; el texto se recalcula cada `refresh_frames`.
+
+        Devuelve el rectángulo que ocupa, para el render sucio.
+        """
+        if self.font is None:
+            self.font = pygame.font.SysFont("monospace", 14)
+        if self.frames - self.overlay_frame >= refresh_frames or not self.overlay_lines:
+            self.overlay_frame = self.frames
+            lines = [f"{'fase':<10}{'p50':>7}{'p95':>7}{'p99':>7}"]
+            for name in self.samples:
+                p50, p95, p99 = self.percentiles(name)
+                lines.append(f"{name:<10}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}")
+            lines.append("  ".join(f"{name}: {value}" for name, value in self.counters.items()))
+            if self.recording:
+                lines.append(f"GRABANDO TRAZA ({len(self.events)} spans)")
+            self.overlay_lines = [self.font.render(line, True, (0, 255, 0)) for line in lines]
+
+        height = 16 * len(self.overlay_lines) + 8
+        width = max(surface.get_width() for surface in self.overlay_lines) + 12
+        background = pygame.Surface((width, height))
+        background.set_alpha(170)
+        screen.blit(background, (8, 110))
+        for i, surface in enumerate(self.overlay_lines):
+            screen.blit(surface, (14, 114 + 16 * i))
+        return pygame.Rect(8, 110, width, height)
+
+# Instancia compartida por todo el juego
+profiler = FrameProfiler()
@@ -0,0 +1,124 @@
+# core/replay.py - Grabación compacta del input por tick y reproducción
+#
+# Formato (little endian):
+#   "UTRP" | versión (u8) | largo de la cabecera (u32) | cabecera JSON (utf-8)
+#   tramos RLE: máscara de teclas (u16) | ticks seguidos con esa máscara (u16)
+#
+# La cabecera guarda la semilla, el modo, la copia de GAME_MODE_MODIFIERS
+# usada, los ticks por segundo y lo aprendido por la IA al empezar (datos
+# y tablas de n-gramas en base64), que también decide hacia dónde apunta
+# el boss.
+
+import copy
+import json
+import os
+import struct
+import pygame
+from core.input_handler import KeyState
+from core.input_sources import GAME_KEYS
+
+MAGIC = b"UTRP"
+VERSION = 1
+_PREFIX = struct.Struct("<4sBI")
+_RUN = struct.Struct("<HH")
+_MAX_RUN = 0xFFFF
+
+_states = {}  # máscara -> KeyState, compartidos entre reproducciones
+
+def keys_to_mask(keys):
+    mask = 0
+    for bit, key in enumerate(GAME_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+def mask_to_keys(mask):
+    state = _states.get(mask)
+    if state is None:
+        state = _states[mask] = KeyState(key for bit, key in enumerate(GAME_KEYS) if mask >> bit & 1)
+    return state
+
+class ReplayRecorder:
+    """Fuente de input que graba la máscara de teclas de cada tick.
+
+    Envuelve otra fuente (bot, aleatorio) o, sin ella, lee el teclado.
+    """
+    def __init__(self, header, source=None):
+        self.header = header
+        self.source = source
+        self.runs = []  # [máscara, ticks]
+
+    @property
+    def ticks(self):
+        return sum(count for _, count in self.runs)
+
+    def poll(self):
+        keys = self.source.poll() if self.source is not None else pygame.key.get_pressed()
+        mask = keys_to_mask(keys)
+        last = self.runs[-1] if self.runs else None
+        if last is not None and last[0] == mask and last[1] < _MAX_RUN:
+            last[1] += 1
+        else:
+            self.runs.append([mask, 1])
+        return keys
+
+    def save(self, path):
+        """Escribe la grabación y devuelve su tamaño en bytes"""
+        header = dict(self.header, ticks=self.ticks)
+        data = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(_PREFIX.pack(MAGIC, VERSION, len(data)))
+            f.write(data)
+            f.write(b"".join(_RUN.pack(mask, count) for mask, count in self.runs))
+        return os.path.getsize(path)
+
+class ReplayLog:
+    """Grabación cargada: cabecera + tramos RLE"""
+    def __init__(self, header, runs):
+        self.header = header
+        self.runs = runs
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            blob = f.read()
+        magic, version, header_len = _PREFIX.unpack_from(blob)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} no es una repetición válida (versión {version})")
+        start = _PREFIX.size
+        header = json.loads(blob[start:start + header_len].decode("utf-8"))
+        runs = list(_RUN.iter_unpack(blob[start + header_len:]))
+        return cls(header, runs)
+
+    @property
+    def ticks(self):
+        return self.header.get("ticks", sum(count for _, count in self.runs))
+
+    def ai_snapshot(self):
+        return copy.deepcopy(self.header.get("ai"))
+
+    def source(self):
+        return ReplayPlayback(self.runs)
+
+class ReplayPlayback:
+    """Entrega los tramos tick a tick a través de InputHandler"""
+    def __init__(self, runs):
+        self.runs = runs
+        self.index = 0
+        self.remaining = runs[0][1] if runs else 0
+
+    @property
+    def finished(self):
+        return self.index >= len(self.runs)
+
+    def poll(self):
+        if self.finished:
+            return KeyState()
+        keys = mask_to_keys(self.runs[self.index][0])
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.index += 1
+            if self.index < len(self.runs):
+                self.remaining = self.runs[self.index][1]
+        return keys
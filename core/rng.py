@@ -0,0 +1,29 @@
+# core/rng.py - Azar reproducible: un flujo por subsistema a partir de una semilla
+
+import random
+
+class FightRNG:
+    """Flujos `random.Random` independientes derivados de la semilla del combate.
+
+    Cada subsistema saca números de su propio flujo, así agregar una
+    tirada en uno (p. ej. un diálogo más) no corre la secuencia de los
+    demás. La misma semilla con el mismo input repite el combate tick a tick.
+    """
+    STREAMS = ("patrones", "ataques", "laser", "efectos", "dialogos")
+
+    def __init__(self, seed=None):
+        self.seed = seed if seed is not None else new_seed()
+        for name in self.STREAMS:
+            # Semilla en texto: se deriva con SHA-512, estable entre ejecuciones
+            setattr(self, name, random.Random(f"{self.seed}:{name}"))
+
+    def get_state(self):
+        return {name: getattr(self, name).getstate() for name in self.STREAMS}
+
+    def set_state(self, state):
+        for name, stream_state in state.items():
+            getattr(self, name).setstate(stream_state)
+
+def new_seed():
+    """Semilla nueva para un combate sin semilla fija"""
+    return random.SystemRandom().randrange(2 ** 32)
@@ -0,0 +1,45 @@
+# core/snapshot.py - Capturas del estado del combate (checkpoints y rebobinado)
+#
+# Cada clase del combate sabe copiar su propio estado (`snapshot`) y
+# volver a él (`restore`). Las capturas guardan referencias a los mismos
+# objetos, junto con una copia de sus atributos: restaurar los deja como
+# estaban sin volver a construirlos (sprites, sonidos y atlas no se tocan).
+
+from collections import deque
+
+def save_objects(items):
+    """Copia el estado de cada objeto de una lista (balas del jugador, láseres, avisos)"""
+    return [(item, item.__dict__.copy()) for item in items]
+
+def load_objects(saved):
+    """Devuelve la lista guardada con cada objeto restaurado"""
+    items = []
+    for item, state in saved:
+        item.__dict__.update(state)
+        items.append(item)
+    return items
+
+class SnapshotRing:
+    """Las últimas `size` capturas, una cada `interval` segundos simulados"""
+    def __init__(self, size, interval):
+        self.snapshots = deque(maxlen=size)
+        self.interval = interval
+        self.timer = 0.0
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def tick(self, dt, capture):
+        self.timer += dt
+        if self.timer >= self.interval:
+            self.timer -= self.interval
+            self.snapshots.append(capture())
+
+    def pop(self):
+        """La captura más reciente (cada llamada retrocede un intervalo más)"""
+        self.timer = 0.0
+        return self.snapshots.pop() if self.snapshots else None
+
+    def clear(self):
+        self.snapshots.clear()
+        self.timer = 0.0
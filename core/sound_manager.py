@@ -1,18 +1,138 @@
 # core/sound_manager.py
 
+import os
+import threading
+import time
 import pygame
+from settings import SOUND_DIR, MUSIC_TRACK, SOUND_BANK, SOUND_DEFAULTS, SOUND_CHANNELS
 
 class SoundManager:
-    def __init__(self):
-        pygame.mixer.init()
+    """Banco de sonidos: decodifica cada efecto una vez y reparte los canales.
+
+    Los archivos de SOUND_DIR (menos la música) se decodifican en un hilo en
+    segundo plano; si se pide uno que aún no está listo se decodifica en el
+    momento. Cada sonido tiene un máximo de voces simultáneas y una
+    prioridad: cuando no quedan canales libres se le roba el canal al sonido
+    de menor prioridad (o al más antiguo del mismo sonido).
+    """
+    def __init__(self, sound_dir=SOUND_DIR, preload=True):
+        self.enabled = True
         self.sounds = {}
-        
+        self.paths = {}
+        self.channels = []
+        self.voices = {}           # nombre -> [índices de canal que lo reproducen]
+        self.channel_owner = {}    # índice de canal -> (prioridad, inicio, nombre)
+        self.lock = threading.Lock()
+        self.loader = None
+
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            pygame.mixer.set_num_channels(SOUND_CHANNELS)
+            self.channels = [pygame.mixer.Channel(i) for i in range(SOUND_CHANNELS)]
+            self.available = True
+        except pygame.error as e:
+            print(f"Audio no disponible: {e}")
+            self.available = False
+            return
+
+        if os.path.isdir(sound_dir):
+            for filename in sorted(os.listdir(sound_dir)):
+                path = os.path.join(sound_dir, filename)
+                name, ext = os.path.splitext(filename)
+                if ext.lower() in (".mp3", ".ogg", ".wav") and path != MUSIC_TRACK:
+                    self.paths[name] = path
+
+        if preload:
+            self.loader = threading.Thread(target=self._preload, name="sound-bank", daemon=True)
+            self.loader.start()
+
+    def _preload(self):
+        for name in list(self.paths):
+            self.get(name)
+
     def load_sound(self, name, path):
+        self.paths[name] = path
+        return self.get(name)
+
+    def get(self, name):
+        """Sonido decodificado (una sola vez) o None si no existe"""
+        sound = self.sounds.get(name)
+        if sound is not None or not self.available or name not in self.paths:
+            return sound
         try:
-            self.sounds[name] = pygame.mixer.Sound(path)
-        except:
-            print(f"No se pudo cargar: {path}")
-    
+            sound = pygame.mixer.Sound(self.paths[name])
+        except Exception:
+            print(f"No se pudo cargar: {self.paths[name]}")
+            self.paths.pop(name, None)
+            return None
+        with self.lock:
+            return self.sounds.setdefault(name, sound)
+
+    def wait_until_loaded(self, timeout=None):
+        if self.loader:
+            self.loader.join(timeout)
+
+    def _config(self, name):
+        config = dict(SOUND_DEFAULTS)
+        config.update(SOUND_BANK.get(name, {}))
+        return config
+
+    def _forget(self, index):
+        owner = self.channel_owner.pop(index, None)
+        if owner:
+            voices = self.voices.get(owner[2], [])
+            if index in voices:
+                voices.remove(index)
+
+    def _free_channel(self):
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                self._forget(index)
+                return index
+        return None
+
+    def _steal_channel(self, priority):
+        """Canal del sonido de menor prioridad (y más antiguo) que no supere `priority`"""
+        victim = None
+        victim_key = None
+        for index, (owner_priority, started, _) in self.channel_owner.items():
+            key = (owner_priority, started)
+            if owner_priority <= priority and (victim_key is None or key < victim_key):
+                victim = index
+                victim_key = key
+        return victim
+
     def play(self, name):
-        if name in self.sounds:
-            self.sounds[name].play()
+        """Reproduce un sonido respetando su límite de voces y prioridad"""
+        if not self.enabled or not self.available:
+            return None
+        sound = self.get(name)
+        if sound is None:
+            return None
+
+        config = self._config(name)
+        voices = self.voices.setdefault(name, [])
+        for index in voices[:]:
+            channel = self.channels[index]
+            if not channel.get_busy() or channel.get_sound() is not sound:
+                self._forget(index)
+
+        if len(voices) >= config["max_voices"]:
+            # Se reemplaza la voz más antigua del mismo sonido
+            index = voices[0]
+        else:
+            index = self._free_channel()
+            if index is None:
+                index = self._steal_channel(config["priority"])
+            if index is None:
+                return None
+
+        channel = self.channels[index]
+        channel.stop()
+        self._forget(index)
+        channel.set_volume(config["volume"])
+        channel.play(sound)
+        self.voices[name].append(index)
+        self.channel_owner[index] = (config["priority"], time.perf_counter(), name)
+        return channel
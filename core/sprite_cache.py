@@ -0,0 +1,147 @@
+# core/sprite_cache.py - Caché en disco de sprites ya escalados
+
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import pygame
+
+class SpriteDiskCache:
+    """Guarda cada sprite escalado como RGBA crudo para cargarlo sin descomprimir.
+
+    Se construye sola la primera vez que el juego pide cada tamaño. Cada
+    archivo de origen se valida una vez por ejecución: si cambia su mtime
+    se compara el SHA-1 y, si el contenido cambió, se descartan sus entradas.
+    """
+    INDEX_VERSION = 1
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.index = {"version": self.INDEX_VERSION, "sources": {}}
+        self.validated = set()
+        self.mapped = []  # mmaps que siguen en uso (superficies sin convertir)
+        self.load_index()
+
+    def load_index(self):
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == self.INDEX_VERSION:
+                    self.index = data
+            except:
+                pass
+
+    def _write_atomic(self, path, data):
+        """Escribe `data` (bytes) en `path` a través de un temporal propio de este proceso.
+
+        Varios procesos (el barrido de balance) pueden llenar la misma caché a
+        la vez: cada uno escribe su temporal y el último `os.replace` gana.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def save_index(self):
+        try:
+            self._write_atomic(self.index_path, json.dumps(self.index, separators=(",", ":")).encode())
+        except OSError as e:
+            print(f"No se pudo escribir el índice de la caché de sprites: {e}")
+
+    @staticmethod
+    def file_hash(path):
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _entry_for(self, path):
+        """Entrada del índice para `path`, validada contra el archivo de origen"""
+        sources = self.index["sources"]
+        if path in self.validated:
+            return sources.get(path)
+        self.validated.add(path)
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._drop(path)
+            return None
+
+        entry = sources.get(path)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["bytes"] == st.st_size:
+            return entry
+
+        digest = self.file_hash(path)
+        if entry and entry["sha1"] == digest:
+            entry["mtime_ns"] = st.st_mtime_ns
+        else:
+            self._drop(path)
+            entry = {"sha1": digest, "mtime_ns": st.st_mtime_ns, "sprites": {}}
+            sources[path] = entry
+        entry["bytes"] = st.st_size
+        self.save_index()
+        return entry
+
+    def _drop(self, path):
+        entry = self.index["sources"].pop(path, None)
+        if entry:
+            for filename in entry["sprites"].values():
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                except OSError:
+                    pass
+
+    def load(self, path, size):
+        """Sprite de `path` escalado a `size`, o None si no está en caché"""
+        entry = self._entry_for(path)
+        if not entry:
+            return None
+        filename = entry["sprites"].get(f"{size[0]}x{size[1]}")
+        if not filename:
+            return None
+
+        try:
+            with open(os.path.join(self.cache_dir, filename), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(mapped) != size[0] * size[1] * 4:
+            mapped.close()
+            return None
+
+        surface = pygame.image.frombuffer(mapped, size, "RGBA")
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+            mapped.close()
+        else:
+            # Sin ventana la superficie sigue apuntando al mmap
+            self.mapped.append(mapped)
+        return surface
+
+    def store(self, path, size, surface):
+        """Escribe el sprite escalado en la caché"""
+        entry = self._entry_for(path)
+        if not entry:
+            return
+        key = f"{size[0]}x{size[1]}"
+        filename = f"{entry['sha1'][:16]}_{key}.rgba"
+        try:
+            self._write_atomic(os.path.join(self.cache_dir, filename), pygame.image.tobytes(surface, "RGBA"))
+        except OSError as e:
+            print(f"No se pudo escribir la caché de sprites: {e}")
+            return
+        entry["sprites"][key] = filename
+        self.save_index()
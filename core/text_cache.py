@@ -0,0 +1,62 @@
+# core/text_cache.py - Fuentes compartidas y caché LRU de textos renderizados
+
+from collections import OrderedDict
+import pygame
+
+class FontRegistry:
+    """Crea cada fuente (archivo, tamaño) una sola vez"""
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, size, name=None):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(name, size)
+        return font
+
+class TextCache:
+    """Superficies de texto indexadas por (fuente, tamaño, texto, color, antialias).
+
+    Un texto solo se vuelve a renderizar cuando cambia lo que muestra (por
+    ejemplo el HP o los segundos); el resto de frames es una búsqueda en el
+    diccionario. Al pasar de `max_entries` se descarta el menos usado.
+    """
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.fonts = FontRegistry()
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def font(self, size, name=None):
+        return self.fonts.get(size, name)
+
+    def render(self, text, size, color, antialias=True, font_name=None):
+        key = (font_name, size, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.fonts.get(size, font_name).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return (f"Textos: {self.misses} renderizados, {self.hits} aciertos de caché ({rate:.1f}%), "
+                f"{self.evictions} descartados, {len(self.fonts.fonts)} fuentes")
+
+# Instancia compartida por todo el juego
+texts = TextCache()
@@ -2,6 +2,8 @@
 
 import pygame
 from settings import *
+from core.text_cache import texts
+from core.overlay import CachedOverlay
 
 class DialogueBox:
     """Sistema de diálogos con pausa del juego"""
@@ -11,10 +13,13 @@ class DialogueBox:
         self.shipibo_text = ""
         self.spanish_text = ""
         self.speaker_name = ""
-        self.font_large = pygame.font.Font(None, 32)
-        self.font_medium = pygame.font.Font(None, 28)
-        self.font_small = pygame.font.Font(None, 24)
         self.waiting_for_input = False
+        self.layer = CachedOverlay()
+    
+    @property
+    def frozen(self):
+        """True si la escena de fondo ya está congelada en la capa del diálogo"""
+        return self.active and self.layer.ready()
         
     def show(self, shipibo, spanish, speaker):
         """Muestra un diálogo y pausa el juego"""
@@ -23,6 +28,7 @@ class DialogueBox:
         self.spanish_text = spanish
         self.speaker_name = speaker
         self.waiting_for_input = True
+        self.layer.invalidate()
         
     def update(self, events):
         """Actualiza el diálogo y detecta input para continuar"""
@@ -43,46 +49,48 @@ class DialogueBox:
         if not self.active:
             return
         
-        # Overlay semi-transparente
-        overlay = pygame.Surface((WIDTH, HEIGHT))
-        overlay.set_alpha(150)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
-        
+        # La primera vez se congela la escena de fondo con el velo y los textos;
+        # los frames siguientes solo copian esa capa
+        if not self.layer.ready():
+            self.compose(self.layer.compose(self.screen, 150))
+        self.layer.draw(self.screen)
+    
+    def compose(self, screen):
+        """Cajas y textos fijos del diálogo, sobre la capa congelada"""
         # Caja principal para Shipibo-Conibo
         main_box_height = 120
         main_box_y = HEIGHT // 2 - 100
-        pygame.draw.rect(self.screen, BLACK, (50, main_box_y, WIDTH - 100, main_box_height))
-        pygame.draw.rect(self.screen, WHITE, (50, main_box_y, WIDTH - 100, main_box_height), 3)
+        pygame.draw.rect(screen, BLACK, (50, main_box_y, WIDTH - 100, main_box_height))
+        pygame.draw.rect(screen, WHITE, (50, main_box_y, WIDTH - 100, main_box_height), 3)
         
         # Nombre del hablante
-        name_surf = self.font_medium.render(self.speaker_name, True, GOLD)
-        self.screen.blit(name_surf, (70, main_box_y + 10))
+        name_surf = texts.render(self.speaker_name, 28, GOLD)
+        screen.blit(name_surf, (70, main_box_y + 10))
         
         # Texto en Shipibo-Conibo (burbuja principal)
-        shipibo_surf = self.font_large.render(self.shipibo_text, True, WHITE)
+        shipibo_surf = texts.render(self.shipibo_text, 32, WHITE)
         shipibo_rect = shipibo_surf.get_rect(center=(WIDTH // 2, main_box_y + 70))
-        self.screen.blit(shipibo_surf, shipibo_rect)
+        screen.blit(shipibo_surf, shipibo_rect)
         
         # Caja secundaria para traducción en español
         spanish_box_y = main_box_y + main_box_height + 20
         spanish_box_height = 80
-        pygame.draw.rect(self.screen, (30, 30, 30), (50, spanish_box_y, WIDTH - 100, spanish_box_height))
-        pygame.draw.rect(self.screen, CYAN, (50, spanish_box_y, WIDTH - 100, spanish_box_height), 2)
+        pygame.draw.rect(screen, (30, 30, 30), (50, spanish_box_y, WIDTH - 100, spanish_box_height))
+        pygame.draw.rect(screen, CYAN, (50, spanish_box_y, WIDTH - 100, spanish_box_height), 2)
         
         # Etiqueta "Español:"
-        label_surf = self.font_small.render("Español:", True, CYAN)
-        self.screen.blit(label_surf, (70, spanish_box_y + 10))
+        label_surf = texts.render("Español:", 24, CYAN)
+        screen.blit(label_surf, (70, spanish_box_y + 10))
         
         # Texto en español
-        spanish_surf = self.font_medium.render(self.spanish_text, True, WHITE)
+        spanish_surf = texts.render(self.spanish_text, 28, WHITE)
         spanish_rect = spanish_surf.get_rect(center=(WIDTH // 2, spanish_box_y + 50))
-        self.screen.blit(spanish_surf, spanish_rect)
+        screen.blit(spanish_surf, spanish_rect)
         
         # Indicador para continuar
-        continue_surf = self.font_small.render("Presiona ESPACIO para continuar", True, YELLOW)
+        continue_surf = texts.render("Presiona ESPACIO para continuar", 24, YELLOW)
         continue_rect = continue_surf.get_rect(center=(WIDTH // 2, HEIGHT - 40))
-        self.screen.blit(continue_surf, continue_rect)
+        screen.blit(continue_surf, continue_rect)
 
 # Diálogos predefinidos en Shipibo-Conibo
 DIALOGUES = {
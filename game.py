@@ -1,23 +1,64 @@
 # game.py - Loop principal con diálogos en Shipibo-Conibo
 
+import base64
+import copy
+import os
+import numpy as np
 import pygame
 import sys
+import time
 from settings import *
 from player import Player
 from boss import Boss
+from attack_patterns import BulletStore
 from ai_brain import AIBrain
 from core.input_handler import InputHandler
 from core.sound_manager import SoundManager
+from core.asset_manager import assets
+from core.profiler import profiler
+from core.text_cache import texts
+from core.dirty_rects import DirtyRectRenderer
+from core.overlay import CachedOverlay
+from core.frame_scheduler import FrameScheduler
+from core.rng import FightRNG
+from core.replay import ReplayLog, ReplayRecorder
+from core.snapshot import SnapshotRing
+from core.collision import CollisionWorld
+from core.preloader import AssetPreloader
 from menu import MainMenu, SettingsMenu, IntroScreen
 from dialogue_system import DialogueBox, get_dialogue
 
 
+# Atributos del Game que forman parte de una captura del combate
+SNAPSHOT_FIELDS = ("game_time", "current_phase", "ai_analysis_timer", "game_over", "victory",
+                   "phase_transition", "transition_timer")
+
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, behavior_file=BEHAVIOR_FILE, tick_rate=SIM_TICK_RATE, seed=None):
+        self.boot_start = time.perf_counter()
+        self.first_menu_frame_ms = None
+        self.first_game_frame_ms = None
+        self.restarted = False
+        self.headless = headless
+        self.behavior_file = behavior_file
+        # Semilla fija para todos los combates (--seed); sin ella cada combate sortea la suya
+        self.fixed_seed = seed
+        self.rng = None
+        # Simulación a paso fijo: el tiempo real se acumula y se consume en ticks.
+        # Una repetición usa el ritmo con que se grabó solo durante su combate.
+        self.tick_rate = tick_rate
+        self.tick_dt = 1 / tick_rate
+        self.accumulator = 0.0
+        self.render_alpha = 1.0
+        if headless:
+            # Sin ventana ni audio reales: la simulación corre tan rápido como pueda
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
         pygame.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("BOSS FIGHT - Leyendas de la Selva")
         self.clock = pygame.time.Clock()
+        self.scheduler = FrameScheduler(self.clock, FPS, IDLE_FRAME_TIMEOUT_MS)
         
         self.current_state = "INTRO"
         self.running = True
@@ -28,45 +69,124 @@ class Game:
         self.settings_menu = SettingsMenu(self.screen, self.config)
         self.dialogue_box = DialogueBox(self.screen)
         
+        # Render por rectángulos sucios (opcional, F5): fondo estático + capa del HUD
+        background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill(BLACK)
+        pygame.draw.rect(background, WHITE, (ARENA_X, ARENA_Y, ARENA_WIDTH, ARENA_HEIGHT), 3)
+        self.renderer = DirtyRectRenderer(self.screen, background)
+        self.hud_layer = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        self.hud_key = None
+        self.hud_mask = self.renderer.tile_mask(self.hud_layer)
+        self.dirty_frame = False
+        self.profiler_rect = None
+        
+        # Pantallas de transición y game over: se componen una vez y se reutilizan
+        self.transition_layer = CachedOverlay()
+        self.game_over_layer = CachedOverlay()
+        
         self.player = None
         self.boss = None
+        # Pools del combate: se vacían entre fases y combates, no se vuelven a crear
+        self.bullet_store = BulletStore()
+        self.collisions = CollisionWorld()
         self.input_handler = None
-        self.sound_manager = None
+        self.recorder = None       # grabación del combate en curso
+        self.record_path = None
+        self.replay_source = None  # repetición que se está reproduciendo
         self.ai_brain = None
+        self.start_error = None    # excepción del último start_game fallido
+        # Capturas del combate: una al empezar cada fase, y las recientes para F6
+        self.checkpoints = {}
+        self.rewind = SnapshotRing(REWIND_SNAPSHOTS, REWIND_INTERVAL)
+        self.game_over = False
+        self.victory = False
+        self.phase_transition = False
+        
+        # Banco de sonidos: se decodifica una vez en segundo plano (sin audio no se carga)
+        self.sound_manager = SoundManager(preload=not headless)
+        # Sprites y sonidos de la próxima fase, decodificados antes de que se pidan
+        self.preloader = AssetPreloader(None if headless else self.sound_manager)
         
         # Música
+        if headless:
+            return
         try:
-            pygame.mixer.music.load("assets/sounds/soundtrack_undertale.mp3")
+            pygame.mixer.music.load(MUSIC_TRACK)
             pygame.mixer.music.set_volume(0.1)
             if self.config["music_enabled"]:
                 pygame.mixer.music.play(-1)
         except:
             print("No se pudo cargar la música de fondo")
 
-    def start_game(self, game_mode):
+    def start_game(self, game_mode, input_source=None, modifiers=None, seed=None, record=None,
+                   restart=False, tick_rate=None):
+        """Empieza un combate; `record` puede ser True/False o la ruta de la grabación.
+
+        Con `restart` (R tras perder) se conserva la IA en memoria y se salta
+        el diálogo de presentación, que ya se vio. `tick_rate` cambia el ritmo
+        de la simulación solo para este combate (repeticiones).
+        """
+        self.start_error = None
         try:
+            self.finish_recording()
+            self.tick_dt = 1 / (tick_rate or self.tick_rate)
+            self.fight_load_start = time.perf_counter()
+            self.first_game_frame_ms = None
+            self.restarted = restart
             self.current_state = "GAME"
             self.config["game_mode"] = game_mode
             
-            self.input_handler = InputHandler()
-            self.sound_manager = SoundManager()
-            self.ai_brain = AIBrain()
+            self.sound_manager.enabled = self.config["sound_enabled"] and not self.headless
+            if restart and self.ai_brain and self.ai_brain.tick_rate == 1 / self.tick_dt:
+                # Lo aprendido ya está en memoria: no hace falta releer el archivo
+                self.ai_brain.reset_session()
+            else:
+                if self.ai_brain:
+                    self.ai_brain.close()
+                self.ai_brain = AIBrain(self.behavior_file, tick_rate=1 / self.tick_dt,
+                                        worker=self.config["ai_worker"])
+            
+            # `modifiers` permite probar valores fuera de GAME_MODE_MODIFIERS
+            mod = modifiers if modifiers is not None else GAME_MODE_MODIFIERS[game_mode]
+            self.modifiers = mod
+            
+            # Todo el azar del combate sale de flujos derivados de una sola semilla
+            self.rng = FightRNG(seed if seed is not None else self.fixed_seed)
+            print(f"Semilla del combate: {self.rng.seed}")
+            
+            if record is None:
+                record = self.config["record_replays"] and not self.headless
+            if record:
+                self.record_path = record if isinstance(record, str) else None
+                self.recorder = ReplayRecorder(self.replay_header(game_mode), input_source)
+                input_source = self.recorder
+            self.input_handler = InputHandler(input_source)
             
-            mod = GAME_MODE_MODIFIERS[game_mode]
+            # Atlas de rotación listo antes del primer ataque
+            BulletStore.set_rotation_quality(self.config["rotation_quality"])
+            BulletStore.prepare_sprites()
             
             base_hp = int(PLAYER_HP * mod["player_hp_mult"])
-            self.player = Player(ARENA_X + ARENA_WIDTH // 2, ARENA_Y + ARENA_HEIGHT // 2)
+            self.player = Player(ARENA_X + ARENA_WIDTH // 2, ARENA_Y + ARENA_HEIGHT // 2,
+                                 sound_manager=self.sound_manager)
             self.player.max_hp = base_hp
             self.player.hp = base_hp
             
             self.current_phase = 1
-            self.boss = Boss(WIDTH // 2, 100, self.ai_brain, phase=self.current_phase, difficulty_mod=mod) 
+            self.boss = Boss(WIDTH // 2, 100, self.ai_brain, phase=self.current_phase, difficulty_mod=mod,
+                             bullet_store=self.bullet_store.clear(), collisions=self.collisions, rng=self.rng)
             self.revived_bosses = []
             
             self.game_time = 0
+            self.accumulator = 0.0
+            self.render_alpha = 1.0
             self.ai_analysis_timer = 0
             self.game_over = False
             self.victory = False
+            self.game_over_layer.invalidate()
+            self.transition_layer.invalidate()
+            self.renderer.invalidate()
+            self.hud_key = None
             self.phase_transition = False
             self.transition_timer = 0
             self.transition_duration = 3.0
@@ -85,21 +205,84 @@ class Game:
             self.phase_message_timer = 0
             
             # Mostrar diálogo de introducción del primer boss
-            shipibo, spanish = get_dialogue("yacuruna", "intro")
-            self.dialogue_box.show(shipibo, spanish, "YACURUNA")
+            if not restart:
+                shipibo, spanish = get_dialogue("yacuruna", "intro")
+                self.dialogue_box.show(shipibo, spanish, "YACURUNA")
+            else:
+                self.dialogue_box.active = False
+            
+            self.checkpoints = {}
+            self.rewind.clear()
+            self.checkpoints[1] = self.capture_state()
             
             print(f"✓ Juego iniciado en modo: {game_mode.upper()}")
         except Exception as e:
             print(f"Error iniciando el juego: {e}")
+            self.start_error = e
             self.current_state = "MENU"
     
+    def reset_fight(self):
+        """Reinicia el combate (R) sin tocar ventana, menús, fuentes, assets, sonidos ni pools"""
+        self.start_game(self.config["game_mode"], modifiers=self.modifiers, restart=True)
+    
+    def replay_header(self, game_mode):
+        learned = self.ai_brain.replay_state()
+        return {
+            "seed": self.rng.seed,
+            "mode": game_mode,
+            "modifiers": copy.deepcopy(self.modifiers),
+            "tick_rate": 1 / self.tick_dt,
+            "ai": learned["ai"],
+            "ngram": base64.b64encode(learned["ngram"]).decode("ascii"),
+            "heatmap": base64.b64encode(learned["heatmap"]).decode("ascii"),
+        }
+    
+    def finish_recording(self):
+        """Guarda la grabación del combate en curso, si la hay"""
+        recorder = self.recorder
+        if recorder is None:
+            return None
+        self.recorder = None
+        path = self.record_path or os.path.join(
+            REPLAY_DIR, time.strftime("replay_%Y%m%d_%H%M%S") + f"_{recorder.header['seed']}.rpl")
+        try:
+            size = recorder.save(path)
+            print(f"Repetición guardada: {path} ({recorder.ticks} ticks, {size} bytes)")
+        except OSError as e:
+            print(f"No se pudo guardar la repetición: {e}")
+        return path
+    
+    def start_replay(self, log):
+        """Reproduce una grabación con su semilla, modo, modificadores y IA"""
+        header = log.header
+        self.replay_source = log.source()
+        self.start_game(header["mode"], input_source=self.replay_source,
+                        modifiers=header["modifiers"], seed=header["seed"], record=False,
+                        tick_rate=header["tick_rate"])
+        self.ai_brain.load_replay_state(
+            log.ai_snapshot(),
+            base64.b64decode(header["ngram"]) if "ngram" in header else None,
+            base64.b64decode(header["heatmap"]) if "heatmap" in header else None)
+        print(f"Reproduciendo {log.ticks} ticks")
+    
+    def follow_replay(self):
+        """Durante una repetición los diálogos se cierran solos; al terminar se vuelve al menú"""
+        self.dialogue_box.active = False
+        if self.replay_source.finished:
+            print("Repetición terminada")
+            self.replay_source = None
+            if not self.game_over:
+                self.current_state = "MENU"
+    
     def run(self):
         while self.running:
             try:
-                dt = self.clock.tick(FPS) / 1000.0
+                # Combate a FPS completos; menús y pantallas quietas esperan input
+                dt, events = self.scheduler.next_frame(self.scene_key(), self.scene_is_static())
+                redraw = self.scheduler.redraw
                 
-                events = pygame.event.get()
-                self.handle_common_events(events)
+                with profiler.span("events"):
+                    self.handle_common_events(events)
                 
                 if self.current_state == "INTRO":
                     self.intro_screen.update(dt)
@@ -124,7 +307,11 @@ class Game:
                         self.current_state = "SETTINGS"
                     elif action == "quit":
                         self.running = False
-                    self.main_menu.draw()
+                    if redraw:
+                        self.main_menu.draw()
+                    if self.first_menu_frame_ms is None:
+                        self.first_menu_frame_ms = (time.perf_counter() - self.boot_start) * 1000
+                        print(f"Primer frame del menú: {self.first_menu_frame_ms:.1f} ms")
                 
                 elif self.current_state == "SETTINGS":
                     action = self.settings_menu.handle_events(events)
@@ -139,30 +326,48 @@ class Game:
                     elif not self.config["music_enabled"] and pygame.mixer.music.get_busy():
                         pygame.mixer.music.stop()
 
-                    self.settings_menu.draw()
+                    if redraw:
+                        self.settings_menu.draw()
                 
                 elif self.current_state == "GAME":
+                    if self.replay_source is not None:
+                        self.follow_replay()
                     # Verificar si hay diálogo activo
                     if self.dialogue_box.active:
+                        self.accumulator = 0.0  # el combate está en pausa
                         if self.dialogue_box.update(events):
                             # Diálogo completado, continuar juego
                             pass
-                        self.draw()  # Dibujar el juego de fondo
-                        self.dialogue_box.draw()  # Dibujar diálogo encima
+                        if redraw:
+                            with profiler.span("draw"):
+                                # El fondo solo se dibuja hasta que el diálogo lo congela
+                                if not self.dialogue_box.frozen:
+                                    self.draw()  # Dibujar el juego de fondo
+                                else:
+                                    self.dirty_frame = False
+                                    self.renderer.invalidate()
+                                self.dialogue_box.draw()  # Dibujar diálogo encima
                     else:
                         # Juego normal
-                        self.game_time += dt
                         self.handle_events_game(events)
+                        with profiler.span("update"):
+                            self.advance(dt)
+                        if redraw:
+                            with profiler.span("draw"):
+                                self.draw()
                     
-                        if not self.game_over:
-                            if not self.phase_transition:
-                                self.update(dt)
-                            else:
-                                self.update_transition(dt)
-                        
-                        self.draw()
+                    if redraw and self.config["show_profiler"]:
+                        self.profiler_rect = profiler.draw(self.screen)
+                    
+                    if self.first_game_frame_ms is None:
+                        self.first_game_frame_ms = (time.perf_counter() - self.fight_load_start) * 1000
+                        label = "tras reiniciar" if self.restarted else "de combate"
+                        print(f"Primer frame {label}: {self.first_game_frame_ms:.1f} ms")
                 
-                pygame.display.flip()
+                if redraw:
+                    with profiler.span("flip"):
+                        self.present()
+                profiler.end_frame()
             
             except Exception as e:
                 print(f"Error en el loop principal: {e}")
@@ -170,9 +375,32 @@ class Game:
                 traceback.print_exc()
                 self.running = False
         
+        self.finish_recording()
+        if self.ai_brain:
+            self.ai_brain.close()
+        if profiler.recording:
+            self.save_trace()
+        print(assets.summary())
+        print(self.preloader.summary())
+        print(texts.summary())
+        print(self.renderer.summary())
         pygame.quit()
         sys.exit()
 
+    def scene_key(self):
+        """Identifica la escena actual; al cambiar se dibuja al menos un frame completo"""
+        return (self.current_state, self.dialogue_box.active, self.game_over, self.phase_transition)
+    
+    def scene_is_static(self):
+        """True si la escena no se anima sola y solo cambia con input"""
+        if self.current_state in ("MENU", "SETTINGS"):
+            return True
+        if self.current_state == "GAME":
+            if self.dialogue_box.frozen:
+                return True
+            return self.game_over and self.game_over_layer.ready(self.victory)
+        return False
+    
     def handle_common_events(self, events):
         for event in events:
             if event.type == pygame.QUIT:
@@ -183,15 +411,64 @@ class Game:
                         self.current_state = "MENU"
                     elif self.current_state == "SETTINGS":
                         self.current_state = "MENU"
+                # Depuración: F3 muestra el profiler, F4 graba/guarda una traza,
+                # F7 muestra el mapa de ocupación de la IA
+                elif event.key == pygame.K_F3:
+                    self.config["show_profiler"] = not self.config["show_profiler"]
+                elif event.key == pygame.K_F7:
+                    self.config["show_heatmap"] = not self.config["show_heatmap"]
+                elif event.key == pygame.K_F5:
+                    self.config["dirty_rects"] = not self.config["dirty_rects"]
+                    print(f"Render sucio: {'activado' if self.config['dirty_rects'] else 'desactivado'}")
+                elif event.key == pygame.K_F4:
+                    if profiler.recording:
+                        self.save_trace()
+                    else:
+                        profiler.start_recording()
+                        print("Grabando traza del profiler (F4 para guardar)")
+    
+    def save_trace(self):
+        path = os.path.join(PROFILE_TRACE_DIR, time.strftime("trace_%Y%m%d_%H%M%S.json"))
+        profiler.stop_recording(path)
     
     def handle_events_game(self, events):
-        if self.input_handler:
-            self.input_handler.update()
         for event in events:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r and self.game_over:
-                    self.__init__()
+                    self.reset_fight()
+                elif event.key == pygame.K_c and self.game_over and not self.victory:
+                    self.resume_from_checkpoint(self.current_phase)
+                elif event.key == pygame.K_F6 and self.replay_source is None:
+                    self.rewind_step()
                     
+    def advance(self, frame_dt):
+        """Consume el tiempo real del frame en ticks fijos y deja el resto para interpolar"""
+        self.accumulator += min(frame_dt, MAX_FRAME_TIME)
+        ticks = 0
+        while self.accumulator >= self.tick_dt:
+            self.step_simulation(self.tick_dt)
+            self.accumulator -= self.tick_dt
+            ticks += 1
+        # Fracción del próximo tick ya transcurrida: el dibujo se interpola con ella
+        self.render_alpha = self.accumulator / self.tick_dt
+        profiler.count("ticks", ticks)
+    
+    def step_simulation(self, dt):
+        """Avanza el combate `dt` segundos (sin eventos de ventana ni dibujo)"""
+        self.game_time += dt
+        if self.input_handler:
+            with profiler.span("input"):
+                self.input_handler.update()
+        
+        if not self.game_over:
+            if not self.phase_transition:
+                self.update(dt)
+                if not self.game_over and not self.phase_transition:
+                    with profiler.span("snapshot"):
+                        self.rewind.tick(dt, self.capture_state)
+            else:
+                self.update_transition(dt)
+    
     def update(self, dt):
         if not self.input_handler or not self.player or not self.boss:
             return
@@ -201,18 +478,23 @@ class Game:
         prev_boss_hp = self.boss.hp
         prev_player_hp = self.player.hp
         
-        self.player.update(dt, keys)
-        self.boss.update(dt, self.player)
+        with profiler.span("player"):
+            self.player.update(dt, keys)
+        with profiler.span("boss"):
+            self.boss.update(dt, self.player)
+        self.preload_upcoming()
         
-        for revived_boss in self.revived_bosses[:]:
-            revived_boss.update(dt, self.player)
-            if revived_boss.hp <= 0:
-                self.revived_bosses.remove(revived_boss)
-                print(f"{revived_boss.name} espíritu eliminado")
-
-        for revived_boss in self.revived_bosses:
-            self.boss.bullets.extend(revived_boss.bullets)
-            revived_boss.bullets.clear()
+        with profiler.span("spirits"):
+            for revived_boss in self.revived_bosses[:]:
+                revived_boss.update(dt, self.player)
+                if revived_boss.hp <= 0:
+                    self.revived_bosses.remove(revived_boss)
+                    print(f"{revived_boss.name} espíritu eliminado")
+        
+        bosses = [self.boss, *self.revived_bosses]
+        profiler.count("balas", self.boss.bullets.count)
+        profiler.count("láseres", sum(len(boss.lasers) for boss in bosses))
+        profiler.count("avisos", sum(len(boss.warnings) for boss in bosses))
         
         damage_to_boss = prev_boss_hp - self.boss.hp
         damage_to_player = prev_player_hp - self.player.hp
@@ -221,10 +503,15 @@ class Game:
         if damage_to_player > 0:
             self.stats["damage_taken"] += damage_to_player
         
+        # Muestra por tick (O(1)); el análisis que guarda en disco sigue cada AI_ANALYSIS_INTERVAL.
+        # Con el hilo de la IA, acá solo se encolan
+        with profiler.span("ai"):
+            self.ai_brain.sample(self.player.x, self.player.y)
         self.ai_analysis_timer += dt
         if self.ai_analysis_timer >= AI_ANALYSIS_INTERVAL:
-            self.ai_brain.analyze_player(self.player, self.game_time)
-            self.ai_brain.analyze_movement_pattern(self.player, self.game_time)
+            with profiler.span("ai"):
+                self.ai_brain.analyze_player(self.player, self.game_time)
+                self.ai_brain.analyze_movement_pattern(self.player, self.game_time)
             self.ai_analysis_timer = 0
         
         # Resurrección de Yacumama (25% HP y solo una vez)
@@ -237,12 +524,7 @@ class Game:
                 new_bosses = self.boss.start_revival_sequence()
                 if new_bosses:
                     self.revived_bosses.extend(new_bosses)
-                    if self.config["sound_enabled"]:
-                        try:
-                            revival_sound = pygame.mixer.Sound("assets/sounds/trueno.mp3")
-                            revival_sound.play()
-                        except:
-                            pass
+                    self.sound_manager.play("trueno")
         
         # Verificar derrota del boss
         if self.boss.hp <= 0:
@@ -252,15 +534,10 @@ class Game:
                 shipibo, spanish = get_dialogue(boss_name, "defeat")
                 self.dialogue_box.show(shipibo, spanish, self.boss.name.upper())
                 
-                if self.config["sound_enabled"]:
-                    try:
-                        if self.current_phase == 1:
-                            death_sound = pygame.mixer.Sound("assets/sounds/roar_boss_1.mp3")
-                        elif self.current_phase == 2:
-                            death_sound = pygame.mixer.Sound("assets/sounds/roar_muerte_chullachaqui.mp3")
-                        death_sound.play()
-                    except:
-                        pass
+                if self.current_phase == 1:
+                    self.sound_manager.play("roar_boss_1")
+                elif self.current_phase == 2:
+                    self.sound_manager.play("roar_muerte_chullachaqui")
                 
                 self.start_phase_transition()
             else:
@@ -276,12 +553,9 @@ class Game:
                     hits = int(self.stats["damage_dealt"] / PLAYER_BULLET_DAMAGE)
                     self.stats["accuracy"] = (hits / self.player.shots_fired) * 100
                 
-                if self.config["sound_enabled"]:
-                    try:
-                        death_sound = pygame.mixer.Sound("assets/sounds/roar_muerte_yakumama.mp3")
-                        death_sound.play()
-                    except:
-                        pass
+                self.sound_manager.play("roar_muerte_yakumama")
+                self.ai_brain.flush()
+                self.finish_recording()
         
         # Verificar derrota del jugador
         if self.player.hp <= 0:
@@ -290,17 +564,33 @@ class Game:
             self.stats["time"] = self.game_time
             self.stats["phases_completed"] = self.current_phase - 1
 
-            if self.config["sound_enabled"]:
-                try:
-                    defeat_sound = pygame.mixer.Sound("assets/sounds/derrota.mp3")
-                    defeat_sound.play()
-                except:
-                    pass
+            self.sound_manager.play("derrota")
+            self.ai_brain.flush()
+            self.finish_recording()
+    
+    def preload_phase(self, phase):
+        self.preloader.request(f"fase {phase}", Boss.sprite_requests(phase).values(),
+                               BOSS_PHASES[phase].get("sounds", ()))
+    
+    def preload_spirits(self):
+        images = [request for phase in (1, 2) for request in Boss.sprite_requests(phase, is_spirit=True).values()]
+        self.preloader.request("espíritus", images, ("trueno",))
+    
+    def preload_upcoming(self):
+        """Con el boss herido se empieza a preparar lo que viene después"""
+        if self.boss.hp > self.boss.max_hp * PRELOAD_HP_FRACTION:
+            return
+        if self.current_phase < 3:
+            self.preload_phase(self.current_phase + 1)
+        elif self.boss.can_revive and not self.boss.has_revived:
+            self.preload_spirits()
     
     def start_phase_transition(self):
+        self.preload_phase(self.current_phase + 1)
         self.phase_transition = True
         self.transition_timer = 0
         self.stats["phases_completed"] = self.current_phase
+        self.ai_brain.flush()
         print(f"¡Fase {self.current_phase} completada! Preparando Fase {self.current_phase + 1}...")
     
     def update_transition(self, dt):
@@ -314,19 +604,13 @@ class Game:
         self.phase_transition = False
         self.transition_timer = 0
         
-        mod = GAME_MODE_MODIFIERS[self.config["game_mode"]]
+        mod = self.modifiers
 
-        self.boss = Boss(WIDTH // 2, 100, self.ai_brain, phase=self.current_phase, difficulty_mod=mod)
+        self.boss = Boss(WIDTH // 2, 100, self.ai_brain, phase=self.current_phase, difficulty_mod=mod,
+                         bullet_store=self.bullet_store.clear(), collisions=self.collisions, rng=self.rng)
         
-        if self.config["sound_enabled"]:
-            try:
-                if self.current_phase == 2:
-                    appear_sound = pygame.mixer.Sound("assets/sounds/roar_inicio_yakuruna.mp3")
-                elif self.current_phase == 3:
-                    appear_sound = pygame.mixer.Sound("assets/sounds/roar_inicio_yakuruna.mp3")
-                appear_sound.play()
-            except:
-                pass
+        if self.current_phase in (2, 3):
+            self.sound_manager.play("roar_inicio_yakuruna")
         
         self.player.reset_for_new_phase()
         self.revived_bosses.clear()
@@ -336,41 +620,182 @@ class Game:
         shipibo, spanish = get_dialogue(boss_name, "intro")
         self.dialogue_box.show(shipibo, spanish, self.boss.name.upper())
         
+        self.checkpoints[self.current_phase] = self.capture_state()
+        self.rewind.clear()
         print(f"¡FASE {self.current_phase} INICIADA: {self.boss.name}!")
     
+    def capture_state(self):
+        """Captura del combate: jugador, bosses, balas, láseres, avisos, IA y azar"""
+        return {
+            "fields": {name: getattr(self, name) for name in SNAPSHOT_FIELDS},
+            "stats": self.stats.copy(),
+            "player": self.player.snapshot(),
+            "boss": (self.boss, self.boss.snapshot()),
+            "spirits": [(spirit, spirit.snapshot()) for spirit in self.revived_bosses],
+            "ai": self.ai_brain.snapshot(),
+            "rng": self.rng.get_state(),
+        }
+    
+    def restore_state(self, snapshot):
+        """Vuelve a una captura; la misma captura puede restaurarse varias veces"""
+        for name, value in snapshot["fields"].items():
+            setattr(self, name, value)
+        self.stats = snapshot["stats"].copy()
+        self.player.restore(snapshot["player"])
+        self.boss, boss_state = snapshot["boss"]
+        self.boss.restore(boss_state)
+        self.revived_bosses = []
+        for spirit, spirit_state in snapshot["spirits"]:
+            spirit.restore(spirit_state)
+            self.revived_bosses.append(spirit)
+        self.ai_brain.restore(snapshot["ai"])
+        self.rng.set_state(snapshot["rng"])
+        
+        # Lo que se dibuja a partir del estado se rehace en el próximo frame
+        self.accumulator = 0.0
+        self.render_alpha = 1.0
+        self.dialogue_box.active = False
+        self.game_over_layer.invalidate()
+        self.transition_layer.invalidate()
+        self.renderer.invalidate()
+        self.hud_key = None
+        # El input grabado hasta acá ya no lleva a este estado
+        self.finish_recording()
+    
+    def resume_from_checkpoint(self, phase):
+        if phase not in self.checkpoints:
+            return
+        started = time.perf_counter()
+        self.restore_state(self.checkpoints[phase])
+        self.rewind.clear()
+        self.current_state = "GAME"
+        print(f"Continuando desde la fase {phase} ({(time.perf_counter() - started) * 1000:.2f} ms)")
+    
+    def rewind_step(self):
+        """Depuración: vuelve REWIND_INTERVAL segundos atrás por cada pulsación"""
+        snapshot = self.rewind.pop()
+        if snapshot is None:
+            print("No hay capturas para rebobinar")
+            return
+        self.restore_state(snapshot)
+        print(f"Rebobinado a t={self.game_time:.1f} s ({len(self.rewind)} capturas restantes)")
+    
+    def use_dirty_rects(self):
+        """El render sucio solo aplica al combate en curso, sin pantallas encima"""
+        return (self.config["dirty_rects"] and self.current_state == "GAME"
+                and not self.config["show_heatmap"]
+                and self.player is not None and self.boss is not None
+                and not self.dialogue_box.active and not self.phase_transition and not self.game_over)
+    
+    def present(self):
+        if self.dirty_frame:
+            self.renderer.present()
+        else:
+            pygame.display.flip()
+    
+    def hud_state(self):
+        """Valores que muestra el HUD; la capa se redibuja solo si cambian"""
+        player = self.player
+        return (player.hp, player.max_hp, self.config["game_mode"], self.current_phase,
+                self.boss.state, int(self.boss.hp), self.boss.regenerating,
+                player.dodges_for_special, player.attack_mode, player.can_use_special,
+                int(SPECIAL_ATTACK_WINDOW - player.attack_mode_timer) if player.attack_mode else 0,
+                int(self.game_time), tuple(int(spirit.hp) for spirit in self.revived_bosses))
+    
+    def draw_dirty(self):
+        """Frame de combate redibujando solo los tiles que cambiaron"""
+        renderer = self.renderer
+        
+        hud_key = self.hud_state()
+        if hud_key != self.hud_key:
+            self.hud_key = hud_key
+            self.hud_layer.fill((0, 0, 0, 0))
+            # Mismo orden que el render completo: barras de los bosses y luego el HUD
+            for boss in (self.boss, *self.revived_bosses):
+                boss.draw_hp_bar(self.hud_layer)
+            self.draw_ui(self.hud_layer)
+            mask = renderer.tile_mask(self.hud_layer)
+            renderer.mark_mask(mask | self.hud_mask)
+            self.hud_mask = mask
+        
+        alpha = self.render_alpha
+        self.player.mark_dirty(renderer, alpha)
+        self.boss.mark_dirty(renderer, alpha)
+        for revived_boss in self.revived_bosses:
+            revived_boss.mark_dirty(renderer, alpha)
+        if self.config["show_profiler"] and self.profiler_rect:
+            renderer.mark_rect(*self.profiler_rect)
+        
+        renderer.erase()
+        self.player.draw(self.screen, alpha)
+        self.boss.draw(self.screen, hp_bar=False, alpha=alpha)
+        for revived_boss in self.revived_bosses:
+            revived_boss.draw(self.screen, hp_bar=False, alpha=alpha)
+        renderer.overlay(self.hud_layer)
+        profiler.count("sucio", f"{renderer.dirty_fraction:.0%}")
+    
     def draw(self):
+        self.dirty_frame = self.use_dirty_rects()
+        if self.dirty_frame:
+            self.draw_dirty()
+            return
+        self.renderer.invalidate()
+        self.hud_key = None
+        
+        if self.game_over and self.game_over_layer.ready(self.victory):
+            self.game_over_layer.draw(self.screen)
+            return
+        if self.phase_transition:
+            self.draw_phase_transition()
+            return
+        
         self.screen.fill(BLACK)
         
         # Arena
         pygame.draw.rect(self.screen, WHITE, 
                          (ARENA_X, ARENA_Y, ARENA_WIDTH, ARENA_HEIGHT), 3)
+        if self.config["show_heatmap"] and self.ai_brain:
+            self.draw_heatmap()
         
-        if not self.phase_transition:
-            if self.player:
-                self.player.draw(self.screen)
-            if self.boss:
-                self.boss.draw(self.screen)
-            
-            for revived_boss in self.revived_bosses:
-                revived_boss.draw(self.screen)
-            
-            self.draw_ui()
-        else:
-            self.draw_phase_transition()
+        alpha = self.render_alpha
+        if self.player:
+            self.player.draw(self.screen, alpha)
+        if self.boss:
+            self.boss.draw(self.screen, alpha=alpha)
+        
+        for revived_boss in self.revived_bosses:
+            revived_boss.draw(self.screen, alpha=alpha)
+        
+        self.draw_ui()
         
         if self.game_over:
             self.draw_game_over()
     
-    def draw_ui(self):
+    def draw_heatmap(self):
+        """Depuración (F7): ocupación de la arena en rojo y las celdas que usa el boss"""
+        heatmap = self.ai_brain.heatmap
+        values = heatmap.values()
+        peak = values.max()
+        if peak <= 0:
+            return
+        # Una celda por píxel y después se escala a la arena
+        layer = pygame.Surface((heatmap.cols, heatmap.rows), pygame.SRCALPHA)
+        layer.fill((255, 60, 0, 0))
+        pygame.surfarray.pixels_alpha(layer)[:] = (values.T / peak * 170).astype(np.uint8)
+        self.screen.blit(pygame.transform.scale(layer, (ARENA_WIDTH, ARENA_HEIGHT)), (ARENA_X, ARENA_Y))
+        for x, y in self.ai_brain.hot_spots():
+            pygame.draw.rect(self.screen, YELLOW, (x - heatmap.cell_w / 2, y - heatmap.cell_h / 2,
+                                                   heatmap.cell_w, heatmap.cell_h), 1)
+    
+    def draw_ui(self, surface=None):
         if not self.player or not self.boss:
             return
+        screen = surface if surface is not None else self.screen
             
-        font = pygame.font.Font(None, 36)
-        small_font = pygame.font.Font(None, 24)
-        
+        # Los textos salen de la caché: solo se renderizan cuando cambia su valor
         # HP del jugador
-        hp_text = font.render(f"HP: {self.player.hp}/{self.player.max_hp}", True, RED)
-        self.screen.blit(hp_text, (20, 20))
+        hp_text = texts.render(f"HP: {self.player.hp}/{self.player.max_hp}", 36, RED)
+        screen.blit(hp_text, (20, 20))
         
         # Barra HP jugador
         bar_width = 150
@@ -378,104 +803,96 @@ class Game:
         bar_x = 20
         bar_y = 55
         
-        pygame.draw.rect(self.screen, WHITE, (bar_x - 2, bar_y - 2, bar_width + 4, bar_height + 4), 2)
-        pygame.draw.rect(self.screen, BLACK, (bar_x, bar_y, bar_width, bar_height))
+        pygame.draw.rect(screen, WHITE, (bar_x - 2, bar_y - 2, bar_width + 4, bar_height + 4), 2)
+        pygame.draw.rect(screen, BLACK, (bar_x, bar_y, bar_width, bar_height))
         
         hp_percent = self.player.hp / self.player.max_hp
         hp_bar_width = int(bar_width * hp_percent)
         hp_color = GREEN if hp_percent > 0.5 else (YELLOW if hp_percent > 0.25 else RED)
-        pygame.draw.rect(self.screen, hp_color, (bar_x, bar_y, hp_bar_width, bar_height))
+        pygame.draw.rect(screen, hp_color, (bar_x, bar_y, hp_bar_width, bar_height))
         
         # Modo de juego
-        mode_text = small_font.render(f"Modo: {self.config['game_mode'].upper()}", True, GOLD)
-        self.screen.blit(mode_text, (WIDTH - 200, 20))
+        mode_text = texts.render(f"Modo: {self.config['game_mode'].upper()}", 24, GOLD)
+        screen.blit(mode_text, (WIDTH - 200, 20))
         
         # Estado del boss
         phase_color = BOSS_PHASES[self.current_phase]["color"]
-        phase_text = font.render(f"FASE {self.current_phase} - {self.boss.state.upper()}", 
-                                 True, phase_color)
-        self.screen.blit(phase_text, (WIDTH - 350, 50))
+        phase_text = texts.render(f"FASE {self.current_phase} - {self.boss.state.upper()}", 
+                                  36, phase_color)
+        screen.blit(phase_text, (WIDTH - 350, 50))
         
         # Contador de esquivos
-        dodges_text = small_font.render(f"Esquivos: {self.player.dodges_for_special}/{SPECIAL_ATTACK_DODGES}", 
-        True, CYAN if not self.player.attack_mode else GOLD)
-        self.screen.blit(dodges_text, (20, 80))
+        dodges_text = texts.render(f"Esquivos: {self.player.dodges_for_special}/{SPECIAL_ATTACK_DODGES}", 
+        24, CYAN if not self.player.attack_mode else GOLD)
+        screen.blit(dodges_text, (20, 80))
         
         # Modo ataque
         if self.player.attack_mode:
             time_left = SPECIAL_ATTACK_WINDOW - self.player.attack_mode_timer
-            mode_text = font.render(f"¡MODO ATAQUE! {int(time_left)}s", True, GOLD)
-            self.screen.blit(mode_text, (WIDTH // 2 - 150, HEIGHT - 50))
+            mode_text = texts.render(f"¡MODO ATAQUE! {int(time_left)}s", 36, GOLD)
+            screen.blit(mode_text, (WIDTH // 2 - 150, HEIGHT - 50))
             
             if self.player.can_use_special:
-                special_text = small_font.render("Presiona X para PODER ESPECIAL", True, GOLD)
-                self.screen.blit(special_text, (WIDTH // 2 - 150, HEIGHT - 80))
+                special_text = texts.render("Presiona X para PODER ESPECIAL", 24, GOLD)
+                screen.blit(special_text, (WIDTH // 2 - 150, HEIGHT - 80))
         
         # Tiempo
-        time_text = small_font.render(f"Tiempo: {int(self.game_time)}s", True, WHITE)
-        self.screen.blit(time_text, (WIDTH // 2 - 50, HEIGHT - 30))
+        time_text = texts.render(f"Tiempo: {int(self.game_time)}s", 24, WHITE)
+        screen.blit(time_text, (WIDTH // 2 - 50, HEIGHT - 30))
         
         # Bosses revividos
         if len(self.revived_bosses) > 0:
-            revived_text = small_font.render(f"Espíritus activos: {len(self.revived_bosses)}", 
-            True, PURPLE)
-            self.screen.blit(revived_text, (WIDTH - 200, 80))
+            revived_text = texts.render(f"Espíritus activos: {len(self.revived_bosses)}", 
+            24, PURPLE)
+            screen.blit(revived_text, (WIDTH - 200, 80))
         
         # Indicador de regeneración de Yacumama
         if self.boss.regenerating:
-            regen_text = small_font.render("¡REGENERANDO!", True, GREEN)
-            self.screen.blit(regen_text, (WIDTH // 2 - 80, 120))
+            regen_text = texts.render("¡REGENERANDO!", 24, GREEN)
+            screen.blit(regen_text, (WIDTH // 2 - 80, 120))
     
     def draw_phase_transition(self):
-        overlay = pygame.Surface((WIDTH, HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
-        
-        font = pygame.font.Font(None, 72)
-        small_font = pygame.font.Font(None, 36)
-        
-        completed_text = font.render(f"FASE {self.current_phase} COMPLETADA", True, GREEN)
-        self.screen.blit(completed_text, 
-                         (WIDTH // 2 - completed_text.get_width() // 2, HEIGHT // 2 - 100))
-        
-        next_phase = self.current_phase + 1
-        next_name = BOSS_PHASES[next_phase]["name"]
-        next_text = font.render(f"Siguiente: {next_name}", True, 
-        BOSS_PHASES[next_phase]["color"])
-        self.screen.blit(next_text, 
-                         (WIDTH // 2 - next_text.get_width() // 2, HEIGHT // 2)) 
-        
+        # Fondo, velo y títulos se componen una vez por transición
+        if not self.transition_layer.ready(self.current_phase):
+            layer = self.transition_layer.compose(self.renderer.background, 200, self.current_phase)
+            
+            completed_text = texts.render(f"FASE {self.current_phase} COMPLETADA", 72, GREEN)
+            layer.blit(completed_text, 
+                       (WIDTH // 2 - completed_text.get_width() // 2, HEIGHT // 2 - 100))
+            
+            next_phase = self.current_phase + 1
+            next_name = BOSS_PHASES[next_phase]["name"]
+            next_text = texts.render(f"Siguiente: {next_name}", 72, 
+            BOSS_PHASES[next_phase]["color"])
+            layer.blit(next_text, 
+                       (WIDTH // 2 - next_text.get_width() // 2, HEIGHT // 2)) 
+        self.transition_layer.draw(self.screen)
+        
+        # Solo la cuenta regresiva cambia entre frames
         time_left = self.transition_duration - self.transition_timer
-        timer_text = small_font.render(f"Comenzando en: {int(time_left) + 1}", True, WHITE)
+        timer_text = texts.render(f"Comenzando en: {int(time_left) + 1}", 36, WHITE)
         self.screen.blit(timer_text, 
                          (WIDTH // 2 - timer_text.get_width() // 2, HEIGHT // 2 + 130))
     
     def draw_game_over(self):
-        overlay = pygame.Surface((WIDTH, HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
-        
-        font = pygame.font.Font(None, 72)
-        medium_font = pygame.font.Font(None, 36)
-        small_font = pygame.font.Font(None, 28)
+        # Se compone una vez sobre la escena final congelada; luego se reutiliza
+        screen = self.game_over_layer.compose(self.screen, 200, self.victory)
         
         y_offset = HEIGHT // 2 - 200
         
         if self.victory:
-            title = font.render("¡YOSHIPINIAI!", True, GOLD)  # Victoria en Shipibo
-            subtitle = medium_font.render(f"Modo {self.config['game_mode'].upper()} completado 🎉", True, WHITE)
+            title = texts.render("¡YOSHIPINIAI!", 72, GOLD)  # Victoria en Shipibo
+            subtitle = texts.render(f"Modo {self.config['game_mode'].upper()} completado 🎉", 36, WHITE)
         else:
-            title = font.render("PAKOTIAI", True, RED)  # Derrota en Shipibo
-            subtitle = medium_font.render(f"Fase alcanzada: {self.current_phase} 💀", True, WHITE)
+            title = texts.render("PAKOTIAI", 72, RED)  # Derrota en Shipibo
+            subtitle = texts.render(f"Fase alcanzada: {self.current_phase} 💀", 36, WHITE)
         
-        self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, y_offset))
-        self.screen.blit(subtitle, (WIDTH // 2 - subtitle.get_width() // 2, y_offset + 80))
+        screen.blit(title, (WIDTH // 2 - title.get_width() // 2, y_offset))
+        screen.blit(subtitle, (WIDTH // 2 - subtitle.get_width() // 2, y_offset + 80))
         
         y_offset += 150
-        stats_title = medium_font.render("ESTADÍSTICAS:", True, YELLOW)
-        self.screen.blit(stats_title, (WIDTH // 2 - stats_title.get_width() // 2, y_offset))
+        stats_title = texts.render("ESTADÍSTICAS:", 36, YELLOW)
+        screen.blit(stats_title, (WIDTH // 2 - stats_title.get_width() // 2, y_offset))
         
         y_offset += 50
         if self.player:
@@ -492,13 +909,28 @@ class Game:
             ]
         
         for text in stats_texts:
-            stat_surf = small_font.render(text, True, WHITE)
-            self.screen.blit(stat_surf, (WIDTH // 2 - stat_surf.get_width() // 2, y_offset))
+            stat_surf = texts.render(text, 28, WHITE)
+            screen.blit(stat_surf, (WIDTH // 2 - stat_surf.get_width() // 2, y_offset))
             y_offset += 35
         
-        restart = medium_font.render("R: Reiniciar | ESC: Menú", True, CYAN)
-        self.screen.blit(restart, (WIDTH // 2 - restart.get_width() // 2, HEIGHT - 60))
+        if not self.victory and self.current_phase in self.checkpoints:
+            restart = texts.render(f"R: Reiniciar | C: Volver a la fase {self.current_phase} | ESC: Menú", 32, CYAN)
+        else:
+            restart = texts.render("R: Reiniciar | ESC: Menú", 36, CYAN)
+        screen.blit(restart, (WIDTH // 2 - restart.get_width() // 2, HEIGHT - 60))
+        
+        self.game_over_layer.draw(self.screen)
 
 if __name__ == "__main__":
-    game = Game()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=None, help="semilla fija para repetir combates")
+    parser.add_argument("--replay", default=None, help="reproduce una grabación de data/replays")
+    args = parser.parse_args()
+    if args.replay:
+        # La repetición no debe enseñarle nada nuevo a la IA guardada
+        game = Game(behavior_file=None)
+        game.start_replay(ReplayLog.load(args.replay))
+    else:
+        game = Game(seed=args.seed)
     game.run()
\ No newline at end of file
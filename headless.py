@@ -0,0 +1,148 @@
+# headless.py - Simulación de combates sin ventana, más rápida que el tiempo real
+#
+# Uso: python headless.py --mode genocida --input bot --seconds 300
+
+import argparse
+import time
+from settings import *
+from game import Game
+from core.input_sources import RandomInput, ScriptedBot
+from core.profiler import profiler
+from core.rng import new_seed
+from core.replay import ReplayLog
+
+class HeadlessRunner:
+    """Corre combates completos con dt fijo, sin dibujar ni esperar al reloj.
+
+    El mismo runner (y su Game) sirve para varios combates seguidos. Por
+    defecto la IA aprende solo en memoria: los combates del bot no pisan
+    data/behavior.json salvo que se pase `behavior_file`. La IA analiza en
+    el mismo hilo salvo con `ai_worker`: sin frames ociosos el hilo de la IA
+    solo compite por el GIL (el resultado es el mismo).
+    """
+    def __init__(self, dt=1 / SIM_TICK_RATE, max_seconds=600.0, behavior_file=None, ai_worker=False):
+        self.dt = dt
+        self.max_seconds = max_seconds
+        self.game = Game(headless=True, behavior_file=behavior_file, tick_rate=1 / dt)
+        self.game.config["ai_worker"] = ai_worker
+
+    def make_source(self, input_kind, seed=None):
+        if input_kind == "bot":
+            return ScriptedBot(self.game)
+        if input_kind == "random":
+            return RandomInput(seed)
+        raise ValueError(f"Fuente de input desconocida: {input_kind}")
+
+    def run(self, mode="normal", input_kind="bot", seed=None, modifiers=None, record=False):
+        """Corre un combate y devuelve un resumen con la velocidad alcanzada"""
+        # La misma semilla alimenta el combate y el input aleatorio
+        if seed is None:
+            seed = new_seed()
+        game = self.game
+        source = self.make_source(input_kind, seed)
+        game.start_game(mode, input_source=source, modifiers=modifiers, seed=seed, record=record)
+        self.check_started(f"modo {mode}, semilla {seed}")
+        return self.play(input_kind, source)
+
+    def run_replay(self, log):
+        """Reproduce una grabación (core.replay.ReplayLog) a máxima velocidad"""
+        self.game.start_replay(log)
+        self.check_started("repetición")
+        return self.play("replay", self.game.replay_source)
+
+    def check_started(self, what):
+        """Game.start_game no propaga errores (vuelve al menú): acá sí se corta"""
+        game = self.game
+        if game.current_state != "GAME":
+            raise RuntimeError(f"No se pudo empezar el combate ({what}): {game.start_error}") from game.start_error
+
+    def play(self, input_kind, source):
+        game = self.game
+        mode = game.config["game_mode"]
+        seed = game.rng.seed
+
+        ticks = 0
+        peak_bullets = 0
+        phase_times = {}
+        phase_start = 0.0
+        current_phase = game.current_phase
+        start = time.perf_counter()
+        while not game.game_over and game.game_time < self.max_seconds:
+            # Sin jugador que pulse ESPACIO, los diálogos se cierran solos
+            game.dialogue_box.active = False
+            with profiler.span("update"):
+                game.step_simulation(self.dt)
+            profiler.end_frame()
+            ticks += 1
+            peak_bullets = max(peak_bullets, game.boss.bullets.count)
+            if game.current_phase != current_phase:
+                phase_start = game.game_time
+                current_phase = game.current_phase
+            if game.phase_transition and current_phase not in phase_times:
+                phase_times[current_phase] = game.game_time - phase_start
+            if input_kind == "replay" and source.finished:
+                break
+        wall = time.perf_counter() - start
+        game.finish_recording()
+        if game.victory:
+            phase_times[game.current_phase] = game.game_time - phase_start
+
+        return {
+            "mode": mode,
+            "input": input_kind,
+            "seed": seed,
+            "ticks": ticks,
+            "sim_seconds": game.game_time,
+            "wall_seconds": wall,
+            "speed": game.game_time / wall if wall > 0 else float("inf"),
+            "victory": game.victory,
+            "game_over": game.game_over,
+            "phase": game.current_phase,
+            "phase_times": phase_times,
+            "player_hp": game.player.hp,
+            "damage_taken": game.stats["damage_taken"],
+            "damage_dealt": game.stats["damage_dealt"],
+            "peak_bullets": peak_bullets,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Combate sin ventana a máxima velocidad")
+    parser.add_argument("--mode", choices=list(GAME_MODE_MODIFIERS), default="normal")
+    parser.add_argument("--input", choices=["bot", "random"], default="bot")
+    parser.add_argument("--seconds", type=float, default=600.0, help="tiempo simulado máximo")
+    parser.add_argument("--tick-rate", type=float, default=SIM_TICK_RATE, help="ticks por segundo simulado")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--profile", action="store_true", help="imprime percentiles por fase")
+    parser.add_argument("--trace", default=None, help="guarda los spans en formato Chrome trace")
+    parser.add_argument("--record", default=None, help="graba el input del combate en este archivo")
+    parser.add_argument("--replay", default=None, help="reproduce una grabación (ignora modo, input y semilla)")
+    parser.add_argument("--save-behavior", action="store_true",
+                        help=f"guarda lo que aprende la IA en {BEHAVIOR_FILE} (por defecto solo en memoria)")
+    parser.add_argument("--ai-worker", action="store_true", help="análisis de la IA en su hilo, como en la ventana")
+    args = parser.parse_args()
+
+    if args.replay:
+        log = ReplayLog.load(args.replay)
+        runner = HeadlessRunner(1 / log.header["tick_rate"], args.seconds, behavior_file=None,
+                                ai_worker=args.ai_worker)
+    else:
+        runner = HeadlessRunner(1 / args.tick_rate, args.seconds, ai_worker=args.ai_worker,
+                                behavior_file=BEHAVIOR_FILE if args.save_behavior else None)
+    if args.trace:
+        profiler.start_recording()
+    if args.replay:
+        result = runner.run_replay(log)
+    else:
+        result = runner.run(args.mode, args.input, args.seed, record=args.record or False)
+    if args.trace:
+        profiler.stop_recording(args.trace)
+    outcome = "victoria" if result["victory"] else ("derrota" if result["game_over"] else "tiempo agotado")
+    print(f"Resultado: {outcome} en fase {result['phase']} "
+          f"(HP jugador {result['player_hp']}, balas máx. {result['peak_bullets']})")
+    print(f"{result['sim_seconds']:.1f} s simulados en {result['wall_seconds']:.2f} s reales "
+          f"= {result['speed']:.1f} s simulados por segundo real")
+    if args.profile:
+        print(profiler.report())
+
+if __name__ == "__main__":
+    main()
@@ -159,6 +159,8 @@ class SettingsMenu:
                           button_width, button_height, ""),
             "music": Button(center_x - button_width // 2, y_start + y_spacing * 2, 
                           button_width, button_height, ""),
+            "rotation": Button(center_x - button_width // 2, y_start + y_spacing * 3, 
+                             button_width, button_height, ""),
             "back": Button(center_x - 150, HEIGHT - 100, 300, 50, "VOLVER")
         }
         
@@ -173,6 +175,9 @@ class SettingsMenu:
         
         music = "SÍ" if self.config["music_enabled"] else "NO"
         self.buttons["music"].text = f"Música: {music}"
+        
+        rotation = self.config["rotation_quality"].upper()
+        self.buttons["rotation"].text = f"Rotación de balas: {rotation}"
     
     def handle_events(self, events):
         mouse_pos = pygame.mouse.get_pos()
@@ -194,6 +199,12 @@ class SettingsMenu:
                 elif self.buttons["music"].is_clicked(mouse_pos, mouse_pressed):
                     self.config["music_enabled"] = not self.config["music_enabled"]
                     self.update_button_texts()
+                
+                elif self.buttons["rotation"].is_clicked(mouse_pos, mouse_pressed):
+                    qualities = list(ROTATION_QUALITY)
+                    current = qualities.index(self.config["rotation_quality"])
+                    self.config["rotation_quality"] = qualities[(current + 1) % len(qualities)]
+                    self.update_button_texts()
                     
                 elif self.buttons["back"].is_clicked(mouse_pos, mouse_pressed):
                     return "back"
@@ -4,7 +4,9 @@ import pygame
 import math
 import os
 from settings import *
-from utils import clamp
+from utils import clamp, lerp
+from core.asset_manager import assets
+from core.snapshot import save_objects, load_objects
 
 class SpecialAttack:
     """Poder especial del jugador"""
@@ -30,11 +32,16 @@ class SpecialAttack:
             color = GOLD
             pygame.draw.circle(screen, color, (int(self.x), int(self.y)), 
                              int(self.radius - i * 10), 3)
+    
+    def mark_dirty(self, renderer):
+        renderer.mark_circle(self.x, self.y, self.radius + 2)
 
 class PlayerBullet:
     def __init__(self, x, y, angle, sprite_path="assets/attacks/attackplayer.png"):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.angle = angle
         self.speed = PLAYER_BULLET_SPEED
         self.size = 12
@@ -42,30 +49,30 @@ class PlayerBullet:
         self.active = True
         self.damage = PLAYER_BULLET_DAMAGE
         
-        # Cargar sprite
-        self.sprite = None
-        if os.path.exists(sprite_path):
-            try:
-                self.sprite = pygame.image.load(sprite_path).convert_alpha()
-                self.sprite = pygame.transform.scale(self.sprite, (20, 20))
-                angle_deg = math.degrees(self.angle)
-                self.sprite = pygame.transform.rotate(self.sprite, -angle_deg)
-            except:
-                pass
+        # Sprite (decodificado y rotado una sola vez por el AssetManager)
+        self.sprite = assets.get(sprite_path, (20, 20), angle=-math.degrees(self.angle))
         
     def update(self, dt):
-        self.x += math.cos(self.angle) * self.speed
-        self.y += math.sin(self.angle) * self.speed
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.x += math.cos(self.angle) * self.speed * dt
+        self.y += math.sin(self.angle) * self.speed * dt
         
         if self.x < 0 or self.x > WIDTH or self.y < 0 or self.y > HEIGHT:
             self.active = False
     
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
+        x = lerp(self.prev_x, self.x, alpha)
+        y = lerp(self.prev_y, self.y, alpha)
         if self.sprite:
-            rect = self.sprite.get_rect(center=(int(self.x), int(self.y)))
+            rect = self.sprite.get_rect(center=(int(x), int(y)))
             screen.blit(self.sprite, rect)
         else:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
+            pygame.draw.circle(screen, self.color, (int(x), int(y)), self.size)
+    
+    def mark_dirty(self, renderer, alpha=1.0):
+        half = max(self.size, self.sprite.get_width() // 2 if self.sprite else 0) + 2
+        renderer.mark_circle(lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha), half)
     
     def get_rect(self):
         if self.sprite:
@@ -74,16 +81,19 @@ class PlayerBullet:
                           self.size * 2, self.size * 2)
 
 class Player:
-    def __init__(self, x, y, sprite_path="assets/player/player.png"):
+    def __init__(self, x, y, sprite_path="assets/player/player.png", sound_manager=None):
         self.x = x
         self.y = y
+        self.prev_x = x   # posición del tick anterior, para interpolar el dibujo
+        self.prev_y = y
         self.size = PLAYER_SIZE
-        self.speed = PLAYER_SPEED
+        self.speed = PLAYER_SPEED  # px/s
         self.hp = PLAYER_HP
         self.max_hp = PLAYER_HP
         self.invulnerable = False
         self.invuln_timer = 0
         self.invuln_duration = 1.0
+        self.sound_manager = sound_manager
         
         # Cargar sprites
         self.sprite = None
@@ -112,36 +122,36 @@ class Player:
         """Carga el sprite del jugador"""
         possible_paths = [sprite_path, "assets/player/player.png", "assets/player.png"]
         
+        sprite_size = (PLAYER_SIZE * 2, PLAYER_SIZE * 2)
         for path in possible_paths:
             if os.path.exists(path):
-                try:
-                    self.sprite = pygame.image.load(path).convert_alpha()
-                    sprite_size = PLAYER_SIZE * 2
-                    self.sprite = pygame.transform.scale(self.sprite, (sprite_size, sprite_size))
-                    self.sprite_invuln = self.sprite.copy()
-                    self.sprite_invuln.set_alpha(128)
+                self.sprite = assets.get(path, sprite_size)
+                if self.sprite:
+                    self.sprite_invuln = assets.get(path, sprite_size, alpha=128)
                     print(f"✓ Sprite del jugador cargado desde: {path}")
                     break
-                except Exception as e:
-                    print(f"Error cargando sprite: {e}")
     
     def update(self, dt, keys):
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
+        # Dirección (-1, 0, 1 por eje); el desplazamiento se escala con dt más abajo
         dx = 0
         dy = 0
         moved = False
         
         # Movimiento
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            dx -= self.speed
+            dx -= 1
             moved = True
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            dx += self.speed
+            dx += 1
             moved = True
         if keys[pygame.K_UP] or keys[pygame.K_w]:
-            dy -= self.speed
+            dy -= 1
             moved = True
         if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            dy += self.speed
+            dy += 1
             moved = True
         
         # Contar esquivos (solo si cambió de dirección)
@@ -166,8 +176,9 @@ class Player:
             
             self.last_movement = {"dx": dx, "dy": dy}
         
-        self.x = clamp(self.x + dx, ARENA_X, ARENA_X + ARENA_WIDTH - self.size)
-        self.y = clamp(self.y + dy, ARENA_Y, ARENA_Y + ARENA_HEIGHT - self.size)
+        step = self.speed * dt
+        self.x = clamp(self.x + dx * step, ARENA_X, ARENA_X + ARENA_WIDTH - self.size)
+        self.y = clamp(self.y + dy * step, ARENA_Y, ARENA_Y + ARENA_HEIGHT - self.size)
         
         # Sistema de modo ataque
         if self.dodges_for_special >= SPECIAL_ATTACK_DODGES and not self.attack_mode:
@@ -232,8 +243,8 @@ class Player:
         self.special_attacks.append(special)
         self.can_use_special = False
 
-        attack_special = pygame.mixer.Sound("assets/sounds/attack_special.mp3")
-        attack_special.play()
+        if self.sound_manager:
+            self.sound_manager.play("attack_special")
 
         print("¡PODER ESPECIAL USADO!")
     
@@ -251,8 +262,8 @@ class Player:
         self.bullets.append(bullet)
         self.shots_fired += 1
 
-        attack_sound = pygame.mixer.Sound("assets/sounds/shoot_player.mp3")
-        attack_sound.play()
+        if self.sound_manager:
+            self.sound_manager.play("shoot_player")
     
     def take_damage(self, amount):
         if not self.invulnerable:
@@ -265,9 +276,12 @@ class Player:
                 return True
         return False
     
-    def draw(self, screen):
-        center_x = self.x + self.size // 2
-        center_y = self.y + self.size // 2
+    def draw(self, screen, alpha=1.0):
+        # Posición interpolada entre los dos últimos ticks de la simulación
+        x = lerp(self.prev_x, self.x, alpha)
+        y = lerp(self.prev_y, self.y, alpha)
+        center_x = x + self.size // 2
+        center_y = y + self.size // 2
         
         # Aura de modo ataque
         if self.attack_mode:
@@ -286,25 +300,52 @@ class Player:
                 color = RED if int(self.invuln_timer * 10) % 2 == 0 else (255, 100, 100)
             
             pygame.draw.polygon(screen, color, [
-                (self.x + self.size // 2, self.y + self.size),
-                (self.x, self.y + self.size // 2),
-                (self.x + self.size // 4, self.y),
-                (self.x + self.size // 2, self.y + self.size // 4),
-                (self.x + self.size * 3 // 4, self.y),
-                (self.x + self.size, self.y + self.size // 2)
+                (x + self.size // 2, y + self.size),
+                (x, y + self.size // 2),
+                (x + self.size // 4, y),
+                (x + self.size // 2, y + self.size // 4),
+                (x + self.size * 3 // 4, y),
+                (x + self.size, y + self.size // 2)
             ])
         
         # Balas
         for bullet in self.bullets:
-            bullet.draw(screen)
+            bullet.draw(screen, alpha)
         
         # Ataques especiales
         for special in self.special_attacks:
             special.draw(screen)
     
+    def mark_dirty(self, renderer, alpha=1.0):
+        """Marca para el render sucio todo lo que dibuja `draw`"""
+        center_x = lerp(self.prev_x, self.x, alpha) + self.size // 2
+        center_y = lerp(self.prev_y, self.y, alpha) + self.size // 2
+        # El aura del modo ataque llega a 35 px; el sprite mide 2 * size
+        renderer.mark_circle(center_x, center_y, 36 if self.attack_mode else self.size + 2)
+        for bullet in self.bullets:
+            bullet.mark_dirty(renderer, alpha)
+        for special in self.special_attacks:
+            special.mark_dirty(renderer)
+    
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.size, self.size)
     
+    def snapshot(self):
+        """Estado del jugador para checkpoints y rebobinado"""
+        state = self.__dict__.copy()
+        state["dodges"] = self.dodges.copy()
+        state["last_movement"] = self.last_movement.copy()
+        state["bullets"] = save_objects(self.bullets)
+        state["special_attacks"] = save_objects(self.special_attacks)
+        return state
+    
+    def restore(self, state):
+        self.__dict__.update(state)
+        self.dodges = state["dodges"].copy()
+        self.last_movement = state["last_movement"].copy()
+        self.bullets = load_objects(state["bullets"])
+        self.special_attacks = load_objects(state["special_attacks"])
+    
     def reset_for_new_phase(self):
         """Resetea el jugador para una nueva fase del boss"""
         self.dodges_for_special = 0
@@ -6,6 +6,10 @@ import os
 WIDTH = 800
 HEIGHT = 600
 FPS = 60
+# Ticks por segundo de la simulación, independientes de los FPS del dibujo
+SIM_TICK_RATE = 120
+# Tope del tiempo real que se simula por frame (evita la espiral tras un tirón)
+MAX_FRAME_TIME = 0.25
 
 # Arena de combate (donde se mueve el jugador)
 ARENA_X = 200
@@ -27,7 +31,7 @@ GOLD = (255, 215, 0)
 
 # Player
 PLAYER_SIZE = 20
-PLAYER_SPEED = 5
+PLAYER_SPEED = 300  # px/s
 PLAYER_HP = 400
 PLAYER_SHOOT_COOLDOWN = 0.3
 
@@ -73,7 +77,8 @@ BOSS_PHASES = {
         "hp": 500,
         "speed_base": 1.0,
         "damage_base": 1.0,
-        "color": CYAN
+        "color": CYAN,
+        "sounds": ["roar_boss_1"]
     },
     2: {
         "name": "Chullachaqui",
@@ -83,7 +88,8 @@ BOSS_PHASES = {
         "hp": 600,
         "speed_base": 1.5,
         "damage_base": 1.5,
-        "color": GREEN
+        "color": GREEN,
+        "sounds": ["roar_inicio_yakuruna", "roar_muerte_chullachaqui"]
     },
     3: {
         "name": "Yacumama",
@@ -94,14 +100,15 @@ BOSS_PHASES = {
         "speed_base": 1.3,
         "damage_base": 1.3,
         "color": PURPLE,
-        "can_revive": True
+        "can_revive": True,
+        "sounds": ["roar_inicio_yakuruna", "trueno", "roar_muerte_yakumama"]
     }
 }
 
 # Ataques
-BULLET_BASE_SPEED = 3
+BULLET_BASE_SPEED = 180  # px/s
 BULLET_SIZE = 8
-PLAYER_BULLET_SPEED = 8
+PLAYER_BULLET_SPEED = 480  # px/s
 PLAYER_BULLET_DAMAGE = 20
 
 # Assets paths
@@ -117,12 +124,87 @@ ATTACK_SPRITES = {
     "remolino": "assets/attacks/remolino-con-hojas.png"
 }
 
+# Sonidos
+SOUND_DIR = "assets/sounds"
+MUSIC_TRACK = "assets/sounds/soundtrack_undertale.mp3"
+SOUND_CHANNELS = 16
+
+# Voces simultáneas, prioridad (mayor = más importante) y volumen por sonido
+SOUND_DEFAULTS = {"max_voices": 2, "priority": 3, "volume": 1.0}
+SOUND_BANK = {
+    "shoot_player": {"max_voices": 3, "priority": 1},
+    "attack_special": {"max_voices": 1, "priority": 6},
+    "trueno": {"max_voices": 1, "priority": 7},
+    "roar_boss_1": {"max_voices": 1, "priority": 8},
+    "roar_muerte_chullachaqui": {"max_voices": 1, "priority": 8},
+    "roar_muerte_yakumama": {"max_voices": 1, "priority": 9},
+    "roar_inicio_yakuruna": {"max_voices": 1, "priority": 8},
+    "derrota": {"max_voices": 1, "priority": 10}
+}
+
 # Sprite del jugador
 PLAYER_SPRITE = "assets/player/player.png"
 
+# Caché en disco de sprites ya escalados (se crea en la primera ejecución)
+SPRITE_CACHE_DIR = "data/cache"
+
+# Trazas del profiler (F4), para abrir en chrome://tracing o Perfetto
+PROFILE_TRACE_DIR = "data/traces"
+
+# Repeticiones: input por tick de cada combate (python game.py --replay archivo)
+REPLAY_DIR = "data/replays"
+
+# Precarga en segundo plano: con el boss por debajo de esta fracción de HP se
+# empiezan a decodificar los sprites y sonidos de la fase siguiente (o los de
+# los espíritus, antes de la resurrección de Yacumama al 25%)
+PRELOAD_HP_FRACTION = 0.5
+
+# Rebobinado de depuración (F6): una captura del combate cada REWIND_INTERVAL
+# segundos simulados, se guardan las últimas REWIND_SNAPSHOTS
+REWIND_INTERVAL = 0.5
+REWIND_SNAPSHOTS = 20
+
 # IA
+BEHAVIOR_FILE = "data/behavior.json"
 AI_ANALYSIS_INTERVAL = 3.0
+AI_HISTORY_SECONDS = 4.0  # ventana de posiciones del jugador (una muestra por tick)
 AI_STATE_CHANGE_THRESHOLD = 0.3
+# Predicción de la posición del jugador (core/kalman.py): "cv" velocidad
+# constante (el teclado no acelera), "ca" aceleración constante; ruido del
+# proceso y de la medición (px²)
+AI_TRACKER_MODEL = "cv"
+AI_TRACKER_PROCESS_NOISE = 2.0e7
+AI_TRACKER_MEASUREMENT_NOISE = 1.0
+# Cuánto mantiene el jugador cada tecla, en s: valor inicial, límites y peso
+# de cada tramo nuevo en la media que aprende la IA
+AI_TRACKER_PERSISTENCE = 0.4
+AI_HOLD_TIME_MIN = 0.1
+AI_HOLD_TIME_MAX = 1.5
+AI_HOLD_TIME_SMOOTHING = 0.05
+# N-gramas de direcciones (core/ngram.py): contexto de 1 a AI_NGRAM_CONTEXT
+# teclas, tope de cada contador antes de envejecer la fila, casos mínimos para
+# confiar en un contexto y ticks mínimos para que una tecla cuente
+AI_NGRAM_CONTEXT = 3
+AI_NGRAM_MAX_COUNT = 1024
+AI_NGRAM_MIN_COUNT = 6
+AI_NGRAM_MIN_RUN = 6
+AI_NGRAM_CONFIDENCE = 0.4
+# Mapa de ocupación de la arena (core/heatmap.py): celdas, vida media de lo
+# aprendido en s de combate y cuántas celdas calientes usan la lluvia de
+# veneno y el láser
+AI_HEATMAP_COLS = 40
+AI_HEATMAP_ROWS = 30
+AI_HEATMAP_HALF_LIFE = 30.0
+AI_HEATMAP_TOP_K = 5
+# Hilo de la IA (ai_brain.py): el boss apunta con lo que el modelo publicó hace
+# AI_SNAPSHOT_LAG s (igual con y sin hilo, para que las repeticiones coincidan)
+# y cada cuánto se recalculan las celdas calientes, en s
+AI_SNAPSHOT_LAG = 0.03
+AI_HOT_SPOTS_INTERVAL = 0.5
+
+# Escenas quietas (menús, diálogos, game over): espera máxima por input antes de
+# volver a correr la lógica del frame, en ms
+IDLE_FRAME_TIMEOUT_MS = 250
 
 # Configuración global
 GAME_CONFIG = {
@@ -130,7 +212,20 @@ GAME_CONFIG = {
     "telegraph_enabled": True,
     "sound_enabled": True,
     "music_enabled": True,
-    "show_hitboxes": False
+    "show_hitboxes": False,
+    "show_profiler": False,  # F3 en combate
+    "show_heatmap": False,  # F7 en combate: mapa de ocupación de la IA
+    "ai_worker": False,  # análisis de la IA en un hilo aparte del frame
+    "dirty_rects": False,  # F5: redibuja solo las zonas que cambian
+    "record_replays": True,  # guarda el input de cada combate en REPLAY_DIR
+    "rotation_quality": "alta"  # 'baja', 'media', 'alta'
+}
+
+# Calidad del atlas de rotación de balas: ángulos pre-renderizados por sprite
+ROTATION_QUALITY = {
+    "baja": 16,
+    "media": 32,
+    "alta": 64
 }
 
 # Modificadores de modos de juego